@@ -3,6 +3,8 @@ const fs = require('fs');
 const path = require('path');
 
 const PORT = 3000;
+const ASSET_SERVICE_PORT = process.env.ASSET_SERVICE_PORT || 8765;
+const LOOPBACK_ADDRESSES = ['127.0.0.1', '::1', '::ffff:127.0.0.1'];
 const MIME_TYPES = {
     '.html': 'text/html',
     '.js': 'text/javascript',
@@ -72,6 +74,32 @@ if (typeof module !== 'undefined' && module.exports) {
         return;
     }
 
+    // Proxy to the local asset job service (tools/asset_service.py)
+    if (req.url.startsWith('/api/assets/')) {
+        // The server listens on every interface; the asset jobs are for this machine only
+        if (!LOOPBACK_ADDRESSES.includes(req.socket.remoteAddress)) {
+            res.writeHead(403, { 'Content-Type': 'application/json' });
+            res.end(JSON.stringify({ error: 'Asset service is only available from localhost' }));
+            return;
+        }
+        const proxyReq = http.request({
+            host: '127.0.0.1',
+            port: ASSET_SERVICE_PORT,
+            method: req.method,
+            path: req.url.slice('/api/assets'.length),
+            headers: req.headers
+        }, proxyRes => {
+            res.writeHead(proxyRes.statusCode, proxyRes.headers);
+            proxyRes.pipe(res);
+        });
+        proxyReq.on('error', error => {
+            res.writeHead(502, { 'Content-Type': 'application/json' });
+            res.end(JSON.stringify({ error: 'Asset service unavailable: ' + error.message }));
+        });
+        req.pipe(proxyReq);
+        return;
+    }
+
     // Handle Static Files
     let filePath = '.' + req.url;
     if (filePath === './') {
@@ -0,0 +1,109 @@
+"""
+As ferramentas de assets como pacote Python.
+
+Permite usar as funções das ferramentas num processo só (ex: um job que gera
+muitos assets seguidos), sem pagar a inicialização do Python e os imports a
+cada arquivo:
+
+    from tools import key_background, build_atlas, extract_frames
+
+    extract_frames("images/objects/ghost.mp4", "frames_ghost/")
+
+Os nomes abaixo (API) são estáveis. Nada é importado junto com o pacote: cada
+nome carrega o seu módulo (e numpy, Pillow, etc.) no primeiro acesso, e as
+ferramentas gráficas (OpenCV, tkinter) só carregam os imports delas quando a
+janela é aberta.
+
+Os módulos de tools/ se importam entre si pelo nome curto (como quando os
+scripts rodam direto, com tools/ no sys.path); por isso o pacote coloca a
+própria pasta no sys.path. Os scripts com hífen (mp4-to-atlas.py, ...)
+continuam funcionando na linha de comando e chamam os módulos com underscore.
+"""
+
+import importlib
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Nome público -> módulo de tools/ onde ele está
+API = {
+    # Chroma key (chroma_key.py)
+    "detect_bg_color": "chroma_key",
+    "key_background": "chroma_key",
+    "key_palette": "chroma_key",
+    "remove_white_halo": "chroma_key",
+    "parse_mask": "chroma_key",
+    "rasterize_mask": "chroma_key",
+
+    # Frames e pipelines (frame_pipeline.py)
+    "open_frames": "frame_pipeline",
+    "video_frames": "frame_pipeline",
+    "gif_frames": "frame_pipeline",
+    "dir_frames": "frame_pipeline",
+    "probe_video": "frame_pipeline",
+    "extract_frames": "frame_pipeline",
+    "save_frames": "frame_pipeline",
+    "write_atlas": "frame_pipeline",
+    "run_pipeline": "frame_pipeline",
+    "parse_steps": "frame_pipeline",
+
+    # Empacotamento e codificação
+    "pack_rects": "atlas_packer",
+    "pack_records": "atlas_packer",
+    "pack_records_pages": "atlas_packer",
+    "save_png": "image_formats",
+    "save_variants": "image_formats",
+    "parse_formats": "image_formats",
+    "save_animation": "animation_encoder",
+
+    # Ferramentas
+    "mp4_to_atlas": "mp4_to_atlas",
+    "build_atlas": "mp4_to_atlas",
+    "extract_frames_from_mp4": "mp4_to_atlas",
+    "gif_to_spritesheet": "gif_to_spritesheet",
+    "remover_fundo_gif": "remove_gif_background",
+    "remover_fundo_solido": "transparencia",
+    "extract_gif_frames": "gif_to_frames",
+    "mirror_and_duplicate_frames": "mirror_frames",
+    "get_gif_info": "gif_info",
+    "read_gif_header": "media_info",
+    "probe_media": "media_info",
+    "scan_media": "media_info",
+    "optimize_images": "optimize_images",
+    "search_quality": "quality_search",
+
+    # Builds
+    "cached_build": "build_cache",
+    "load_spec": "build_assets",
+    "build_asset": "build_assets",
+    "build_assets": "build_assets",
+    "watch": "watch_assets",
+    "serve": "asset_service",
+    "map_frames": "frame_pool",
+}
+
+__all__ = sorted(API) + ["module"]
+
+
+def module(name):
+    """
+    Módulo de tools/ pelo nome do arquivo (com hífen ou underscore, com ou
+    sem .py), ex: module("mp4-to-atlas").
+    """
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    name = os.path.splitext(name)[0] if name.endswith('.py') else name
+    return importlib.import_module(name.replace('-', '_'))
+
+
+def __getattr__(name):
+    if name not in API:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(module(API[name]), name)
+    globals()[name] = value  # Próximos acessos não passam mais por aqui
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(API))
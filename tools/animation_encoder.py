@@ -0,0 +1,285 @@
+"""
+Gravação de animações (GIF, APNG e WebP animado) a partir de frames RGBA inteiros.
+
+GIF: uma paleta global para todos os frames (exata se as cores visíveis
+couberem em 255; senão median cut sobre uma amostra de todos os frames), com
+um índice reservado para o transparente. Cada frame guarda só o retângulo
+que mudou em relação ao que já está na tela; dentro dele os pixels que não
+mudaram viram transparentes (o LZW comprime melhor). O descarte de cada
+frame é escolhido pelo frame seguinte:
+
+  - keep (1): o próximo frame só desenha por cima
+  - background (2): o próximo frame apaga pixels visíveis; o retângulo do
+    frame atual cresce para cobrir esses pixels e é limpo antes do próximo
+
+O último frame sempre limpa tudo o que está visível, para a animação
+recomeçar de uma tela vazia. Frames seguidos idênticos viram um só, com a
+soma das durações.
+
+APNG e WebP animado: codificadores do Pillow/libwebp, que também guardam só
+o retângulo alterado de cada frame. O WebP é sem perdas, a não ser que
+quality seja dado.
+
+Requisitos: pip install "Pillow>=11" numpy (ImageFile._Tile, usado no LZW do GIF)
+"""
+
+import os
+import struct
+
+import numpy as np
+from PIL import Image, ImageFile
+
+
+ANIMATION_FORMATS = {".gif": "gif", ".png": "apng", ".apng": "apng", ".webp": "webp"}
+
+# Cores da paleta global (a 256ª é o índice transparente)
+GIF_COLORS = 255
+
+# Pixels com alpha abaixo disso ficam transparentes no GIF (alpha de 1 bit)
+ALPHA_CUTOFF = 128
+
+# Pixels amostrados para o median cut quando as cores não cabem na paleta
+PALETTE_SAMPLE = 1_000_000
+
+DISPOSAL_KEEP = 1
+DISPOSAL_BACKGROUND = 2
+
+
+def animation_format(path):
+    """
+    Formato de saída pela extensão do arquivo.
+
+    Raises:
+        ValueError: Extensão sem formato animado
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ANIMATION_FORMATS:
+        raise ValueError(f"Extensão '{ext}' não suportada (use {', '.join(ANIMATION_FORMATS)})")
+    return ANIMATION_FORMATS[ext]
+
+
+# ---------------------------------------------------------------------------
+# Paleta global
+# ---------------------------------------------------------------------------
+
+def _pack_rgb(rgb):
+    rgb = rgb.astype(np.uint32)
+    return rgb[..., 0] | (rgb[..., 1] << 8) | (rgb[..., 2] << 16)
+
+
+def global_palette(frames, colors=GIF_COLORS):
+    """
+    Paleta única para todos os frames e os frames convertidos para índices.
+
+    Returns:
+        Tupla (paleta (N, 3) uint8, lista de arrays (H, W) uint8 de índices,
+        índice transparente = N)
+    """
+    arrays = [np.asarray(frame.convert("RGBA")) for frame in frames]
+    visible = [a[..., 3] >= ALPHA_CUTOFF for a in arrays]
+    codes = np.concatenate([_pack_rgb(a[..., :3][v]) for a, v in zip(arrays, visible)])
+    unique = np.unique(codes)
+
+    indexed = []
+    if len(unique) <= colors:
+        # Paleta exata (sem perdas)
+        palette = np.stack([unique & 0xFF, (unique >> 8) & 0xFF, (unique >> 16) & 0xFF], axis=1).astype(np.uint8)
+        transparent = len(palette)
+        for a, v in zip(arrays, visible):
+            idx = np.full(a.shape[:2], transparent, dtype=np.uint8)
+            idx[v] = np.searchsorted(unique, _pack_rgb(a[..., :3][v]))
+            indexed.append(idx)
+        return palette, indexed, transparent
+
+    # Median cut sobre uma amostra dos pixels visíveis de todos os frames
+    step = max(1, len(codes) // PALETTE_SAMPLE)
+    sample = codes[::step]
+    sample_rgb = np.stack([sample & 0xFF, (sample >> 8) & 0xFF, (sample >> 16) & 0xFF], axis=1).astype(np.uint8)
+    reduced = Image.fromarray(sample_rgb[np.newaxis], "RGB").quantize(colors, method=Image.Quantize.MEDIANCUT,
+                                                                      dither=Image.Dither.NONE)
+    count = len(reduced.getpalette()) // 3
+    palette = np.array(reduced.getpalette()[:count * 3], dtype=np.uint8).reshape(-1, 3)
+    transparent = len(palette)
+
+    # Entradas sobrando repetem a cor 0, para nunca serem a mais próxima sozinhas
+    full = np.concatenate([palette, np.repeat(palette[:1], 256 - len(palette), axis=0)])
+    lookup = Image.new("P", (1, 1))
+    lookup.putpalette(full.tobytes())
+
+    for a, v in zip(arrays, visible):
+        idx = np.asarray(Image.fromarray(a[..., :3], "RGB").quantize(palette=lookup, dither=Image.Dither.NONE)).copy()
+        idx[idx >= transparent] = 0
+        idx[~v] = transparent
+        indexed.append(idx)
+    return palette, indexed, transparent
+
+
+# ---------------------------------------------------------------------------
+# GIF com frames parciais
+# ---------------------------------------------------------------------------
+
+def _bbox(mask):
+    """
+    Retângulo (x0, y0, x1, y1) dos pixels True, ou None.
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def delta_frames(indexed, durations, transparent):
+    """
+    Reduz cada frame ao retângulo que muda na tela e escolhe o descarte.
+
+    Args:
+        indexed: Lista de arrays (H, W) de índices (frames inteiros)
+        durations: Duração de cada frame em ms
+        transparent: Índice transparente
+
+    Returns:
+        Lista de {"offset": (x, y), "data": array de índices do retângulo,
+        "duration", "disposal"}
+    """
+    # Frames seguidos idênticos viram um só
+    merged = []
+    for idx, duration in zip(indexed, durations):
+        if merged and np.array_equal(idx, merged[-1][0]):
+            merged[-1][1] += duration
+        else:
+            merged.append([idx, duration])
+
+    empty = np.full(indexed[0].shape, transparent, dtype=np.uint8)
+    screen = empty
+    result = []
+    for i, (target, duration) in enumerate(merged):
+        changed = target != screen
+        rect = _bbox(changed) or (0, 0, 1, 1)
+
+        # Pixels visíveis agora e transparentes no próximo (ou no recomeço):
+        # só o descarte para o fundo consegue apagá-los
+        following = merged[i + 1][0] if i + 1 < len(merged) else empty
+        clear = _bbox((target != transparent) & (following == transparent))
+        disposal = DISPOSAL_KEEP
+        if clear is not None:
+            rect = _union(rect, clear)
+            disposal = DISPOSAL_BACKGROUND
+
+        x0, y0, x1, y1 = rect
+        data = target[y0:y1, x0:x1].copy()
+        data[~changed[y0:y1, x0:x1]] = transparent
+        result.append({"offset": (x0, y0), "data": data, "duration": duration, "disposal": disposal})
+
+        screen = target.copy()
+        if disposal == DISPOSAL_BACKGROUND:
+            screen[y0:y1, x0:x1] = transparent
+    return result
+
+
+def _write_frame(f, delta, transparent, bits):
+    """
+    Extensão de controle gráfico + descritor + dados LZW de um frame parcial.
+    """
+    data = delta["data"]
+    height, width = data.shape
+    flags = (delta["disposal"] << 2) | 0x01
+    f.write(b"!\xf9\x04" + struct.pack("<BHB", flags, round(delta["duration"] / 10), transparent) + b"\x00")
+    f.write(b"," + struct.pack("<HHHHB", *delta["offset"], width, height, 0) + bytes([bits]))
+    # O codificador LZW do Pillow aceita o tamanho inicial de código (o getdata do
+    # GifImagePlugin sempre usa 8 bits, mesmo com poucas cores); ImageFile._Tile
+    # só existe a partir do Pillow 11
+    ImageFile._save(Image.fromarray(data, "P"), f, [ImageFile._Tile("gif", (0, 0, width, height), 0, ("P", bits))])
+    f.write(b"\x00")
+
+
+def save_gif(frames, output_path, durations, loop=0, colors=GIF_COLORS):
+    """
+    Grava um GIF animado com paleta global e frames parciais (ver docstring
+    do módulo).
+
+    Returns:
+        Dicionário com colors, frames (gravados, após juntar repetidos) e size
+    """
+    palette, indexed, transparent = global_palette(frames, colors)
+    deltas = delta_frames(indexed, durations, transparent)
+    width, height = frames[0].size
+
+    # Bits por índice: cores + transparente (mínimo 2, exigido pelo LZW do GIF)
+    bits = max(2, transparent.bit_length())
+    table = np.zeros((1 << bits, 3), dtype=np.uint8)
+    table[:len(palette)] = palette
+
+    with open(output_path, "wb") as f:
+        # Cabeçalho + tela lógica com a paleta global
+        f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF0 | (bits - 1), transparent, 0))
+        f.write(table.tobytes())
+        if loop is not None:
+            f.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+        for delta in deltas:
+            _write_frame(f, delta, transparent, bits)
+        f.write(b";")
+
+    return {"colors": len(palette), "frames": len(deltas), "size": os.path.getsize(output_path)}
+
+
+# ---------------------------------------------------------------------------
+# APNG e WebP
+# ---------------------------------------------------------------------------
+
+def save_apng(frames, output_path, durations, loop=0):
+    """
+    Grava um APNG RGBA (o Pillow guarda só o retângulo alterado de cada frame).
+    """
+    frames[0].save(output_path, "PNG", save_all=True, append_images=frames[1:], duration=durations,
+                   loop=1 if loop is None else loop, disposal=0, blend=0, optimize=True)
+    return {"colors": None, "frames": len(frames), "size": os.path.getsize(output_path)}
+
+
+def save_webp(frames, output_path, durations, loop=0, quality=None):
+    """
+    Grava um WebP animado, sem perdas (quality=None) ou com perdas.
+    """
+    options = {"lossless": True, "quality": 100} if quality is None else {"quality": quality}
+    frames[0].save(output_path, "WEBP", save_all=True, append_images=frames[1:], duration=durations,
+                   loop=1 if loop is None else loop, method=4, minimize_size=True, **options)
+    return {"colors": None, "frames": len(frames), "size": os.path.getsize(output_path)}
+
+
+def save_animation(frames, output_path, durations, loop=0, quality=None, colors=GIF_COLORS):
+    """
+    Grava a animação no formato da extensão (.gif, .png/.apng, .webp).
+
+    Args:
+        frames: Lista de imagens RGBA do mesmo tamanho
+        output_path: Arquivo de saída
+        durations: Duração de cada frame em ms (ou um valor para todos)
+        loop: Repetições (0 = infinito, None = toca uma vez)
+        quality: Qualidade do WebP com perdas (None = sem perdas)
+        colors: Cores da paleta global do GIF (até 255)
+
+    Returns:
+        Dicionário com format, colors, frames e size
+    """
+    fmt = animation_format(output_path)
+    if isinstance(durations, (int, float)):
+        durations = [durations] * len(frames)
+    durations = [int(d) for d in durations]
+
+    if fmt == "gif":
+        result = save_gif(frames, output_path, durations, loop, colors)
+    elif fmt == "apng":
+        result = save_apng(frames, output_path, durations, loop)
+    else:
+        result = save_webp(frames, output_path, durations, loop, quality)
+    result["format"] = fmt
+    return result
@@ -0,0 +1,474 @@
+"""
+Serviço local de jobs de assets (HTTP/JSON), para o admin pedir builds sem
+esperar por eles.
+
+Recebe uploads de fontes e pedidos de build (no formato dos assets do
+build_assets.py), coloca os pedidos numa fila e gera até --jobs ao mesmo
+tempo, com as ferramentas já carregadas no processo. Só escuta em
+127.0.0.1 e usa só a biblioteca padrão; o server.js repassa /api/assets/*
+para cá.
+
+Rotas:
+
+  POST /uploads?filename=ghost.mp4   corpo = bytes do arquivo
+       -> {"source": ".asset-uploads/<sha1>/ghost.mp4", "sha1", "size"}
+  POST /jobs   {"tool": "mp4-to-atlas", "source": "images/objects/ghost.mp4",
+                "output": "images/objects/ghost_atlas.png", "params": {...}}
+       -> 202 com o job ("tool" e "output" são opcionais, com os mesmos
+          padrões do watch_assets.py)
+  GET  /jobs          todos os jobs (mais novos primeiro)
+  GET  /jobs/<id>     status (queued, running, done, failed), progress
+                      (última linha impressa pela ferramenta e, quando
+                      houver, done/total), log, outputs e error
+  GET  /health
+
+Pedidos idênticos (mesma ferramenta, mesmo conteúdo da fonte e das imagens
+de máscara, mesmos parâmetros e saída) devolvem o job já existente enquanto
+ele estiver na fila, rodando ou pronto com as saídas no disco. Jobs com a
+mesma saída rodam um de cada vez. Caminhos são relativos a --root e não
+podem sair dela; as saídas só podem ir para images/ ou .asset-uploads/, com
+a extensão que a ferramenta grava. POST /jobs exige Content-Type
+application/json.
+
+Uso: python asset_service.py [--port N] [--jobs N] [--root pasta]
+
+  --port N     : porta (padrão: 8765)
+  --jobs N     : builds ao mesmo tempo (padrão: 1; 0 = todos os núcleos)
+  --root pasta : pasta base dos caminhos (padrão: pasta atual)
+
+Exemplo:
+  python tools/asset_service.py --jobs 2
+  curl -X POST localhost:8765/jobs -H 'Content-Type: application/json' -d '{"source": "images/objects/ghost.mp4", "params": {"mirror": true}}'
+
+Ctrl+C encerra (espera os builds em andamento terminarem).
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from animation_encoder import ANIMATION_FORMATS
+from build_assets import TOOLS, asset_sources, build_asset, load_tool, make_assets
+from build_cache import file_hash
+from frame_pool import parse_jobs_arg
+from watch_assets import DEFAULT_OUTPUTS, DEFAULT_TOOLS
+
+HOST = '127.0.0.1'
+PORT = 8765
+UPLOAD_DIR = '.asset-uploads'
+
+# Onde os jobs podem gravar (relativo a --root) e as extensões de cada ferramenta
+OUTPUT_DIRS = ('images', UPLOAD_DIR)
+OUTPUT_EXTENSIONS = {
+    'mp4-to-atlas': ('.png',),
+    'atlas': ('.png',),
+    'gif-to-spritesheet': ('.png',),
+    'remove-gif-background': tuple(ANIMATION_FORMATS),
+    'transparencia': ('.png',),
+}
+
+# Limites: tamanho de um upload, jobs esperando na fila, jobs terminados
+# guardados e linhas de log por job
+MAX_UPLOAD = 512 * 1024 * 1024
+MAX_QUEUED = 64
+MAX_FINISHED = 200
+LOG_LINES = 50
+
+PROGRESS_RE = re.compile(r'(\d+)/(\d+)')
+
+
+# ---------------------------------------------------------------------------
+# Saída das ferramentas por job
+# ---------------------------------------------------------------------------
+
+class _JobOutput:
+    """
+    Substitui sys.stdout: o que as ferramentas imprimem numa thread de job
+    vai para o log do job (e continua aparecendo no terminal).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self._partial = {}
+
+    def write(self, text):
+        job = getattr(self.local, "job", None)
+        if job is not None:
+            lines = (self._partial.pop(job["id"], '') + text).split('\n')
+            self._partial[job["id"]] = lines.pop()
+            for line in lines:
+                _log(job, line)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _log(job, line):
+    line = line.rstrip()
+    if not line:
+        return
+    job["log"] = (job["log"] + [line])[-LOG_LINES:]
+    if not any(c.isalnum() for c in line):
+        return  # Separadores (=====)
+    progress = {"message": line.strip()}
+    match = PROGRESS_RE.search(line)
+    if match:
+        progress.update(done=int(match.group(1)), total=int(match.group(2)))
+    job["progress"] = progress
+
+
+# ---------------------------------------------------------------------------
+# Fila de jobs
+# ---------------------------------------------------------------------------
+
+class JobQueue:
+    """
+    Jobs em memória e o pool que os executa (até `jobs` ao mesmo tempo).
+    """
+
+    def __init__(self, root, jobs=1):
+        self.root = os.path.abspath(root)
+        self.jobs = jobs
+        self.executor = ThreadPoolExecutor(max_workers=jobs)
+        self.lock = threading.Lock()
+        self.by_id = {}
+        self.by_key = {}
+        self.output_locks = {}
+
+        self.output = sys.stdout if isinstance(sys.stdout, _JobOutput) else _JobOutput(sys.stdout)
+        sys.stdout = self.output
+
+    def path(self, rel):
+        """
+        Caminho absoluto dentro da raiz.
+
+        Raises:
+            ValueError: Caminho fora da raiz
+        """
+        full = os.path.realpath(os.path.join(self.root, rel))
+        if os.path.commonpath([full, os.path.realpath(self.root)]) != os.path.realpath(self.root):
+            raise ValueError(f"Caminho fora da pasta do serviço: {rel}")
+        return full
+
+    def rel(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def check_output(self, tool, output_path):
+        """
+        Saída só dentro das pastas de assets e com a extensão da ferramenta.
+
+        Raises:
+            ValueError: Pasta ou extensão não permitidas
+        """
+        rel = self.rel(output_path)
+        if not any(rel.startswith(folder + '/') for folder in OUTPUT_DIRS):
+            raise ValueError(f"Saída fora das pastas de assets ({', '.join(OUTPUT_DIRS)}): {rel}")
+        extensions = OUTPUT_EXTENSIONS.get(tool, ('.png',))
+        if os.path.splitext(rel)[1].lower() not in extensions:
+            raise ValueError(f"Extensão inválida para {tool}: {rel} (use {', '.join(extensions)})")
+
+    # -- Uploads --
+
+    def save_upload(self, filename, stream, length):
+        """
+        Grava um upload em .asset-uploads/<sha1>/<nome>, lendo em blocos.
+
+        Returns:
+            Dicionário com source (caminho relativo), sha1 e size
+
+        Raises:
+            ValueError: Nome ou tamanho inválidos
+        """
+        filename = os.path.basename(filename or '')
+        if not filename or filename.startswith('.'):
+            raise ValueError("Nome de arquivo inválido")
+        if length > MAX_UPLOAD:
+            raise ValueError(f"Upload maior que {MAX_UPLOAD // (1024 * 1024)} MB")
+
+        upload_dir = self.path(UPLOAD_DIR)
+        os.makedirs(upload_dir, exist_ok=True)
+        sha1 = hashlib.sha1()
+        with tempfile.NamedTemporaryFile(dir=upload_dir, delete=False) as tmp:
+            remaining = length
+            while remaining:
+                block = stream.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                sha1.update(block)
+                tmp.write(block)
+                remaining -= len(block)
+        if remaining:
+            os.remove(tmp.name)
+            raise ValueError("Upload incompleto")
+
+        # Mesmo conteúdo, mesmo caminho: o cache de builds reaproveita o resultado
+        target_dir = os.path.join(upload_dir, sha1.hexdigest())
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, filename)
+        os.replace(tmp.name, target)
+        return {"source": self.rel(target), "sha1": sha1.hexdigest(), "size": length}
+
+    # -- Jobs --
+
+    def submit(self, request):
+        """
+        Valida um pedido e coloca na fila (ou devolve o job idêntico existente).
+
+        Returns:
+            Tupla (job, novo)
+
+        Raises:
+            ValueError: Pedido inválido
+            OverflowError: Fila cheia
+        """
+        if not isinstance(request, dict):
+            raise ValueError("O pedido deve ser um objeto JSON")
+        source = request.get("source")
+        if not source:
+            raise ValueError("Campo 'source' obrigatório")
+        source_path = self.path(source)
+        if not os.path.isfile(source_path):
+            raise ValueError(f"Fonte não encontrada: {source}")
+
+        stem, ext = os.path.splitext(os.path.basename(source_path))
+        tool = request.get("tool") or DEFAULT_TOOLS.get(ext.lower())
+        if not tool:
+            raise ValueError(f"Sem ferramenta padrão para '{ext}'; informe \"tool\"")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("'params' deve ser um objeto JSON")
+        output = request.get("output") or os.path.join(
+            os.path.dirname(source), DEFAULT_OUTPUTS.get(tool, '{stem}_' + tool + '.png').format(stem=stem))
+        output_path = self.path(output)
+
+        asset = make_assets([{"name": self.rel(output_path), "tool": tool, "source": source_path,
+                              "output": output_path, "params": params}])[0]
+        self.check_output(tool, output_path)
+        # Todas as entradas do build (fonte e imagens de máscara): mudou uma, é outro job
+        hashes = []
+        for path in asset_sources(asset):
+            try:
+                hashes.append(file_hash(self.path(path)))
+            except OSError as e:
+                raise ValueError(f"Entrada ilegível: {path} ({e.strerror or e})")
+        key = json.dumps({"tool": tool, "sources": hashes, "output": output_path,
+                          "params": params}, sort_keys=True)
+
+        with self.lock:
+            existing = self.by_id.get(self.by_key.get(key))
+            if existing and (existing["status"] in ("queued", "running") or
+                             (existing["status"] == "done" and
+                              all(os.path.exists(self.path(p)) for p in existing["outputs"]))):
+                return existing, False
+
+            queued = sum(1 for j in self.by_id.values() if j["status"] == "queued")
+            if queued >= MAX_QUEUED:
+                raise OverflowError(f"Fila cheia ({queued} jobs esperando)")
+
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "tool": tool,
+                "source": self.rel(source_path),
+                "output": self.rel(output_path),
+                "params": params,
+                "status": "queued",
+                "progress": {"message": "na fila"},
+                "outputs": [],
+                "error": None,
+                "log": [],
+                "created": time.time(),
+                "started": None,
+                "finished": None
+            }
+            self.by_id[job["id"]] = job
+            self.by_key[key] = job["id"]
+            self._forget_old()
+            output_lock = self.output_locks.setdefault(output_path, threading.Lock())
+
+        self.executor.submit(self._run, job, asset, output_lock)
+        return job, True
+
+    def _forget_old(self):
+        finished = sorted((j for j in self.by_id.values() if j["finished"]), key=lambda j: j["finished"])
+        for job in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del self.by_id[job["id"]]
+        self.by_key = {k: i for k, i in self.by_key.items() if i in self.by_id}
+
+    def _run(self, job, asset, output_lock):
+        with output_lock:
+            job["status"] = "running"
+            job["started"] = time.time()
+            job["progress"] = {"message": "começando"}
+            self.output.local.job = job
+            try:
+                status, result = build_asset(asset)
+            except Exception as e:
+                status, result = "falhou", None
+                job["error"] = str(e)
+                print(f"Erro no job {job['id']}: {e}")
+            finally:
+                self.output.local.job = None
+
+        outputs = asset["outputs"]
+        if isinstance(result, dict) and result.get("outputs"):
+            outputs = result["outputs"]
+        job["outputs"] = [self.rel(os.path.abspath(p)) for p in outputs if os.path.exists(p)]
+        if status == "falhou":
+            job["status"] = "failed"
+            job["error"] = job["error"] or (job["log"][-1] if job["log"] else "a ferramenta não gerou as saídas")
+        else:
+            job["status"] = "done"
+            job["progress"] = {"message": "atualizado" if status == "atualizado" else "gerado"}
+        job["finished"] = time.time()
+
+    def get(self, job_id):
+        return self.by_id.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return sorted(self.by_id.values(), key=lambda j: j["created"], reverse=True)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        sys.stdout = self.output.stream
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    queue = None  # JobQueue, definido em serve()
+
+    def _send(self, code, data):
+        body = json.dumps(data, default=str).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code, message):
+        self._send(code, {"error": message})
+
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts == ['health']:
+            jobs = self.queue.list()
+            self._send(200, {"ok": True, "workers": self.queue.jobs,
+                             "queued": sum(1 for j in jobs if j["status"] == "queued"),
+                             "running": sum(1 for j in jobs if j["status"] == "running")})
+        elif parts == ['jobs']:
+            self._send(200, {"jobs": [dict(j, log=j["log"][-1:]) for j in self.queue.list()]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.queue.get(parts[1])
+            if job is None:
+                self._error(404, f"Job não encontrado: {parts[1]}")
+            else:
+                self._send(200, job)
+        else:
+            self._error(404, "Rota não encontrada")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self._error(411, "Content-Length obrigatório")
+            return
+        if length < 0:
+            # read(-1) leria até o cliente fechar a conexão
+            self.close_connection = True
+            self._error(400, "Content-Length inválido")
+            return
+
+        if url.path == '/uploads':
+            filename = parse_qs(url.query).get('filename', [''])[0]
+            try:
+                self._send(201, self.queue.save_upload(filename, self.rfile, length))
+            except ValueError as e:
+                self.close_connection = True
+                self._error(400, str(e))
+            except OSError as e:
+                self._error(500, str(e))
+
+        elif url.path == '/jobs':
+            if self.headers.get_content_type() != 'application/json':
+                self._error(415, "Content-Type deve ser application/json")
+                return
+            try:
+                job, new = self.queue.submit(json.loads(self.rfile.read(length) or b'null'))
+            except ValueError as e:
+                self._error(400, str(e))
+            except OverflowError as e:
+                self._error(503, str(e))
+            else:
+                self._send(202 if new else 200, dict(job, duplicate=not new))
+        else:
+            self._error(404, "Rota não encontrada")
+
+    def log_request(self, code='-', size='-'):
+        # Só os erros; o admin consulta os jobs o tempo todo
+        if str(code).startswith(('4', '5')):
+            super().log_request(code, size)
+
+
+def serve(port=PORT, jobs=1, root='.'):
+    """
+    Sobe o serviço em 127.0.0.1:port. Só retorna com Ctrl+C.
+    """
+    queue = JobQueue(root, jobs)
+    # Ferramentas carregadas antes do primeiro pedido
+    for tool in sorted(TOOLS):
+        load_tool(os.path.splitext(TOOLS[tool]["code"][0])[0])
+
+    handler = type("Handler", (ServiceHandler,), {"queue": queue})
+    server = ThreadingHTTPServer((HOST, port), handler)
+    print(f"Serviço de assets em http://{HOST}:{port} (raiz: {queue.root}, até {jobs} build(s) ao mesmo tempo)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando (esperando os builds em andamento)...")
+    finally:
+        server.server_close()
+        queue.shutdown()
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    port, root = PORT, '.'
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--port' and i + 1 < len(args):
+            try:
+                port = int(args[i + 1])
+            except ValueError:
+                print(f"Aviso: Porta '{args[i + 1]}' inválida. Usando {PORT}.")
+            i += 2
+        elif args[i] == '--root' and i + 1 < len(args):
+            root = args[i + 1]
+            i += 2
+        else:
+            print(__doc__)
+            sys.exit(1)
+
+    if not os.path.isdir(root):
+        print(f"Erro: Pasta não encontrada: {root}")
+        sys.exit(1)
+
+    serve(port, jobs, root)
@@ -0,0 +1,585 @@
+"""
+Empacotamento de atlas: recorta cada frame pela bounding box do alpha e
+empacota os retângulos com MaxRects (regra bottom-left, sem rotação).
+
+O JSON gerado segue o formato "hash" do TexturePacker usado pelo
+`this.load.atlas` do Phaser: `frame` é o retângulo no atlas,
+`spriteSourceSize` é a posição do recorte dentro do frame original e
+`sourceSize` é o tamanho original, então o sprite é posicionado como antes.
+
+Frames repetidos (idênticos ou quase idênticos, ex: frames parados no vídeo
+ou as cópias do ping-pong) são guardados uma única vez no atlas; as chaves
+do JSON de todas as cópias apontam para o mesmo retângulo.
+
+Com um tamanho máximo de textura (max_size), os frames são divididos em
+páginas, na ordem: a primeira página recebe o maior prefixo de frames que
+cabe, a segunda o seguinte, e assim por diante (formato "multiatlas" do
+Phaser, ver pages_json).
+
+Camadas de resolução (@0.5x, @0.25x, ...): com align_record, cada recorte
+vira uma célula com posição e tamanho múltiplos do fator de redução, e o
+padding também; assim cada página é reduzida uma vez só (reduce_atlas, média
+de blocos n x n) sem que um pixel da camada misture dois frames.
+
+Requisitos: pip install Pillow numpy
+"""
+
+import hashlib
+import math
+import os
+import re
+
+import numpy as np
+from PIL import Image
+
+from image_formats import VARIANT_FORMATS, variant_outputs
+
+
+# Espaço (px) entre retângulos, evita que o filtro bilinear misture frames vizinhos
+DEFAULT_PADDING = 2
+
+
+def trim_frame(frame):
+    """
+    Recorta o frame pela bounding box dos pixels com alpha > 0.
+
+    Frames totalmente transparentes viram um retângulo 1x1 em (0, 0).
+
+    Returns:
+        Tupla (imagem recortada, (x, y, w, h) do recorte no frame original)
+    """
+    frame = frame.convert("RGBA")
+    bbox = frame.getchannel("A").getbbox()
+    if bbox is None:
+        bbox = (0, 0, 1, 1)
+
+    x1, y1, x2, y2 = bbox
+    if (x1, y1, x2, y2) == (0, 0) + frame.size:
+        return frame, (0, 0) + frame.size
+    return frame.crop(bbox), (x1, y1, x2 - x1, y2 - y1)
+
+
+class MaxRectsPacker:
+    """
+    Empacotador MaxRects para uma área fixa (largura x altura).
+
+    Mantém a lista de retângulos livres maximais; cada inserção escolhe a
+    posição com menor borda inferior (depois menor x) e divide os retângulos
+    livres que a intersectam.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free_rects = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """
+        Reserva um retângulo w x h.
+
+        Returns:
+            Tupla (x, y), ou None se não couber
+        """
+        best = None
+        for fx, fy, fw, fh in self.free_rects:
+            if w <= fw and h <= fh:
+                score = (fy + h, fx)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+
+        if best is None:
+            return None
+
+        _, x, y = best
+        self._split_free_rects((x, y, w, h))
+        return x, y
+
+    def _split_free_rects(self, used):
+        ux, uy, uw, uh = used
+        new_free = []
+        for rect in self.free_rects:
+            fx, fy, fw, fh = rect
+            if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+                new_free.append(rect)
+                continue
+
+            # Partes do retângulo livre fora do retângulo usado
+            if ux > fx:
+                new_free.append((fx, fy, ux - fx, fh))
+            if ux + uw < fx + fw:
+                new_free.append((ux + uw, fy, fx + fw - ux - uw, fh))
+            if uy > fy:
+                new_free.append((fx, fy, fw, uy - fy))
+            if uy + uh < fy + fh:
+                new_free.append((fx, uy + uh, fw, fy + fh - uy - uh))
+
+        self.free_rects = _prune_contained(new_free)
+
+
+def _prune_contained(rects):
+    """
+    Remove retângulos livres contidos em outros (e duplicados).
+    """
+    rects = list(dict.fromkeys(rects))
+    pruned = []
+    for i, (ax, ay, aw, ah) in enumerate(rects):
+        contained = False
+        for j, (bx, by, bw, bh) in enumerate(rects):
+            if i != j and bx <= ax and by <= ay and ax + aw <= bx + bw and ay + ah <= by + bh:
+                contained = True
+                break
+        if not contained:
+            pruned.append((ax, ay, aw, ah))
+    return pruned
+
+
+def _pack_with_width(sizes, order, width, padding):
+    """
+    Empacota todos os retângulos numa faixa de largura fixa e altura livre.
+
+    Returns:
+        Tupla (posições na ordem original, largura usada, altura usada), ou None
+    """
+    height = sum(h + padding for _, h in sizes)
+    packer = MaxRectsPacker(width + padding, height)
+    positions = [None] * len(sizes)
+    used_w = used_h = 0
+
+    for idx in order:
+        w, h = sizes[idx]
+        pos = packer.insert(w + padding, h + padding)
+        if pos is None:
+            return None
+        positions[idx] = pos
+        used_w = max(used_w, pos[0] + w)
+        used_h = max(used_h, pos[1] + h)
+
+    return positions, used_w, used_h
+
+
+def pack_rects(sizes, padding=DEFAULT_PADDING, max_size=None):
+    """
+    Empacota retângulos (w, h) no menor atlas encontrado.
+
+    Testa algumas larguras em torno de sqrt(área total) e fica com o resultado
+    de menor lado maior (limite de textura da GPU), depois de menor área.
+
+    Args:
+        max_size: Lado máximo do atlas (px); None = sem limite
+
+    Returns:
+        Tupla (lista de (x, y) na ordem de entrada, largura do atlas, altura do
+        atlas), ou None se não couber em max_size x max_size
+    """
+    if not sizes:
+        return [], 0, 0
+
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    max_w = max(w for w, _ in sizes)
+    total_area = sum((w + padding) * (h + padding) for w, h in sizes)
+    side = math.sqrt(total_area)
+
+    candidates = {max_w}
+    for factor in (0.8, 0.9, 1.0, 1.1, 1.2, 1.35, 1.5, 1.75, 2.0):
+        candidates.add(max(max_w, int(math.ceil(side * factor))))
+    if max_size is not None:
+        candidates = {w for w in candidates if w <= max_size} | {max_size}
+
+    best = None
+    for width in sorted(candidates):
+        packed = _pack_with_width(sizes, order, width, padding)
+        if packed is None:
+            continue
+        positions, used_w, used_h = packed
+        if max_size is not None and max(used_w, used_h) > max_size:
+            continue
+        score = (max(used_w, used_h), used_w * used_h)
+        if best is None or score < best[0]:
+            best = (score, positions, used_w, used_h)
+
+    if best is None:
+        return None
+    _, positions, atlas_w, atlas_h = best
+    return positions, atlas_w, atlas_h
+
+
+def pack_pages(sizes, padding=DEFAULT_PADDING, max_size=None):
+    """
+    Divide os retângulos em páginas de até max_size x max_size, na ordem dada.
+
+    Cada página recebe o maior prefixo dos retângulos restantes que cabe
+    (busca exponencial + binária sobre pack_rects), então a ordem dos frames
+    se mantém entre as páginas.
+
+    Returns:
+        Lista de páginas (start, end, posições, largura, altura), com os
+        retângulos sizes[start:end]
+
+    Raises:
+        ValueError: Um retângulo sozinho não cabe em max_size
+    """
+    if max_size is None:
+        return [(0, len(sizes)) + pack_rects(sizes, padding)] if sizes else []
+
+    pages = []
+    start = 0
+    while start < len(sizes):
+        best = pack_rects(sizes[start:start + 1], padding, max_size)
+        if best is None:
+            w, h = sizes[start]
+            raise ValueError(f"Frame de {w}x{h} não cabe numa textura de {max_size}x{max_size}")
+
+        # Maior n que cabe: dobra até falhar, depois busca binária
+        fits, fails = 1, None
+        remaining = len(sizes) - start
+        while fits < remaining and fails is None:
+            n = min(fits * 2, remaining)
+            packed = pack_rects(sizes[start:start + n], padding, max_size)
+            if packed is None:
+                fails = n
+            else:
+                fits, best = n, packed
+        while fails is not None and fails - fits > 1:
+            n = (fits + fails) // 2
+            packed = pack_rects(sizes[start:start + n], padding, max_size)
+            if packed is None:
+                fails = n
+            else:
+                fits, best = n, packed
+
+        pages.append((start, start + fits) + best)
+        start += fits
+    return pages
+
+
+def frame_record(frame, trim=True):
+    """
+    Representação de um frame para o empacotador.
+
+    Returns:
+        Dicionário com image (recortada se trim), source_rect (x, y, w, h do
+        recorte no frame original) e source_size (w, h do frame original)
+    """
+    if trim:
+        image, source_rect = trim_frame(frame)
+    else:
+        image, source_rect = frame.convert("RGBA"), (0, 0) + frame.size
+    return {"image": image, "source_rect": source_rect, "source_size": frame.size}
+
+
+def _visible_pixels(image):
+    """
+    Array RGBA da imagem com RGB zerado onde alpha == 0.
+
+    Pixels invisíveis não contam na comparação entre frames.
+    """
+    data = np.array(image.convert("RGBA"))
+    data[data[:, :, 3] == 0] = 0
+    return data
+
+
+def _mean_abs_diff(a, b):
+    """
+    Diferença absoluta média por canal entre dois records, medida sobre o
+    frame original inteiro (fora dos recortes os dois são transparentes).
+    """
+    ax, ay, aw, ah = a["source_rect"]
+    bx, by, bw, bh = b["source_rect"]
+    ux, uy = min(ax, bx), min(ay, by)
+    uw, uh = max(ax + aw, bx + bw) - ux, max(ay + ah, by + bh) - uy
+
+    canvas_a = np.zeros((uh, uw, 4), dtype=np.int16)
+    canvas_b = np.zeros((uh, uw, 4), dtype=np.int16)
+    canvas_a[ay - uy:ay - uy + ah, ax - ux:ax - ux + aw] = a["_visible"]
+    canvas_b[by - uy:by - uy + bh, bx - ux:bx - ux + bw] = b["_visible"]
+
+    src_w, src_h = a["source_size"]
+    return np.abs(canvas_a - canvas_b).sum() / (src_w * src_h * 4)
+
+
+def find_duplicates(records, tolerance=0):
+    """
+    Detecta frames repetidos (records de frame_record).
+
+    Com tolerance=0, só frames exatamente iguais (hash do conteúdo visível).
+    Com tolerance > 0, também frames do mesmo tamanho original cuja diferença
+    absoluta média por canal (0-255) seja <= tolerance.
+
+    Returns:
+        Lista onde o item i é o índice do frame que representa o frame i
+        (o próprio i se ele for único)
+    """
+    representative = []
+    by_digest = {}
+    uniques = []  # (índice, record com pixels visíveis, soma por canal) dos únicos
+
+    for i, record in enumerate(records):
+        data = _visible_pixels(record["image"])
+        key = repr((record["source_size"], record["source_rect"])).encode()
+        digest = hashlib.sha1(key + data.tobytes()).hexdigest()
+
+        if digest in by_digest:
+            representative.append(by_digest[digest])
+            continue
+
+        match = sums = None
+        if tolerance > 0:
+            candidate = dict(record, _visible=data)
+            sums = data.sum(axis=(0, 1), dtype=np.int64)
+            src_w, src_h = record["source_size"]
+            for j, other, other_sums in uniques:
+                if other["source_size"] != record["source_size"]:
+                    continue
+                # A diferença média nunca é menor que a diferença das médias
+                if np.abs(sums - other_sums).sum() / (src_w * src_h * 4) > tolerance:
+                    continue
+                if _mean_abs_diff(candidate, other) <= tolerance:
+                    match = j
+                    break
+
+        if match is None:
+            by_digest[digest] = i
+            if tolerance > 0:
+                uniques.append((i, candidate, sums))
+            representative.append(i)
+        else:
+            by_digest[digest] = match
+            representative.append(match)
+
+    return representative
+
+
+def pack_records(records, padding=DEFAULT_PADDING, dedupe=True, tolerance=0):
+    """
+    Empacota records (ver frame_record) já recortados numa única página.
+
+    Args:
+        records: Lista de records
+        padding: Espaço entre retângulos no atlas
+        dedupe: Guarda frames repetidos uma única vez (ver find_duplicates)
+        tolerance: Diferença média por canal aceita como "quase idêntico"
+
+    Returns:
+        Tupla (lista de placements, largura do atlas, altura do atlas). Cada
+        placement é o record com x, y (posição no atlas) e alias_of (índice do
+        frame representante, ou None se for único).
+    """
+    placements, pages = pack_records_pages(records, padding, dedupe, tolerance)
+    atlas_w, atlas_h = pages[0] if pages else (0, 0)
+    return placements, atlas_w, atlas_h
+
+
+def pack_records_pages(records, padding=DEFAULT_PADDING, dedupe=True, tolerance=0, max_size=None):
+    """
+    Como pack_records, mas dividindo o atlas em páginas de até max_size x
+    max_size (ver pack_pages).
+
+    Returns:
+        Tupla (lista de placements, lista de (largura, altura) por página).
+        Cada placement tem também page (índice da página); cópias ficam na
+        página do representante.
+
+    Raises:
+        ValueError: Um frame recortado não cabe em max_size
+    """
+    representative = find_duplicates(records, tolerance) if dedupe else list(range(len(records)))
+
+    placements = []
+    for i, record in enumerate(records):
+        rep = representative[i]
+        if rep != i:
+            placements.append(dict(placements[rep], alias_of=rep))
+        else:
+            placements.append(dict(record, alias_of=None))
+
+    unique = [p for p in placements if p["alias_of"] is None]
+    pages = []
+    for start, end, positions, page_w, page_h in pack_pages([p["image"].size for p in unique], padding, max_size):
+        for placement, (x, y) in zip(unique[start:end], positions):
+            placement["x"], placement["y"], placement["page"] = x, y, len(pages)
+        pages.append((page_w, page_h))
+
+    # Cópias usam o retângulo do representante
+    for placement in placements:
+        if placement["alias_of"] is not None:
+            rep = placements[placement["alias_of"]]
+            placement["x"], placement["y"], placement["page"] = rep["x"], rep["y"], rep["page"]
+
+    return placements, pages
+
+
+def pack_frames(frames, padding=DEFAULT_PADDING, trim=True, dedupe=True, tolerance=0):
+    """
+    Recorta e empacota imagens PIL (ver frame_record e pack_records).
+    """
+    return pack_records([frame_record(f, trim) for f in frames], padding, dedupe, tolerance)
+
+
+def render_atlas(placements, atlas_w, atlas_h):
+    """
+    Cola as imagens empacotadas numa nova imagem RGBA transparente.
+    """
+    atlas = Image.new('RGBA', (atlas_w, atlas_h), (0, 0, 0, 0))
+    for placement in placements:
+        if placement.get("alias_of") is not None:
+            continue
+        atlas.paste(placement["image"], (placement["x"], placement["y"]))
+    return atlas
+
+
+def frame_entry(placement, factor=1):
+    """
+    Entrada do JSON (formato hash do TexturePacker/Phaser) para um placement.
+
+    Com factor > 1, descreve o frame na camada reduzida por esse fator (o
+    placement precisa estar alinhado, ver align_record). Uma célula alinhada
+    que passa da borda do frame original é cortada no tamanho original.
+    """
+    sx, sy, sw, sh = placement["source_rect"]
+    src_w, src_h = placement["source_size"]
+    sw, sh = min(sw, src_w - sx), min(sh, src_h - sy)
+    trimmed = (sx, sy, sw, sh) != (0, 0, src_w, src_h)
+    if factor > 1:
+        sx, sy = sx // factor, sy // factor
+        sw, sh = -(-sw // factor), -(-sh // factor)
+        src_w, src_h = -(-src_w // factor), -(-src_h // factor)
+    return {
+        "frame": {"x": placement["x"] // factor, "y": placement["y"] // factor, "w": sw, "h": sh},
+        "rotated": False,
+        "trimmed": trimmed,
+        "spriteSourceSize": {"x": sx, "y": sy, "w": sw, "h": sh},
+        "sourceSize": {"w": src_w, "h": src_h}
+    }
+
+
+def pages_json(textures, meta, factor=1):
+    """
+    JSON "multiatlas" do Phaser (this.load.multiatlas) para um atlas em páginas.
+
+    Args:
+        textures: Lista de páginas, cada uma um dicionário com image (nome do
+                  arquivo), size (w, h) e frames (lista de (nome, placement))
+        meta: Campos extras de meta (ex: scale)
+        factor: Fator de redução da camada (ver frame_entry)
+    """
+    return {
+        "textures": [
+            {
+                "image": texture["image"],
+                "format": "RGBA8888",
+                "size": {"w": texture["size"][0], "h": texture["size"][1]},
+                "scale": 1 / factor if factor > 1 else 1,
+                "frames": [dict(filename=name, **frame_entry(placement, factor))
+                           for name, placement in texture["frames"]]
+            }
+            for texture in textures
+        ],
+        "meta": meta
+    }
+
+
+def remove_stale_pages(png_path):
+    """
+    Apaga o que uma geração anterior gravou com o mesmo nome (nome.png,
+    nome-0.png, nome@0.5x-1.webp, nome.json, ...) antes de gravar de novo: com
+    menos páginas, camadas ou formatos, as sobras não seriam sobrescritas e
+    continuariam na pasta.
+    """
+    folder, filename = os.path.split(png_path)
+    extensions = sorted({'.png', '.json'} | {f["ext"] for f in VARIANT_FORMATS.values()})
+    pattern = re.compile(re.escape(os.path.splitext(filename)[0]) + r'(@[\d.]+x)?(-\d+)?(' +
+                         '|'.join(re.escape(ext) for ext in extensions) + ')')
+    try:
+        names = os.listdir(folder or '.')
+    except FileNotFoundError:
+        return
+    for name in names:
+        if pattern.fullmatch(name):
+            os.remove(os.path.join(folder, name))
+
+
+# ---------------------------------------------------------------------------
+# Camadas de resolução
+# ---------------------------------------------------------------------------
+
+def parse_tiers(text):
+    """
+    Lê as escalas das camadas extras (ex: "0.5,0.25" ou [0.5]).
+
+    Returns:
+        Lista de fatores de redução inteiros (0.5 -> 2, 0.25 -> 4), sem repetir
+
+    Raises:
+        ValueError: Escala que não é 1/n para um inteiro n >= 2
+    """
+    scales = [float(t) for t in text.split(',') if t.strip()] if isinstance(text, str) else list(text)
+    factors = []
+    for scale in scales:
+        factor = round(1 / scale) if 0 < scale < 1 else 0
+        if factor < 2 or abs(1 / factor - scale) > 1e-6:
+            raise ValueError(f"Escala {scale} inválida: use 1/n (0.5, 0.25, ...)")
+        if factor not in factors:
+            factors.append(factor)
+    return factors
+
+
+def tier_suffix(factor):
+    """
+    Sufixo do nome dos arquivos de uma camada: "" para 1x, "@0.5x" para o fator 2.
+    """
+    return "" if factor == 1 else f"@{1 / factor:g}x"
+
+
+def tier_paths(path, tiers):
+    """
+    O caminho e o de cada camada (escalas como em parse_tiers), ex:
+    nome_atlas.json -> [nome_atlas.json, nome_atlas@0.5x.json].
+    """
+    base, ext = os.path.splitext(path)
+    return [path] + [f"{base}{tier_suffix(factor)}{ext}" for factor in parse_tiers(tiers)]
+
+
+def atlas_outputs(png_path, formats=(), tiers=()):
+    """
+    Arquivos de um atlas de uma página só: PNG, JSON e variantes de cada
+    camada (para o cache de builds e as dependências entre assets). Com
+    páginas, os nomes (nome_atlas-0.png, ...) só se sabem depois de empacotar.
+    """
+    pngs = tier_paths(png_path, tiers)
+    jsons = tier_paths(os.path.splitext(png_path)[0] + '.json', tiers)
+    return pngs + jsons + [path for png in pngs for path in variant_outputs(png, formats)]
+
+
+def tier_step(factors):
+    """
+    Grade de alinhamento que serve a todas as camadas (mínimo múltiplo comum).
+    """
+    step = 1
+    for factor in factors:
+        step = step * factor // math.gcd(step, factor)
+    return step
+
+
+def align_record(record, step):
+    """
+    Expande o recorte de um record para a grade de step px: posição no frame
+    original e tamanho múltiplos de step, com o espaço novo transparente.
+    """
+    if step == 1:
+        return record
+    sx, sy, sw, sh = record["source_rect"]
+    x0, y0 = sx // step * step, sy // step * step
+    x1, y1 = -(-(sx + sw) // step) * step, -(-(sy + sh) // step) * step
+
+    cell = Image.new('RGBA', (x1 - x0, y1 - y0), (0, 0, 0, 0))
+    cell.paste(record["image"], (sx - x0, sy - y0))
+    return dict(record, image=cell, source_rect=(x0, y0, x1 - x0, y1 - y0))
+
+
+def reduce_atlas(atlas, factor):
+    """
+    Reduz uma página alinhada pelo fator: cada pixel novo é a média (com alpha
+    pré-multiplicado) de um bloco factor x factor, que fica dentro de uma
+    única célula.
+    """
+    return atlas.convert('RGBa').reduce(factor).convert('RGBA')
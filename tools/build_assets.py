@@ -0,0 +1,484 @@
+"""
+Gera os assets do jogo a partir de uma especificação declarativa (JSON).
+
+Cada asset diz de onde vem, qual ferramenta usar, com quais parâmetros e
+onde salvar. Quando a saída de um asset é a entrada de outro (ex: GIF ->
+GIF sem fundo -> spritesheet/atlas), o segundo depende do primeiro; o grafo
+é montado a partir dos caminhos. Assets independentes são gerados em paralelo
+e só os desatualizados são refeitos (ver build_cache.py): mudou a entrada, os
+parâmetros ou o código da ferramenta, o asset e tudo que depende dele é
+refeito; o resto é pulado.
+
+As ferramentas rodam neste mesmo processo (as funções dos scripts são
+chamadas direto), sem um interpretador novo por asset.
+
+Especificação (caminhos relativos à pasta onde o comando é executado):
+
+    {
+      "assets": [
+        {"name": "spider_no_bg", "tool": "remove-gif-background",
+         "source": "images/objects/spider.gif",
+         "output": "images/objects/spider_no_bg.gif",
+         "params": {"threshold": 20}},
+        {"name": "spider_atlas", "tool": "atlas",
+         "source": "images/objects/spider_no_bg.gif",
+         "output": "images/objects/spider_atlas.png",
+         "params": {"steps": ["trim"]}}
+      ]
+    }
+
+Ferramentas e parâmetros:
+  mp4-to-atlas          threshold, max_frames, mask, pingpong, mirror,
+                        dedupe_tolerance              (saída: nome_atlas.png)
+  atlas                 steps (estágios do frame_pipeline, ex: ["key=30", "trim",
+                        "mirror"]), max_frames, dedupe_tolerance (saída: nome_atlas.png)
+  remove-gif-background threshold, colors (paleta global do GIF), quality (WebP
+                        com perdas); a saída pode ser .gif, .png (APNG) ou .webp
+  gif-to-spritesheet    columns (colunas da grade; padrão: uma linha só)
+  transparencia         threshold, remover_borda_branca, suavizar_bordas
+
+mask é um retângulo [x1,y1,x2,y2] ou uma lista de retângulos, polígonos
+([x1,y1,x2,y2,x3,y3,...]) e imagens de máscara ("images/objects/logo_mask.png");
+mudou a imagem, o asset é refeito.
+
+mp4-to-atlas, atlas e gif-to-spritesheet aceitam também os parâmetros de
+codificação (ver image_formats.py): formats (lista como ["webp", "avif"],
+codificações extras ao lado do PNG), quality, alpha_quality, palette
+(true/false: PNG indexado quando a perda é pequena), palette_error e
+max_size (lado máximo da textura; divide em páginas, ver atlas_packer.py)
+e tiers (escalas das camadas reduzidas, ex: [0.5]).
+
+Uso: python build_assets.py <spec.json> [assets...] [--jobs N] [--force] [--dry-run]
+
+  assets    : gera só estes assets (e o que eles precisam); padrão: todos
+  --jobs N  : assets gerados ao mesmo tempo (padrão: 1; 0 = todos os núcleos)
+  --force   : refaz mesmo os assets atualizados
+  --dry-run : só mostra o que seria refeito
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from animation_encoder import GIF_COLORS
+from atlas_packer import atlas_outputs, tier_paths
+from build_cache import TOOLS_DIR, cached_build, is_fresh
+from chroma_key import mask_files, mask_shapes
+from frame_pool import parse_jobs_arg
+from image_formats import DEFAULT_ALPHA_QUALITY, DEFAULT_PALETTE_ERROR, DEFAULT_QUALITY, variant_outputs
+
+
+# ---------------------------------------------------------------------------
+# Ferramentas
+# ---------------------------------------------------------------------------
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def load_tool(script):
+    """
+    Importa o módulo de uma ferramenta pelo nome do script (ex: "mp4-to-atlas"
+    -> mp4_to_atlas.py), uma vez só por processo.
+    """
+    with _modules_lock:
+        if script not in _modules:
+            if TOOLS_DIR not in sys.path:
+                sys.path.insert(0, TOOLS_DIR)
+            _modules[script] = importlib.import_module(script.replace('-', '_'))
+        return _modules[script]
+
+
+def _atlas_base(output):
+    """
+    Pasta e nome de um atlas a partir do caminho do PNG (images/objects/fogo_atlas.png).
+    """
+    output_dir, filename = os.path.split(output)
+    name = filename[:-len('_atlas.png')] if filename.endswith('_atlas.png') else os.path.splitext(filename)[0]
+    return output_dir or '.', name
+
+
+def _atlas_outputs(output, params):
+    output_dir, name = _atlas_base(output)
+    return atlas_outputs(os.path.join(output_dir, f"{name}_atlas.png"), params.get("formats", []),
+                         params.get("tiers", ()))
+
+
+def _spritesheet_outputs(output, params):
+    pngs = tier_paths(output, params.get("tiers", ()))
+    return pngs + [path for png in pngs for path in variant_outputs(png, params.get("formats", []))]
+
+
+def _run_mp4_to_atlas(source, output, params, force):
+    output_dir, name = _atlas_base(output)
+    return load_tool("mp4-to-atlas").mp4_to_atlas(
+        source, name,
+        threshold=params.get("threshold", 30),
+        max_frames=params.get("max_frames", 20),
+        output_dir=output_dir,
+        mask_region=params.get("mask"),
+        pingpong=params.get("pingpong", False),
+        mirror=params.get("mirror", False),
+        dedupe_tolerance=params.get("dedupe_tolerance", 0),
+        formats=params.get("formats", ()),
+        quality=params.get("quality", DEFAULT_QUALITY),
+        alpha_quality=params.get("alpha_quality", DEFAULT_ALPHA_QUALITY),
+        palette=params.get("palette", False),
+        palette_error=params.get("palette_error", DEFAULT_PALETTE_ERROR),
+        max_size=params.get("max_size"),
+        tiers=params.get("tiers", ()),
+        force=force
+    )
+
+
+def _run_atlas(source, output, params, force):
+    import frame_pipeline
+    output_dir, name = _atlas_base(output)
+    steps, options = frame_pipeline.parse_steps(params.get("steps", []))
+    for option in ("max_frames", "dedupe_tolerance", "formats", "quality", "alpha_quality",
+                   "palette", "palette_error", "max_size", "tiers"):
+        if option in params:
+            options[option] = params[option]
+    return frame_pipeline.run_pipeline(source, os.path.join(output_dir, name), steps, **options)
+
+
+def _run_remove_gif_background(source, output, params, force):
+    return load_tool("remove-gif-background").remover_fundo_gif(
+        source, output, threshold=params.get("threshold", 10),
+        quality=params.get("quality"), colors=params.get("colors", GIF_COLORS))
+
+
+def _run_gif_to_spritesheet(source, output, params, force):
+    return load_tool("gif-to-spritesheet").gif_to_spritesheet(
+        source, output,
+        formats=params.get("formats", ()),
+        quality=params.get("quality", DEFAULT_QUALITY),
+        alpha_quality=params.get("alpha_quality", DEFAULT_ALPHA_QUALITY),
+        palette=params.get("palette", False),
+        palette_error=params.get("palette_error", DEFAULT_PALETTE_ERROR),
+        max_size=params.get("max_size"),
+        tiers=params.get("tiers", ()),
+        columns=params.get("columns"),
+        force=force
+    )
+
+
+def _run_transparencia(source, output, params, force):
+    return load_tool("transparencia").remover_fundo_solido(
+        source, output,
+        threshold=params.get("threshold", 10),
+        remover_borda_branca=params.get("remover_borda_branca", True),
+        suavizar_bordas=params.get("suavizar_bordas", True),
+        force=force
+    )
+
+
+# Ferramenta -> função que gera o asset, saídas geradas e código que define o resultado
+TOOLS = {
+    "mp4-to-atlas": {
+        "run": _run_mp4_to_atlas,
+        "outputs": _atlas_outputs,
+        "code": ["mp4_to_atlas.py", "frame_pipeline.py", "atlas_packer.py", "chroma_key.py", "image_formats.py"]
+    },
+    "atlas": {
+        "run": _run_atlas,
+        "outputs": _atlas_outputs,
+        "code": ["frame_pipeline.py", "atlas_packer.py", "chroma_key.py", "image_formats.py"]
+    },
+    "remove-gif-background": {
+        "run": _run_remove_gif_background,
+        "outputs": lambda output, params: [output],
+        "code": ["remove_gif_background.py", "chroma_key.py", "animation_encoder.py", "media_info.py",
+                 "frame_pipeline.py"]
+    },
+    "gif-to-spritesheet": {
+        "run": _run_gif_to_spritesheet,
+        "outputs": _spritesheet_outputs,
+        "code": ["gif_to_spritesheet.py", "image_formats.py", "atlas_packer.py"]
+    },
+    "transparencia": {
+        "run": _run_transparencia,
+        "outputs": lambda output, params: [output],
+        "code": ["transparencia.py", "chroma_key.py"]
+    }
+}
+
+
+# ---------------------------------------------------------------------------
+# Grafo
+# ---------------------------------------------------------------------------
+
+def load_spec(spec_path):
+    """
+    Lê a especificação e valida os assets.
+
+    Returns:
+        Lista de assets (dicionários com name, tool, source, output, params,
+        outputs e deps), na ordem do arquivo
+
+    Raises:
+        ValueError: Especificação inválida (ferramenta desconhecida, nomes ou
+                    saídas repetidos, dependência circular)
+    """
+    with open(spec_path) as f:
+        spec = json.load(f)
+    return make_assets(spec.get("assets", []))
+
+
+def make_assets(items):
+    """
+    Valida os assets de uma especificação (lista de dicionários com name,
+    tool, source, output e params) e liga as dependências.
+
+    Returns:
+        Lista de assets, como em load_spec
+
+    Raises:
+        ValueError: Asset inválido, nomes ou saídas repetidos, dependência circular
+    """
+    assets = []
+    names = set()
+    for i, item in enumerate(items):
+        name = item.get("name") or item.get("output")
+        for field in ("tool", "source", "output"):
+            if not item.get(field):
+                raise ValueError(f"Asset {name or i}: campo '{field}' obrigatório")
+        if item["tool"] not in TOOLS:
+            raise ValueError(f"Asset {name}: ferramenta desconhecida '{item['tool']}' "
+                             f"(disponíveis: {', '.join(sorted(TOOLS))})")
+        if name in names:
+            raise ValueError(f"Asset repetido: {name}")
+        try:
+            mask_shapes(item.get("params", {}).get("mask"))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Asset {name}: máscara inválida ({e})")
+        try:
+            outputs = TOOLS[item["tool"]]["outputs"](item["output"], item.get("params", {}))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Asset {name}: camadas inválidas ({e})")
+        names.add(name)
+
+        assets.append({
+            "name": name,
+            "tool": item["tool"],
+            "source": item["source"],
+            "output": item["output"],
+            "params": item.get("params", {}),
+            "outputs": outputs
+        })
+
+    # Dependências: a entrada de um asset é a saída de outro
+    producers = {}
+    for asset in assets:
+        for path in asset["outputs"]:
+            key = os.path.abspath(path)
+            if key in producers:
+                raise ValueError(f"Saída {path} gerada por {producers[key]} e {asset['name']}")
+            producers[key] = asset["name"]
+
+    for asset in assets:
+        producer = producers.get(os.path.abspath(asset["source"]))
+        asset["deps"] = [producer] if producer else []
+
+    topological_order(assets)
+    return assets
+
+
+def topological_order(assets):
+    """
+    Nomes dos assets com cada um depois das suas dependências.
+
+    Raises:
+        ValueError: Dependência circular
+    """
+    by_name = {a["name"]: a for a in assets}
+    order = []
+    state = {}  # nome -> "visitando" ou "pronto"
+
+    def visit(name, path):
+        if state.get(name) == "pronto":
+            return
+        if state.get(name) == "visitando":
+            raise ValueError(f"Dependência circular: {' -> '.join(path + [name])}")
+        state[name] = "visitando"
+        for dep in by_name[name]["deps"]:
+            visit(dep, path + [name])
+        state[name] = "pronto"
+        order.append(name)
+
+    for asset in assets:
+        visit(asset["name"], [])
+    return order
+
+
+def select_assets(assets, targets):
+    """
+    Assets pedidos e tudo de que eles dependem (todos, se targets estiver vazio).
+
+    Raises:
+        ValueError: Asset pedido não existe na especificação
+    """
+    if not targets:
+        return assets
+
+    by_name = {a["name"]: a for a in assets}
+    wanted = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in by_name:
+            raise ValueError(f"Asset desconhecido: {name}")
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(by_name[name]["deps"])
+    return [a for a in assets if a["name"] in wanted]
+
+
+# ---------------------------------------------------------------------------
+# Execução
+# ---------------------------------------------------------------------------
+
+def asset_sources(asset):
+    """
+    Arquivos de entrada do asset: a fonte e as imagens de máscara dos parâmetros.
+    """
+    return [asset["source"]] + mask_files(asset["params"].get("mask"))
+
+
+def _cache_args(asset):
+    tool = TOOLS[asset["tool"]]
+    return (f"build-assets/{asset['tool']}", asset_sources(asset), asset["params"], asset["outputs"],
+            tool["code"] + [__file__])
+
+
+def asset_is_fresh(asset):
+    """
+    True se o asset está atualizado em relação à entrada, parâmetros e código.
+    """
+    return is_fresh(*_cache_args(asset))
+
+
+def build_asset(asset, force=False):
+    """
+    Gera um asset (se estiver desatualizado).
+
+    Returns:
+        Tupla (status, resultado da ferramenta); status é "atualizado", "gerado" ou "falhou"
+    """
+    if not force and asset_is_fresh(asset):
+        return "atualizado", None
+
+    tool = TOOLS[asset["tool"]]
+    tool_name, sources, params, outputs, code = _cache_args(asset)
+    result = cached_build(tool_name, sources, params, outputs,
+                          lambda: tool["run"](asset["source"], asset["output"], asset["params"], force),
+                          version_files=code, force=True)
+    if isinstance(result, dict) and result.get("outputs"):
+        outputs = result["outputs"]
+    if result is None or not all(os.path.exists(path) for path in outputs):
+        return "falhou", result
+    return "gerado", result
+
+
+def build_assets(assets, jobs=1, force=False):
+    """
+    Gera os assets respeitando as dependências, até `jobs` ao mesmo tempo.
+
+    Um asset só começa depois que as dependências terminaram; se alguma
+    falhar, ele é pulado.
+
+    Returns:
+        Dicionário nome -> status ("atualizado", "gerado", "falhou" ou "pulado")
+    """
+    by_name = {a["name"]: a for a in assets}
+    waiting = {a["name"]: {d for d in a["deps"] if d in by_name} for a in assets}
+    dependents = {name: [] for name in by_name}
+    for name, deps in waiting.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    status = {}
+
+    def finish(name, result):
+        status[name] = result
+        for child in dependents[name]:
+            waiting[child].discard(name)
+            if result in ("falhou", "pulado"):
+                finish(child, "pulado")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        running = {}
+        while True:
+            for name in [n for n in by_name if n not in status and n not in running.values()
+                         and not waiting[n]]:
+                print(f"\n>>> {name} ({by_name[name]['tool']}: {by_name[name]['source']} -> "
+                      f"{by_name[name]['output']})")
+                running[executor.submit(build_asset, by_name[name], force)] = name
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()[0]
+                except Exception as e:
+                    print(f"\nErro ao gerar {name}: {e}")
+                    result = "falhou"
+                if name not in status:
+                    finish(name, result)
+
+    return status
+
+
+def dry_run(assets):
+    """
+    Mostra o que seria refeito, sem gerar nada. Um asset cuja dependência
+    será refeita também é refeito.
+    """
+    by_name = {a["name"]: a for a in assets}
+    stale = set()
+    for name in topological_order(assets):
+        asset = by_name[name]
+        if any(dep in stale for dep in asset["deps"]) or not asset_is_fresh(asset):
+            stale.add(name)
+            print(f"  refazer    {name} -> {asset['output']}")
+        else:
+            print(f"  atualizado {name}")
+    return stale
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    force = '--force' in args
+    dry = '--dry-run' in args
+    args = [a for a in args if a not in ('--force', '--dry-run')]
+
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    try:
+        assets = select_assets(load_spec(args[0]), args[1:])
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
+    if dry:
+        dry_run(assets)
+        sys.exit(0)
+
+    status = build_assets(assets, jobs, force)
+
+    print("\n" + "=" * 70)
+    for label in ("gerado", "atualizado", "falhou", "pulado"):
+        names = [n for n, s in status.items() if s == label]
+        if names:
+            print(f"  {label}: {len(names)} ({', '.join(names)})")
+    print("=" * 70)
+
+    if any(s in ("falhou", "pulado") for s in status.values()):
+        sys.exit(1)
@@ -0,0 +1,260 @@
+"""
+Cache incremental de builds, endereçado pelo conteúdo.
+
+Cada saída gerada (ex: fogo_atlas.png/json) é registrada num manifesto local
+(.build-cache.json, na pasta da saída) com uma chave calculada a partir de:
+
+  - hash SHA-1 do conteúdo dos arquivos de entrada
+  - parâmetros que mudam o resultado (tolerância, max_frames, máscara, ...)
+  - versão da ferramenta (hash do código dos scripts envolvidos)
+
+Se a chave não mudou e as saídas continuam no disco como foram gravadas, a
+ferramenta devolve o resultado anterior sem reprocessar nada. O hash das
+entradas é memorizado por tamanho + data de modificação, então arquivos não
+tocados nem são relidos; um arquivo só "tocado" (mesmo conteúdo) continua
+sendo um acerto de cache.
+
+Uso nas ferramentas:
+    return cached_build("mp4-to-atlas", [video_path], params, [png_path, json_path],
+                        build, version_files=[__file__, "atlas_packer.py"])
+
+Parâmetros que não mudam a saída (ex: --jobs, --disk) não entram na chave.
+Use --force nas ferramentas para ignorar o cache.
+
+load_manifest, save_manifest, file_hash, file_stat e rel_path também servem
+a outros caches em JSON no mesmo formato (ex: frame_cache.py, media_info.py).
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+MANIFEST_NAME = '.build-cache.json'
+MANIFEST_VERSION = 1
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Builds em threads do mesmo processo (build_assets.py) gravam o mesmo manifesto
+_manifest_lock = threading.Lock()
+
+
+def _empty_manifest():
+    return {"version": MANIFEST_VERSION, "files": {}, "entries": {}}
+
+
+def load_manifest(manifest_path):
+    """
+    Lê o manifesto; arquivo ausente, corrompido ou de outra versão vira um manifesto vazio.
+    """
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return _empty_manifest()
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return _empty_manifest()
+    manifest.setdefault("files", {})
+    manifest.setdefault("entries", {})
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    """
+    Grava o manifesto de forma atômica (arquivo temporário + rename).
+    """
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def file_stat(path):
+    """
+    Tamanho e data de modificação (ns) do arquivo, como guardados no manifesto.
+    """
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def rel_path(path, base_dir):
+    """
+    Caminho relativo à pasta do manifesto (absoluto se estiver fora dela).
+    """
+    path = os.path.abspath(path)
+    rel = os.path.relpath(path, base_dir)
+    if rel.startswith('..'):
+        return path.replace(os.sep, '/')
+    return rel.replace(os.sep, '/')
+
+
+def file_hash(path, manifest=None, base_dir='.'):
+    """
+    SHA-1 do conteúdo do arquivo (lido em blocos).
+
+    Com um manifesto, o hash é reaproveitado enquanto tamanho e data de
+    modificação do arquivo não mudarem.
+    """
+    stat = file_stat(path)
+    rel = rel_path(path, base_dir)
+    if manifest is not None:
+        known = manifest["files"].get(rel)
+        if known and known["size"] == stat["size"] and known["mtime_ns"] == stat["mtime_ns"]:
+            return known["sha1"]
+
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    digest = sha1.hexdigest()
+
+    if manifest is not None:
+        manifest["files"][rel] = dict(stat, sha1=digest)
+    return digest
+
+
+def tool_version(*paths):
+    """
+    Versão da ferramenta: hash do código dos arquivos dados (caminhos
+    relativos são procurados na pasta tools/). Qualquer mudança no código
+    invalida as saídas geradas por ele.
+    """
+    sha1 = hashlib.sha1()
+    for path in paths:
+        if not os.path.isabs(path):
+            path = os.path.join(TOOLS_DIR, path)
+        with open(path, 'rb') as f:
+            sha1.update(f.read())
+    return sha1.hexdigest()[:16]
+
+
+def cache_key(tool, source_hashes, params, version):
+    """
+    Chave de cache: ferramenta + versão + hashes das entradas + parâmetros.
+    """
+    payload = json.dumps([tool, version, list(source_hashes), params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _outputs_intact(entry, base_dir):
+    """
+    True se todas as saídas registradas existem com o mesmo tamanho e data.
+    """
+    for rel, stat in entry.get("outputs", {}).items():
+        path = os.path.join(base_dir, rel)
+        try:
+            if file_stat(path) != stat:
+                return False
+        except OSError:
+            return False
+    return bool(entry.get("outputs"))
+
+
+def _lookup(tool, sources, params, outputs, version_files):
+    """
+    Calcula a chave e procura a entrada da saída no manifesto.
+
+    Returns:
+        Dicionário com manifest_path, manifest, entry_id, key (None se alguma
+        entrada não existe), entry (a entrada válida ou None) e files_changed
+        (algum hash de entrada foi recalculado)
+    """
+    base_dir = os.path.abspath(os.path.dirname(outputs[0]) or '.')
+    manifest_path = os.path.join(base_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    known_files = dict(manifest["files"])
+
+    found = {
+        "manifest_path": manifest_path,
+        "manifest": manifest,
+        "entry_id": f"{tool}:{rel_path(outputs[0], base_dir)}",
+        "key": None,
+        "entry": None
+    }
+    try:
+        source_hashes = [file_hash(path, manifest, base_dir) for path in sources]
+    except OSError:
+        found["files_changed"] = False
+        return found
+    found["files_changed"] = manifest["files"] != known_files
+    found["key"] = cache_key(tool, source_hashes, params, tool_version(*version_files))
+
+    entry = manifest["entries"].get(found["entry_id"])
+    if entry and entry["key"] == found["key"] and _outputs_intact(entry, base_dir):
+        found["entry"] = entry
+    return found
+
+
+def is_fresh(tool, sources, params, outputs, version_files=()):
+    """
+    True se cached_build com os mesmos argumentos não precisaria executar build().
+    """
+    return _lookup(tool, sources, params, outputs, version_files)["entry"] is not None
+
+
+def cached_build(tool, sources, params, outputs, build, version_files=(), force=False):
+    """
+    Executa build() só se as entradas, parâmetros ou a ferramenta mudaram.
+
+    Args:
+        tool: Nome da ferramenta (ex: "mp4-to-atlas")
+        sources: Caminhos dos arquivos de entrada
+        params: Dicionário com os parâmetros que afetam a saída
+        outputs: Caminhos das saídas geradas por build(); o manifesto fica na
+                 pasta da primeira
+        build: Função sem argumentos que gera as saídas e devolve um resultado
+               serializável em JSON (ou None em caso de erro). Se o resultado
+               tiver "outputs", essa lista substitui `outputs` como arquivos
+               gerados (saídas que só se conhecem depois, ex: páginas do atlas)
+        version_files: Arquivos de código cuja mudança invalida o cache
+        force: Ignora o cache e sempre executa build()
+
+    Returns:
+        Resultado de build(), ou o resultado guardado no manifesto
+    """
+    found = _lookup(tool, sources, params, outputs, version_files)
+    if found["key"] is None:
+        # Entrada ausente: a própria ferramenta reporta o erro
+        return build()
+
+    entry = found["entry"]
+    if entry and not force:
+        if isinstance(entry["result"], dict) and entry["result"].get("outputs"):
+            # Saídas informadas pelo próprio build (ex: páginas do atlas)
+            outputs = entry["result"]["outputs"]
+        print(f"\n[cache] {', '.join(outputs)} já atualizado(s); nada a fazer (use --force para refazer)")
+        if found["files_changed"]:
+            # Guardar os hashes de entradas que só foram "tocadas"
+            _merge_manifest(found["manifest_path"], found["manifest"]["files"], found["entry_id"], entry)
+        return entry["result"]
+
+    result = build()
+    if isinstance(result, dict) and result.get("outputs"):
+        outputs = result["outputs"]
+    if result is None or not all(os.path.exists(path) for path in outputs):
+        return result
+
+    base_dir = os.path.dirname(found["manifest_path"])
+    entry = {
+        "key": found["key"],
+        "outputs": {rel_path(path, base_dir): file_stat(path) for path in outputs},
+        "result": result
+    }
+    _merge_manifest(found["manifest_path"], found["manifest"]["files"], found["entry_id"], entry)
+    return result
+
+
+def _merge_manifest(manifest_path, files, entry_id, entry):
+    """
+    Relê o manifesto e grava só a entrada desta saída, preservando o que
+    outras execuções gravaram nesse meio tempo.
+    """
+    with _manifest_lock:
+        manifest = load_manifest(manifest_path)
+        manifest["files"].update(files)
+        manifest["entries"][entry_id] = entry
+        try:
+            save_manifest(manifest_path, manifest)
+        except OSError as e:
+            print(f"Aviso: Não foi possível gravar o cache ({manifest_path}): {e}")
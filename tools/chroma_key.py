@@ -0,0 +1,458 @@
+"""
+Motor de chroma key vetorizado, compartilhado pelas ferramentas de remoção de fundo
+(mp4-to-atlas.py, remove-gif-background.py, transparencia.py e transparencia-original.py).
+
+Processa o frame inteiro de uma vez com numpy, em vez de percorrer pixel a pixel
+com `pixels[x, y]`. As máscaras geradas são idênticas às dos loops originais:
+
+  - modo 'max': pixel é fundo se |R-r| <= t, |G-g| <= t e |B-b| <= t
+  - modo 'sum': pixel é fundo se |R-r| + |G-g| + |B-b| <= 3t; com suavização,
+    pixels com diferença até 6t recebem alpha gradual (rampa linear)
+
+Em imagens com paleta (modo P, frames de GIF) o teste é feito nas cores da
+paleta e aplicado pelo plano de índices (ver key_palette).
+
+Requisitos: pip install Pillow numpy
+"""
+
+import hashlib
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+def detect_bg_color(img):
+    """
+    Detecta a cor de fundo pelo pixel do canto superior esquerdo.
+
+    Returns:
+        Tupla (R, G, B)
+    """
+    return img.convert("RGBA").getpixel((0, 0))[:3]
+
+
+def color_diff(rgb, bg_color):
+    """
+    Calcula a diferença absoluta por canal entre cada pixel e a cor de fundo.
+
+    Args:
+        rgb: Array (H, W, 3) uint8
+        bg_color: Tupla (R, G, B)
+
+    Returns:
+        Array (H, W, 3) int16
+    """
+    bg = np.asarray(bg_color[:3], dtype=np.int16)
+    return np.abs(rgb.astype(np.int16) - bg)
+
+
+def background_mask_max(rgb, bg_color, threshold):
+    """
+    Máscara booleana de fundo usando a diferença máxima por canal.
+    """
+    return color_diff(rgb, bg_color).max(axis=2) <= threshold
+
+
+def background_alpha_sum(rgb, alpha, bg_color, threshold, soft_edges=True):
+    """
+    Novo canal alpha usando a soma das diferenças por canal.
+
+    Pixels com diferença <= 3t ficam transparentes. Com soft_edges, pixels com
+    diferença até 6t recebem alpha = int((diff - 3t) / 3t * 255). Os demais
+    mantêm o alpha original.
+
+    Args:
+        rgb: Array (H, W, 3) uint8
+        alpha: Array (H, W) uint8 com o alpha atual
+        bg_color: Tupla (R, G, B)
+        threshold: Tolerância por canal
+        soft_edges: Aplica a rampa de transparência nas bordas
+
+    Returns:
+        Array (H, W) uint8
+    """
+    diff = color_diff(rgb, bg_color).sum(axis=2, dtype=np.int32)
+    limit = threshold * 3
+
+    new_alpha = alpha.copy()
+    new_alpha[diff <= limit] = 0
+
+    if soft_edges:
+        ramp = (diff > limit) & (diff <= threshold * 6)
+        if ramp.any():
+            # Mesma ordem de operações do loop original (float64, truncado por int())
+            values = (diff[ramp] - limit) / limit * 255
+            new_alpha[ramp] = np.clip(values.astype(np.int64), 0, 255)
+
+    return new_alpha
+
+
+def _rect_bounds(rect, width, height):
+    """
+    Retângulo (x1, y1, x2, y2), limites inclusivos, cortado ao frame; None se ficar vazio.
+    """
+    x1, y1, x2, y2 = rect
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(width - 1, x2), min(height - 1, y2)
+    if x1 <= x2 and y1 <= y2:
+        return x1, y1, x2, y2
+    return None
+
+
+def _mask_shape(values):
+    """
+    Forma a partir de uma lista de números: 4 = retângulo (x1, y1, x2, y2);
+    6 ou mais (pares x, y) = polígono.
+    """
+    if values and all(isinstance(v, (list, tuple)) for v in values):
+        values = [c for point in values for c in point]  # [[x, y], ...] -> polígono
+    values = [int(v) for v in values]
+    if len(values) == 4:
+        return ("rect", tuple(values))
+    if len(values) >= 6 and len(values) % 2 == 0:
+        return ("polygon", [(values[i], values[i + 1]) for i in range(0, len(values), 2)])
+    raise ValueError(f"Forma de máscara inválida: {values} (use x1,y1,x2,y2 ou x1,y1,x2,y2,x3,y3,...)")
+
+
+def mask_shapes(mask_region):
+    """
+    Normaliza uma máscara em uma lista de formas ("rect", (x1, y1, x2, y2)),
+    ("polygon", [(x, y), ...]), ("image", caminho) ou ("plane", array bool).
+
+    A máscara pode ser None, um retângulo (x1, y1, x2, y2), um texto da linha
+    de comando (ver parse_mask), um plano booleano (H, W) ou uma lista
+    misturando retângulos, polígonos (lista de números ou de pares) e
+    caminhos de imagens de máscara.
+
+    Raises:
+        ValueError: Forma inválida
+    """
+    if mask_region is None:
+        return []
+    if isinstance(mask_region, np.ndarray):
+        return [("plane", mask_region.astype(bool, copy=False))]
+    if isinstance(mask_region, str):
+        return parse_mask(mask_region)
+    if not mask_region:
+        return []
+    if all(isinstance(v, (int, np.integer)) for v in mask_region):
+        return [_mask_shape(list(mask_region))]
+    if all(isinstance(v, (list, tuple)) and len(v) == 2 and not isinstance(v[0], str) for v in mask_region):
+        return [_mask_shape(list(mask_region))]  # Um polígono como lista de pares
+
+    shapes = []
+    for item in mask_region:
+        if isinstance(item, str):
+            shapes.append(("image", item))
+        elif isinstance(item, np.ndarray):
+            shapes.append(("plane", item.astype(bool, copy=False)))
+        elif isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str):
+            shapes.append(item)  # Já normalizada
+        else:
+            shapes.append(_mask_shape(list(item)))
+    return shapes
+
+
+def parse_mask(text):
+    """
+    Máscara da linha de comando: formas separadas por ';', cada uma um
+    retângulo (x1,y1,x2,y2), um polígono (x1,y1,x2,y2,x3,y3,...) ou o
+    caminho de uma imagem de máscara (ex: "700,400,864,480;logo_mask.png").
+
+    Returns:
+        Lista de formas (ver mask_shapes)
+
+    Raises:
+        ValueError: Forma inválida
+    """
+    shapes = []
+    for part in text.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            values = [int(v) for v in part.split(',')]
+        except ValueError:
+            shapes.append(("image", part))
+        else:
+            shapes.append(_mask_shape(values))
+    return shapes
+
+
+def mask_files(mask_region):
+    """
+    Caminhos das imagens de máscara (entram no cache de builds junto com a fonte).
+    """
+    return [value for kind, value in mask_shapes(mask_region) if kind == "image"]
+
+
+def mask_params(mask_region):
+    """
+    Máscara em forma de JSON, para a chave do cache de builds (um retângulo
+    só continua [x1, y1, x2, y2]; imagens entram pelo caminho, o conteúdo
+    entra como fonte, ver mask_files).
+    """
+    shapes = mask_shapes(mask_region)
+    if not shapes:
+        return None
+    if len(shapes) == 1 and shapes[0][0] == "rect":
+        return list(shapes[0][1])
+    params = []
+    for kind, value in shapes:
+        if kind == "plane":
+            value = hashlib.sha1(np.packbits(value).tobytes() + str(value.shape).encode()).hexdigest()
+        elif kind == "polygon":
+            value = [list(point) for point in value]
+        elif kind == "rect":
+            value = list(value)
+        params.append([kind, value])
+    return params
+
+
+def describe_mask(mask_region):
+    """
+    Resumo da máscara para mostrar no console.
+    """
+    shapes = mask_shapes(mask_region)
+    if len(shapes) == 1 and shapes[0][0] == "rect":
+        return str(shapes[0][1])
+    names = {"rect": "retângulo(s)", "polygon": "polígono(s)", "plane": "plano(s)"}
+    parts = [f"{sum(1 for k, _ in shapes if k == kind)} {name}" for kind, name in names.items()
+             if any(k == kind for k, _ in shapes)]
+    return ', '.join(parts + [value for kind, value in shapes if kind == "image"])
+
+
+def _mask_image(path, size):
+    """
+    Plano de uma imagem de máscara: pixels brancos (ou opacos, se a imagem
+    tiver alpha) são mascarados.
+    """
+    with Image.open(path) as img:
+        if img.size != size:
+            raise ValueError(f"Máscara {path} tem {img.size[0]}x{img.size[1]}, "
+                             f"o frame tem {size[0]}x{size[1]}")
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        channel = img.convert('RGBA').getchannel('A') if has_alpha else img.convert('L')
+        return np.asarray(channel) >= 128
+
+
+def rasterize_mask(mask_region, size):
+    """
+    Rasteriza a máscara (ver mask_shapes) num plano booleano do tamanho do
+    frame, uma vez só, para ser aplicado a todos os frames de uma vez.
+
+    Args:
+        mask_region: Máscara em qualquer formato aceito por mask_shapes
+        size: Tupla (largura, altura) do frame
+
+    Returns:
+        Array (H, W) bool (True = mascarado), ou None se a máscara for vazia
+
+    Raises:
+        ValueError: Forma inválida ou imagem de máscara de outro tamanho
+    """
+    shapes = mask_shapes(mask_region)
+    if not shapes:
+        return None
+
+    width, height = size
+    plane = np.zeros((height, width), dtype=bool)
+    polygons = None
+    for kind, value in shapes:
+        if kind == "rect":
+            bounds = _rect_bounds(value, width, height)
+            if bounds:
+                x1, y1, x2, y2 = bounds
+                plane[y1:y2 + 1, x1:x2 + 1] = True
+        elif kind == "polygon":
+            if polygons is None:
+                polygons = Image.new('1', size, 0)
+                draw = ImageDraw.Draw(polygons)
+            draw.polygon(value, fill=1, outline=1)
+        elif kind == "image":
+            plane |= _mask_image(value, size)
+        else:
+            if value.shape != (height, width):
+                raise ValueError(f"Plano de máscara {value.shape[1]}x{value.shape[0]}, "
+                                 f"o frame tem {width}x{height}")
+            plane |= value
+    if polygons is not None:
+        plane |= np.asarray(polygons, dtype=bool)
+    return plane
+
+
+def apply_mask_region(alpha, mask_region):
+    """
+    Zera o alpha dentro da máscara: retângulo (x1, y1, x2, y2) com limites
+    inclusivos, lista de formas ou plano booleano já rasterizado (ver
+    rasterize_mask).
+    """
+    if mask_region is None or (not isinstance(mask_region, np.ndarray) and not mask_region):
+        return alpha
+
+    height, width = alpha.shape
+    if isinstance(mask_region, np.ndarray):
+        alpha[mask_region] = 0
+        return alpha
+
+    shapes = mask_shapes(mask_region)
+    if all(kind == "rect" for kind, _ in shapes):
+        # Só retângulos: direto por fatias, sem plano
+        for _, rect in shapes:
+            bounds = _rect_bounds(rect, width, height)
+            if bounds:
+                x1, y1, x2, y2 = bounds
+                alpha[y1:y2 + 1, x1:x2 + 1] = 0
+        return alpha
+
+    alpha[rasterize_mask(shapes, (width, height))] = 0
+    return alpha
+
+
+def palette_rgba(img):
+    """
+    Cores RGBA das 256 entradas da paleta de uma imagem em modo P, com o
+    índice transparente (info["transparency"]) já aplicado, exatamente como
+    img.convert("RGBA") as veria.
+
+    Returns:
+        Array (256, 4) uint8
+    """
+    strip = Image.frombytes("P", (256, 1), bytes(range(256)))
+    strip.putpalette(img.getpalette(img.palette.mode), img.palette.mode)
+    if "transparency" in img.info:
+        strip.info["transparency"] = img.info["transparency"]
+    return np.array(strip.convert("RGBA"))[0]
+
+
+def key_palette(img, bg_color, threshold, mode='max', soft_edges=True):
+    """
+    Chroma key sobre a paleta: o teste de cor é feito uma vez por entrada
+    (no máximo 256) em vez de uma vez por pixel.
+
+    Returns:
+        Array (256, 4) uint8 com o alpha de cada entrada já ajustado
+    """
+    lut = palette_rgba(img)
+    rgb = lut[np.newaxis, :, :3]
+    if mode == 'max':
+        lut[background_mask_max(rgb, bg_color, threshold)[0], 3] = 0
+    elif mode == 'sum':
+        lut[:, 3] = background_alpha_sum(rgb, lut[np.newaxis, :, 3], bg_color, threshold, soft_edges)[0]
+    else:
+        raise ValueError(f"Modo de chroma key desconhecido: {mode}")
+    return lut
+
+
+def key_background(img, bg_color, threshold, mode='max', soft_edges=True, mask_region=None):
+    """
+    Remove o fundo de um frame inteiro de uma vez.
+
+    Os valores RGB são preservados; apenas o canal alpha é alterado. Imagens
+    em modo P (frames de GIF) usam key_palette e só viram RGBA no final, pela
+    tabela de cores aplicada ao plano de índices; o resultado é o mesmo.
+
+    Args:
+        img: Imagem PIL (qualquer modo, convertida para RGBA)
+        bg_color: Tupla (R, G, B) da cor de fundo
+        threshold: Tolerância de cor
+        mode: 'max' (diferença máxima por canal) ou 'sum' (soma das diferenças)
+        soft_edges: No modo 'sum', aplica transparência gradual nas bordas
+        mask_region: Região a tornar transparente (logo/marca d'água): retângulo
+                     (x1, y1, x2, y2), lista de formas ou plano booleano
+                     (ver rasterize_mask)
+
+    Returns:
+        Nova imagem PIL em modo RGBA
+    """
+    if img.mode == "P":
+        data = key_palette(img, bg_color, threshold, mode, soft_edges)[np.asarray(img)]
+        apply_mask_region(data[:, :, 3], mask_region)
+        return Image.fromarray(data)
+
+    data = np.array(img.convert("RGBA"))
+    rgb = data[:, :, :3]
+
+    if mode == 'max':
+        alpha = data[:, :, 3]
+        alpha[background_mask_max(rgb, bg_color, threshold)] = 0
+    elif mode == 'sum':
+        data[:, :, 3] = background_alpha_sum(rgb, data[:, :, 3], bg_color, threshold, soft_edges)
+        alpha = data[:, :, 3]
+    else:
+        raise ValueError(f"Modo de chroma key desconhecido: {mode}")
+
+    apply_mask_region(alpha, mask_region)
+
+    return Image.fromarray(data)
+
+
+# Passadas padrão de remoção de bordas brancas: (threshold_branco, raio)
+WHITE_HALO_PASSES = ((200, 2), (180, 1), (160, 1), (140, 2))
+
+
+def dilate_mask(mask, radius):
+    """
+    Dilatação binária com janela quadrada (2r+1)x(2r+1).
+
+    Feita em duas passadas separáveis (linhas, depois colunas). Pixels fora da
+    imagem contam como False, igual à verificação de limites do loop original.
+    """
+    if radius <= 0:
+        return mask.copy()
+
+    height, width = mask.shape
+    size = 2 * radius + 1
+    padded = np.pad(mask, radius)
+
+    rows = np.zeros((height + 2 * radius, width), dtype=bool)
+    for dx in range(size):
+        rows |= padded[:, dx:dx + width]
+
+    dilated = np.zeros((height, width), dtype=bool)
+    for dy in range(size):
+        dilated |= rows[dy:dy + height, :]
+
+    return dilated
+
+
+def remove_white_halo(img, passes=WHITE_HALO_PASSES):
+    """
+    Remove pixels brancos/claros próximos de áreas transparentes.
+
+    Para cada passada (threshold_branco, raio), um pixel visível (alpha >= 10)
+    com R, G e B >= threshold_branco fica transparente se algum pixel na janela
+    (2r+1)x(2r+1) ao redor tiver alpha < 128. Cada passada lê o resultado da
+    anterior, como as chamadas encadeadas de remover_bordas_brancas.
+
+    As máscaras de transparência, visibilidade e brilho são calculadas uma vez
+    e atualizadas entre as passadas, sem recopiar a imagem.
+
+    Args:
+        img: Imagem PIL (convertida para RGBA)
+        passes: Sequência de tuplas (threshold_branco, raio)
+
+    Returns:
+        Tupla (nova imagem PIL RGBA, lista com pixels removidos por passada)
+    """
+    data = np.array(img.convert("RGBA"))
+    alpha = data[:, :, 3]
+
+    min_rgb = data[:, :, :3].min(axis=2)
+    transparent = alpha < 128
+    visible = alpha >= 10
+
+    removed_counts = []
+    for threshold_white, radius in passes:
+        candidates = visible & (min_rgb >= threshold_white)
+        if candidates.any():
+            removed = candidates & dilate_mask(transparent, radius)
+        else:
+            removed = candidates
+
+        alpha[removed] = 0
+        transparent |= removed
+        visible &= ~removed
+        removed_counts.append(int(removed.sum()))
+
+    return Image.fromarray(data), removed_counts
@@ -0,0 +1,215 @@
+"""
+Cache em disco dos frames decodificados de vídeos.
+
+Ajustar a tolerância ou a máscara do mp4-to-atlas.py não muda os frames
+extraídos, só o que é feito com eles. Na primeira extração os frames (RGBA
+crus, um atrás do outro) são gravados num arquivo por (conteúdo do vídeo,
+seleção de frames); nas seguintes o arquivo é mapeado na memória (mmap) e
+cada frame é uma imagem PIL sobre o mapeamento, sem ffprobe, sem ffmpeg e
+sem copiar os pixels do arquivo.
+
+O cache fica em .frame-cache/ (na pasta onde o comando é executado), com um
+índice (index.json, no formato do manifesto do build_cache.py). Quando o
+total passa de FRAME_CACHE_SIZE, as entradas usadas há mais tempo são
+apagadas (LRU).
+
+Requisitos: pip install Pillow numpy
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from build_cache import file_hash, load_manifest, rel_path, save_manifest
+
+FRAME_CACHE_DIR = '.frame-cache'
+FRAME_CACHE_SIZE = 2 * 1024 * 1024 * 1024
+INDEX_NAME = 'index.json'
+
+# Entra na chave: mudar quando a seleção de frames (select_frame_indices,
+# build_frame_filter) mudar, para não reaproveitar frames de outra seleção
+FRAME_CACHE_VERSION = 1
+
+_index_lock = threading.Lock()
+
+
+def _update_index(cache_dir, change):
+    """
+    Relê o índice, aplica change(index) e grava (outro processo pode ter
+    gravado entradas desde a última leitura).
+    """
+    index_path = os.path.join(cache_dir, INDEX_NAME)
+    with _index_lock:
+        index = load_manifest(index_path)
+        result = change(index)
+        save_manifest(index_path, index)
+    return result
+
+
+def video_key(video_path, sample, cache_dir=FRAME_CACHE_DIR):
+    """
+    Chave dos frames de um vídeo: hash do conteúdo + seleção de frames
+    (ex: {"max_frames": 20}). O hash do vídeo fica no índice e só é
+    recalculado quando tamanho ou data do arquivo mudam.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    base_dir = os.path.abspath(cache_dir)
+    rel = rel_path(video_path, base_dir)
+
+    # O hash (que pode ler o vídeo inteiro) é calculado fora da trava, sobre
+    # uma cópia do índice; só o hash novo é gravado no índice com a trava
+    snapshot = load_manifest(os.path.join(cache_dir, INDEX_NAME))
+    known = snapshot["files"].get(rel)
+    digest = file_hash(video_path, snapshot, base_dir)
+    entry = snapshot["files"][rel]
+    if entry is not known:
+        def change(index):
+            index["files"][rel] = entry
+
+        _update_index(cache_dir, change)
+
+    data = json.dumps({"video": digest, "sample": sample, "version": FRAME_CACHE_VERSION}, sort_keys=True)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def _data_path(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}.rgba")
+
+
+def read_frames(key, cache_dir=FRAME_CACHE_DIR):
+    """
+    Frames guardados, como imagens RGBA somente leitura sobre o arquivo
+    mapeado na memória.
+
+    Returns:
+        Lista de imagens PIL, ou None se a chave não está no cache
+    """
+    path = _data_path(cache_dir, key)
+
+    def change(index):
+        entry = index["entries"].get(key)
+        if entry is None:
+            return None
+        try:
+            intact = os.path.getsize(path) == entry["bytes"]
+        except OSError:
+            intact = False
+        if not intact:
+            del index["entries"][key]
+            return None
+        entry["last_used"] = time.time()
+        return dict(entry)
+
+    entry = _update_index(cache_dir, change)
+    if entry is None:
+        return None
+
+    width, height = entry["width"], entry["height"]
+    data = np.memmap(path, dtype=np.uint8, mode='r', shape=(entry["frames"], height, width, 4))
+    # frombuffer com 'raw' usa a memória do mmap direto (a imagem fica somente leitura)
+    return [Image.frombuffer('RGBA', (width, height), data[i], 'raw', 'RGBA', 0, 1)
+            for i in range(entry["frames"])]
+
+
+def write_frames(frames, key, source, cache_dir=FRAME_CACHE_DIR, max_bytes=FRAME_CACHE_SIZE):
+    """
+    Repassa os frames (um de cada vez) e grava uma cópia no cache. A entrada
+    só é registrada se a iteração chegar ao fim sem erro; depois, as entradas
+    menos usadas são apagadas até o total caber em max_bytes.
+
+    Returns:
+        Gerador com os mesmos frames
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _data_path(cache_dir, key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    size = None
+    count = 0
+    complete = False
+    f = open(tmp_path, 'wb')
+    try:
+        for frame in frames:
+            if f is not None:
+                if size is None:
+                    size = frame.size
+                if frame.mode != 'RGBA' or frame.size != size or (count + 1) * size[0] * size[1] * 4 > max_bytes:
+                    # Não cabe no cache (ou não é o formato esperado): só repassa
+                    f.close()
+                    os.remove(tmp_path)
+                    f = None
+                else:
+                    f.write(frame.tobytes())
+                    count += 1
+            yield frame
+        complete = True
+    finally:
+        if f is not None:
+            f.close()
+            if complete and count:
+                os.replace(tmp_path, path)
+                _register(cache_dir, key, source, size, count, max_bytes)
+            else:
+                os.remove(tmp_path)
+
+
+def _register(cache_dir, key, source, size, count, max_bytes):
+    base_dir = os.path.abspath(cache_dir)
+
+    def change(index):
+        index["entries"][key] = {
+            "source": rel_path(source, base_dir),
+            "width": size[0],
+            "height": size[1],
+            "frames": count,
+            "bytes": size[0] * size[1] * 4 * count,
+            "last_used": time.time()
+        }
+        return _evict(index, cache_dir, max_bytes, keep=key)
+
+    freed = _update_index(cache_dir, change)
+    if freed:
+        print(f"Cache de frames: {freed} entrada(s) antiga(s) removida(s)")
+
+
+def _evict(index, cache_dir, max_bytes, keep=None):
+    """
+    Remove as entradas usadas há mais tempo até o total caber em max_bytes.
+
+    Returns:
+        Número de entradas removidas
+    """
+    entries = index["entries"]
+    total = sum(e["bytes"] for e in entries.values())
+    freed = 0
+    for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        try:
+            os.remove(_data_path(cache_dir, key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue  # Ainda mapeado por outro processo (Windows): fica para a próxima
+        total -= entries.pop(key)["bytes"]
+        freed += 1
+    return freed
+
+
+def evict(cache_dir=FRAME_CACHE_DIR, max_bytes=FRAME_CACHE_SIZE):
+    """
+    Reduz o cache a max_bytes (0 = esvazia), apagando as entradas usadas há
+    mais tempo.
+
+    Returns:
+        Número de entradas removidas
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    return _update_index(cache_dir, lambda index: _evict(index, cache_dir, max_bytes))
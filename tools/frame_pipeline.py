@@ -0,0 +1,853 @@
+"""
+Pipeline de frames em memória, montado com estágios preguiçosos (geradores).
+
+Cada estágio recebe um iterável de frames e devolve outro, então os frames
+passam um de cada vez: são decodificados uma única vez na fonte e o PNG é
+codificado uma única vez no final. Um frame é uma imagem PIL ou um "record"
+(ver atlas_packer.frame_record): o recorte visível + a posição dele no frame
+original. Depois do estágio trim só o recorte fica em memória, que é tudo
+que o empacotador do atlas precisa.
+
+Fontes:   video_frames, gif_frames, dir_frames
+Estágios: key, mask, trim, mirror, pingpong
+Saídas:   write_atlas, save_frames
+
+Exemplo (o mesmo que mp4-to-atlas.py ghost.mp4 ghost 30 20 --mask ... --mirror):
+    frames = video_frames("ghost.mp4", 20)
+    frames = key(frames, 30, mask_region=(700, 400, 864, 480))
+    frames = mirror(trim(frames))
+    write_atlas(frames, "ghost", "images/objects")
+
+Uso: python frame_pipeline.py <entrada> <saida> [estágios...] [--jobs N]
+
+  entrada : vídeo (.mp4, .webm, ...), GIF ou diretório de PNGs
+  saida   : caminho/nome do atlas (gera nome_atlas.png/json), ou um
+            diretório terminado em / para salvar os frames como PNGs
+  estágios, aplicados na ordem dada:
+    key=T             remove o fundo (tolerância T)
+    mask=x1,y1,x2,y2  torna transparente uma região (logo/marca d'água); várias
+                      formas separadas por ';': retângulos, polígonos
+                      (x1,y1,x2,y2,x3,y3,...) e imagens de máscara (PNG)
+    trim              recorta cada frame pela bounding box do alpha
+    mirror            adiciona as cópias espelhadas no final
+    pingpong          adiciona os frames do meio em ordem reversa
+  opções:
+    frames=N          máximo de frames extraídos do vídeo (padrão: 20)
+    dedupe=N          tolerância de frames repetidos no atlas (padrão: 0)
+    formats=webp,avif codificações extras do atlas (ver image_formats.py)
+    quality=N         qualidade das codificações com perdas (padrão: 80)
+    alpha_quality=N   qualidade do alpha no WebP com perdas (padrão: 90)
+    palette[=N]       PNG indexado se o erro médio por canal for <= N (padrão: 2)
+    max_size=N        lado máximo de cada textura; divide o atlas em páginas
+    tiers=0.5,0.25    camadas reduzidas do atlas (nome_atlas@0.5x.png/json, ...)
+    nocache           não usa o cache de frames decodificados (ver frame_cache.py)
+
+Exemplos:
+  python frame_pipeline.py ghost.mp4 images/objects/ghost key=30 mask=700,400,864,480 mirror
+  python frame_pipeline.py spider_no_bg.gif frames_spider/ trim mirror
+
+Requisitos: pip install Pillow numpy (e ffmpeg no PATH para vídeos)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageOps, ImageSequence
+
+from atlas_packer import (DEFAULT_PADDING, align_record, frame_entry, pack_records_pages, pages_json, reduce_atlas,
+                          parse_tiers, remove_stale_pages, render_atlas, tier_step, tier_suffix, trim_frame)
+from chroma_key import (apply_mask_region, describe_mask, detect_bg_color, key_background, mask_shapes, parse_mask,
+                        rasterize_mask)
+from frame_cache import FRAME_CACHE_DIR, read_frames, video_key, write_frames
+from frame_pool import map_frames, parse_jobs_arg, resolve_jobs
+from image_formats import (DEFAULT_ALPHA_QUALITY, DEFAULT_PALETTE_ERROR, DEFAULT_QUALITY, parse_formats,
+                           print_size_comparison, save_png, save_variants, variant_outputs)
+
+
+# ---------------------------------------------------------------------------
+# Vídeo (ffprobe/ffmpeg)
+# ---------------------------------------------------------------------------
+
+def _parse_rate(rate_str):
+    """
+    Converte uma taxa do ffprobe ("30/1", "30000/1001" ou "29.97") em float.
+    """
+    if '/' in rate_str:
+        num, den = rate_str.split('/')
+        return float(num) / float(den)
+    return float(rate_str)
+
+
+def probe_video(video_path):
+    """
+    Obtém informações do vídeo usando ffprobe.
+
+    O total de frames vem da contagem de pacotes (sem decodificar); se não
+    estiver disponível, é estimado pela duração * FPS.
+
+    Returns:
+        Dicionário com width, height, fps, duration e total_frames (os dois
+        últimos podem ser None), ou None se não foi possível obter as informações.
+    """
+    probe_cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-count_packets', '-show_entries',
+        'stream=nb_read_packets,width,height,r_frame_rate,duration:format=duration',
+        '-of', 'json',
+        video_path
+    ]
+
+    try:
+        result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout)
+        stream = data['streams'][0]
+        width = int(stream['width'])
+        height = int(stream['height'])
+        # Frame rate pode ser "30/1" ou "29.97"
+        fps = _parse_rate(stream['r_frame_rate'])
+
+        # Duração do stream ou, se ausente (ex: mkv), do container
+        duration = None
+        for source in (stream, data.get('format', {})):
+            try:
+                duration = float(source['duration'])
+                break
+            except (KeyError, ValueError):
+                continue
+
+        total_frames = None
+        if str(stream.get('nb_read_packets', '')).isdigit():
+            total_frames = int(stream['nb_read_packets'])
+        elif duration and fps:
+            total_frames = int(round(duration * fps))
+
+        print(f"Vídeo: {width}x{height}, {fps:.2f} FPS")
+        if duration:
+            print(f"Duração: {duration:.2f}s")
+        if total_frames:
+            print(f"Total de frames: {total_frames}")
+    except Exception as e:
+        print(f"Aviso: Não foi possível obter informações do vídeo: {e}")
+        return None
+
+    return {"width": width, "height": height, "fps": fps, "duration": duration, "total_frames": total_frames}
+
+
+def select_frame_indices(count, max_frames):
+    """
+    Índices de frames distribuídos uniformemente para manter no máximo max_frames.
+    """
+    if count <= max_frames:
+        return list(range(count))
+
+    step = count / max_frames
+    return [int(i * step) for i in range(max_frames)]
+
+
+def build_frame_filter(info, max_frames):
+    """
+    Filtro de vídeo do ffmpeg para escolher os frames do atlas.
+
+    Com o total de frames conhecido, usa o filtro select com os índices exatos
+    (distribuídos por todo o vídeo), então o ffmpeg só converte e escreve os
+    frames que serão mantidos. Sem essa informação, cai no filtro fps antigo
+    e a seleção é feita depois da extração.
+
+    Returns:
+        Tupla (filtro, número de frames que serão emitidos ou None)
+    """
+    total_frames = info.get('total_frames') if info else None
+
+    if total_frames:
+        indices = select_frame_indices(total_frames, max_frames)
+        terms = '+'.join(f'eq(n,{idx})' for idx in indices)
+        return f"select='{terms}'", len(indices)
+
+    fps = info['fps'] if info else 30
+    if max_frames and fps:
+        # Sem duração conhecida: assumir vídeo de ~2 segundos
+        output_fps = max_frames / 2
+        return f'fps={min(output_fps, fps)}', None
+    return 'fps=10', None
+
+
+def build_extract_args(info, max_frames):
+    """
+    Argumentos de saída do ffmpeg (filtro + limite de frames) para a extração.
+    """
+    vf, num_frames = build_frame_filter(info, max_frames)
+    args = ['-vf', vf, '-vsync', 'vfr']
+    if num_frames:
+        # Encerrar logo após o último frame selecionado
+        args += ['-frames:v', str(num_frames)]
+    return args
+
+
+# ---------------------------------------------------------------------------
+# Fontes
+# ---------------------------------------------------------------------------
+
+def video_frames(video_path, max_frames=20, frame_cache=None):
+    """
+    Frames do vídeo direto do ffmpeg (pipe rawvideo RGBA), um de cada vez.
+
+    O ffprobe e o ffmpeg são iniciados já na chamada, então erros de início
+    aparecem como retorno None (o chamador pode cair no modo em disco). Erros
+    do ffmpeg durante a leitura levantam RuntimeError no fim da iteração.
+
+    Com frame_cache (pasta, ex: frame_cache.FRAME_CACHE_DIR), os frames
+    decodificados ficam guardados e as próximas chamadas com o mesmo vídeo e
+    max_frames leem do cache, sem ffmpeg (ver frame_cache.py).
+
+    Returns:
+        Gerador de imagens PIL RGBA, ou None em caso de erro.
+    """
+    key = None
+    if frame_cache is not None:
+        try:
+            key = video_key(video_path, {"max_frames": max_frames}, frame_cache)
+        except OSError as e:
+            print(f"Aviso: Cache de frames indisponível: {e}")
+        else:
+            cached = read_frames(key, frame_cache)
+            if cached is not None:
+                print(f"\nFrames do cache ({len(cached)} frames, sem decodificar o vídeo)")
+                return iter(cached)
+
+    info = probe_video(video_path)
+    if not info:
+        return None
+
+    stream_cmd = [
+        'ffmpeg', '-v', 'error', '-i', video_path,
+        *build_extract_args(info, max_frames),
+        '-f', 'rawvideo', '-pix_fmt', 'rgba',
+        '-'
+    ]
+
+    print(f"\nExtraindo frames (pipe rawvideo)...")
+    try:
+        proc = subprocess.Popen(stream_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        print(f"Erro ao iniciar ffmpeg: {e}")
+        return None
+
+    # Sem o total de frames o ffmpeg usa o filtro fps e pode emitir mais que
+    # max_frames; nesse caso a seleção só é possível no fim
+    selected = build_frame_filter(info, max_frames)[1] is not None
+    frames = _read_video_frames(proc, (info["width"], info["height"]), max_frames, selected)
+    if key is not None:
+        frames = write_frames(frames, key, video_path, frame_cache)
+    return frames
+
+
+def _read_video_frames(proc, size, max_frames, selected):
+    frame_size = size[0] * size[1] * 4
+    buffers = []
+    count = 0
+    with proc:
+        while True:
+            buf = proc.stdout.read(frame_size)
+            if len(buf) < frame_size:
+                break
+            count += 1
+            if selected:
+                yield Image.frombytes('RGBA', size, buf)
+            else:
+                buffers.append(buf)
+        stderr = proc.stderr.read()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Erro ao extrair frames: {stderr.decode(errors='replace') or proc.returncode}")
+
+    print(f"Extraídos {count} frames")
+
+    if not selected:
+        # Limitar a max_frames (quando o total de frames era desconhecido)
+        if len(buffers) > max_frames:
+            buffers = [buffers[idx] for idx in select_frame_indices(len(buffers), max_frames)]
+            print(f"Reduzido para {max_frames} frames")
+        for buf in buffers:
+            yield Image.frombytes('RGBA', size, buf)
+
+
+_gif_strategy_lock = threading.Lock()
+
+
+def gif_frames(gif_path, keep_palette=False):
+    """
+    Frames de um GIF animado como imagens PIL RGBA, um de cada vez.
+
+    Com keep_palette, os frames que usam a mesma paleta do primeiro saem em
+    modo P (índices + paleta, já compostos com os anteriores), para o chroma
+    key trabalhar na paleta (ver chroma_key.key_palette); a partir do primeiro
+    frame com outra paleta, saem em RGBA.
+    """
+    with Image.open(gif_path) as gif:
+        if not keep_palette:
+            for frame in ImageSequence.Iterator(gif):
+                yield frame.convert("RGBA")
+            return
+
+        for index in range(getattr(gif, 'n_frames', 1)):
+            # A estratégia de decodificação é global no GifImagePlugin: vale só
+            # enquanto este frame é decodificado. O lock impede que duas threads
+            # (build_assets --jobs, watch, serviço) troquem e restaurem ao mesmo
+            # tempo e deixem a estratégia trocada para o resto do processo
+            with _gif_strategy_lock:
+                strategy = GifImagePlugin.LOADING_STRATEGY
+                GifImagePlugin.LOADING_STRATEGY = GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+                try:
+                    gif.seek(index)
+                    gif.load()
+                finally:
+                    GifImagePlugin.LOADING_STRATEGY = strategy
+            yield gif.copy() if gif.mode == 'P' else gif.convert("RGBA")
+
+
+def dir_frames(frames_dir):
+    """
+    Frames PNG de um diretório (ordenados pelo nome), abertos um de cada vez.
+    """
+    for name in sorted(f for f in os.listdir(frames_dir) if f.endswith('.png')):
+        with Image.open(os.path.join(frames_dir, name)) as img:
+            yield img.convert("RGBA")
+
+
+def open_frames(path, max_frames=20, keep_palette=False, frame_cache=None):
+    """
+    Fonte adequada para o caminho: diretório de PNGs, GIF ou vídeo.
+    keep_palette vale só para GIFs (ver gif_frames); frame_cache só para
+    vídeos (ver video_frames).
+    """
+    if os.path.isdir(path):
+        return dir_frames(path)
+    if path.lower().endswith('.gif'):
+        return gif_frames(path, keep_palette)
+    return video_frames(path, max_frames, frame_cache)
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+def as_record(frame):
+    """
+    Record de um frame; imagens PIL viram o frame inteiro, sem recorte.
+    """
+    if isinstance(frame, dict):
+        return frame
+    frame = frame.convert("RGBA")
+    return {"image": frame, "source_rect": (0, 0) + frame.size, "source_size": frame.size}
+
+
+def full_frame(frame):
+    """
+    Imagem PIL do frame no tamanho original (recorte colado em fundo transparente).
+    """
+    if not isinstance(frame, dict):
+        return frame
+    sx, sy, sw, sh = frame["source_rect"]
+    if (sx, sy, sw, sh) == (0, 0) + frame["source_size"]:
+        return frame["image"]
+    image = Image.new('RGBA', frame["source_size"], (0, 0, 0, 0))
+    image.paste(frame["image"], (sx, sy))
+    return image
+
+
+def _is_full(record):
+    return record["source_rect"] == (0, 0) + record["source_size"]
+
+
+def _batches(frames, size):
+    batch = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Estágios
+# ---------------------------------------------------------------------------
+
+def key(frames, threshold=30, mask_region=None, bg_color=None, jobs=1):
+    """
+    Remove o fundo de cada frame (chroma key, ver chroma_key.py).
+
+    A cor de fundo, se não for dada, é detectada no canto superior esquerdo
+    do primeiro frame, que por isso precisa estar inteiro (key antes de
+    trim). Com jobs > 1, blocos de frames são processados em
+    paralelo (ver frame_pool.py); só um bloco fica decodificado por vez.
+
+    Args:
+        frames: Iterável de frames
+        threshold: Tolerância de cor para remoção de fundo
+        mask_region: Região a mascarar (logo/marca d'água): retângulo (x1, y1, x2, y2),
+                     lista de formas ou plano (ver chroma_key.rasterize_mask);
+                     rasterizada uma vez por tamanho de frame
+        bg_color: Tupla (R, G, B) da cor de fundo
+        jobs: Número de processos
+
+    Raises:
+        ValueError: Sem bg_color, com o primeiro frame já recortado
+    """
+    jobs = resolve_jobs(jobs)
+    planes = {}
+    count = 0
+    for batch in _batches(map(_key_record, frames), jobs * 4 if jobs > 1 else 1):
+        if bg_color is None:
+            if not _is_full(batch[0]):
+                raise ValueError("Cor de fundo não pode ser detectada num frame recortado (use key antes de trim)")
+            bg_color = detect_bg_color(batch[0]["image"])
+            print(f"\nCor de fundo detectada (R,G,B): {bg_color}")
+            print(f"Tolerância: {threshold}")
+            if mask_shapes(mask_region):
+                print(f"Região da logo/máscara: {describe_mask(mask_region)}")
+            print(f"Removendo fundo dos frames ({jobs} processo(s))...")
+
+        # Frames com paleta (GIF) já são baratos: o teste é por cor, não por pixel
+        if (jobs > 1 and all(_is_full(r) and r["image"].mode != 'P' for r in batch)
+                and len({r["source_size"] for r in batch}) == 1):
+            images = map_frames(key_background, [r["image"] for r in batch], jobs, bg_color=bg_color,
+                                threshold=threshold, mode='max',
+                                mask_region=_mask_plane(mask_region, batch[0], planes))
+        else:
+            images = [key_background(r["image"], bg_color, threshold, mode='max',
+                                     mask_region=_mask_plane(mask_region, r, planes))
+                      for r in batch]
+
+        for record, image in zip(batch, images):
+            count += 1
+            yield dict(record, image=image)
+
+    print(f"  Processados {count}/{count} frames")
+
+
+def _key_record(frame):
+    """
+    Como as_record, mas mantém frames em modo P (o chroma key converte no final).
+    """
+    if not isinstance(frame, dict) and frame.mode == 'P':
+        return {"image": frame, "source_rect": (0, 0) + frame.size, "source_size": frame.size}
+    return as_record(frame)
+
+
+def _mask_plane(mask_region, record, planes):
+    """
+    Plano da máscara nas coordenadas do recorte do record. A máscara é
+    rasterizada uma vez por tamanho de frame original (planes guarda os planos).
+    """
+    if mask_region is None:
+        return None
+    size = record["source_size"]
+    if size not in planes:
+        planes[size] = rasterize_mask(mask_region, size)
+    plane = planes[size]
+    if plane is None:
+        return None
+    sx, sy, sw, sh = record["source_rect"]
+    return plane[sy:sy + sh, sx:sx + sw]
+
+
+def mask(frames, mask_region):
+    """
+    Torna transparente a região de cada frame: retângulo (x1, y1, x2, y2),
+    limites inclusivos, lista de formas ou plano (ver chroma_key.rasterize_mask).
+    """
+    planes = {}
+    for record in map(as_record, frames):
+        image = record["image"].copy()
+        alpha = image.getchannel("A")
+        plane = _mask_plane(mask_region, record, planes)
+        image.putalpha(Image.fromarray(apply_mask_region(np.array(alpha), plane)))
+        yield dict(record, image=image)
+
+
+def trim(frames):
+    """
+    Recorta cada frame pela bounding box do alpha (ver atlas_packer.trim_frame).
+
+    Depois deste estágio o frame inteiro pode ser liberado; só o recorte segue.
+    """
+    for record in map(as_record, frames):
+        image, (x, y, w, h) = trim_frame(record["image"])
+        if (x, y, w, h) == (0, 0) + record["image"].size:
+            yield record
+        elif record["image"].getchannel("A").getbbox() is None:
+            # Frame vazio: 1x1 em (0, 0) do frame original
+            yield dict(record, image=image, source_rect=(0, 0, 1, 1))
+        else:
+            sx, sy = record["source_rect"][:2]
+            yield dict(record, image=image, source_rect=(sx + x, sy + y, w, h))
+
+
+def mirror(frames, jobs=1):
+    """
+    Repete a sequência espelhada horizontalmente no final (ida e volta com flip).
+    Ex: personagem andando para direita, depois andando para esquerda (espelhado).
+
+    Os frames originais seguem adiante assim que chegam; só os recortes ficam
+    guardados até o fim da sequência.
+    """
+    records = []
+    for record in map(as_record, frames):
+        records.append(record)
+        yield record
+
+    if not records:
+        print("Nenhum frame para espelhar")
+        return
+
+    print(f"\nAplicando espelhamento horizontal...")
+    print(f"  Frames originais: {len(records)}")
+
+    images = map_frames(ImageOps.mirror, [r["image"] for r in records], jobs)
+    for record, image in zip(records, images):
+        src_w = record["source_size"][0]
+        x, y, w, h = record["source_rect"]
+        yield dict(record, image=image, source_rect=(src_w - x - w, y, w, h))
+
+    print(f"  Frames espelhados: {len(records)}")
+    print(f"  Total final: {len(records) * 2} frames")
+
+
+def pingpong(frames):
+    """
+    Repete os frames do meio em ordem reversa para criar efeito vai-e-volta.
+    Ex: frames 0,1,2,3 viram 0,1,2,3,2,1 (sem repetir primeiro e último)
+
+    As cópias são os mesmos objetos, então não ocupam memória extra.
+    """
+    records = []
+    for frame in frames:
+        records.append(frame)
+        yield frame
+
+    if len(records) < 2:
+        print("Poucos frames para aplicar pingpong")
+        return
+
+    print(f"\nAplicando efeito ping-pong (vai e volta)...")
+    print(f"  Frames originais: {len(records)}")
+
+    # Frames do meio em ordem reversa (excluindo primeiro e último para evitar "pause")
+    frames_to_copy = records[1:-1][::-1]
+    yield from frames_to_copy
+
+    print(f"  Frames adicionados: {len(frames_to_copy)}")
+    print(f"  Total final: {len(records) + len(frames_to_copy)} frames")
+
+
+# ---------------------------------------------------------------------------
+# Saídas
+# ---------------------------------------------------------------------------
+
+def write_atlas(frames, output_name, output_dir='images/objects', padding=DEFAULT_PADDING, dedupe_tolerance=0,
+                formats=(), quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY,
+                palette=False, palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=()):
+    """
+    Cria um atlas PNG + JSON a partir dos frames.
+
+    Cada frame é recortado pela bounding box do alpha assim que chega e os
+    retângulos são empacotados com MaxRects (ver atlas_packer.py). O JSON
+    registra spriteSourceSize/sourceSize para o Phaser posicionar o sprite
+    como antes. Frames repetidos (diferença média por canal <= dedupe_tolerance)
+    são guardados uma vez só e as chaves do JSON apontam para o mesmo retângulo.
+
+    formats pede codificações extras além do PNG (ex: ["webp", "avif"], ver
+    image_formats.py), listadas em meta.variants da menor para a maior.
+    palette=True grava o PNG indexado, com uma paleta para todos os frames,
+    se o erro médio por canal ficar em até palette_error (senão, RGBA).
+
+    Com max_size, nenhuma textura passa de max_size x max_size: se o atlas não
+    couber, os frames são divididos em páginas (nome_atlas-0.png,
+    nome_atlas-1.png, ...) na ordem, e o JSON usa o formato multiatlas do
+    Phaser (this.load.multiatlas), com as variantes de cada página na textura.
+
+    tiers pede camadas reduzidas (escalas 1/n, ex: [0.5] ou [0.5, 0.25], ver
+    atlas_packer.parse_tiers): cada página é reduzida uma vez por camada e
+    gravada como nome_atlas@0.5x.png + nome_atlas@0.5x.json, com os
+    retângulos e meta.scale da camada. Os recortes são alinhados à grade dos
+    fatores para que a redução não misture frames vizinhos.
+
+    Páginas, camadas e variantes de uma geração anterior com o mesmo nome são
+    apagadas antes de gravar (ver atlas_packer.remove_stale_pages).
+
+    Returns:
+        Dicionário com png_path (primeira página), json_path, pages, outputs
+        (todos os arquivos gravados), frames, unique_frames e size, ou None se
+        não houver frames ou algum frame não couber em max_size
+    """
+    try:
+        factors = [1] + parse_tiers(tiers)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return None
+
+    records = list(trim(frames))
+    if not records:
+        print("Nenhum frame encontrado!")
+        return None
+
+    # Dimensões do primeiro frame
+    frame_width, frame_height = records[0]["source_size"]
+
+    print(f"\nCriando atlas de {len(records)} frames ({frame_width}x{frame_height} cada)...")
+
+    # Camadas: recortes e padding alinhados à grade de todos os fatores
+    step = tier_step(factors)
+    if step > 1:
+        records = [align_record(r, step) for r in records]
+        padding = -(-padding // step) * step
+
+    # Empacotar
+    try:
+        placements, pages = pack_records_pages(records, padding, tolerance=dedupe_tolerance, max_size=max_size)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return None
+
+    unique = [p for p in placements if p["alias_of"] is None]
+    if len(unique) < len(placements):
+        print(f"Frames repetidos: {len(placements) - len(unique)} (guardados {len(unique)} únicos)")
+
+    trimmed_area = sum(p["image"].size[0] * p["image"].size[1] for p in unique)
+    full_area = sum(r["source_size"][0] * r["source_size"][1] for r in records)
+    print(f"Recorte: {trimmed_area / full_area * 100:.1f}% da área original")
+    if len(pages) == 1:
+        print(f"Atlas empacotado: {pages[0][0]}x{pages[0][1]}")
+    else:
+        print(f"Atlas empacotado em {len(pages)} páginas de até {max_size}x{max_size}: "
+              f"{', '.join(f'{w}x{h}' for w, h in pages)}")
+
+    # Criar diretório de saída se não existir (e tirar as páginas e camadas da geração anterior)
+    os.makedirs(output_dir, exist_ok=True)
+    remove_stale_pages(os.path.join(output_dir, f"{output_name}_atlas.png"))
+
+    names = [f"{output_name}_{i}" for i in range(len(placements))]
+    outputs = []
+    textures = {factor: [] for factor in factors}
+    for page, (page_w, page_h) in enumerate(pages):
+        # Criar imagem da página e, a partir dela, as camadas reduzidas
+        atlas = render_atlas([p for p in placements if p["page"] == page], page_w, page_h)
+
+        for factor in factors:
+            image = atlas if factor == 1 else reduce_atlas(atlas, factor)
+
+            # Salvar PNG
+            suffix = tier_suffix(factor) + ("" if len(pages) == 1 else f"-{page}")
+            png_path = os.path.join(output_dir, f"{output_name}_atlas{suffix}.png")
+            save_png(image, png_path, palette, palette_error)
+            png_size = os.path.getsize(png_path) / 1024
+            print(f"\nAtlas PNG salvo: {png_path} ({png_size:.2f} KB)")
+            outputs.append(png_path)
+
+            texture = {
+                "image": os.path.basename(png_path),
+                "size": image.size,
+                "frames": [(name, p) for name, p in zip(names, placements) if p["page"] == page]
+            }
+
+            # Codificações extras (WebP/AVIF)
+            if formats:
+                texture["variants"] = save_variants(image, png_path, formats, quality, alpha_quality)
+                outputs.extend(variant_outputs(png_path, formats))
+                print_size_comparison(texture["variants"])
+            textures[factor].append(texture)
+
+    # JSON metadata (um por camada)
+    json_paths = []
+    for factor in factors:
+        json_path = os.path.join(output_dir, f"{output_name}_atlas{tier_suffix(factor)}.json")
+        with open(json_path, 'w') as f:
+            json.dump(_atlas_json(textures[factor], factor, formats), f, indent=2)
+        json_size = os.path.getsize(json_path) / 1024
+        print(f"Atlas JSON salvo: {json_path} ({json_size:.2f} KB)")
+        json_paths.append(json_path)
+    outputs.extend(json_paths)
+
+    if len(pages) > 1:
+        print(f"Phaser: this.load.multiatlas('{output_name}', '{json_paths[0]}', '{output_dir}/')")
+
+    return {
+        "png_path": outputs[0],
+        "json_path": json_paths[0],
+        "pages": len(pages),
+        "outputs": outputs,
+        "frames": len(records),
+        "unique_frames": len(unique),
+        "size": " + ".join(f"{w}x{h}" for w, h in pages)
+    }
+
+
+def _atlas_json(textures, factor, formats):
+    """
+    JSON de uma camada: formato hash com uma página, multiatlas com várias.
+    """
+    scale = f"{1 / factor:g}"
+    if len(textures) > 1:
+        atlas_data = pages_json(textures, {"scale": scale}, factor)
+        if formats:
+            for texture, entry in zip(textures, atlas_data["textures"]):
+                entry["variants"] = texture["variants"]
+        return atlas_data
+
+    texture = textures[0]
+    atlas_data = {
+        "frames": {name: frame_entry(placement, factor) for name, placement in texture["frames"]},
+        "meta": {
+            "image": texture["image"],
+            "size": {"w": texture["size"][0], "h": texture["size"][1]},
+            "scale": scale
+        }
+    }
+    if formats:
+        atlas_data["meta"]["variants"] = texture["variants"]
+    return atlas_data
+
+
+def save_frames(frames, frames_dir):
+    """
+    Salva os frames (no tamanho original) como frame_0000.png, frame_0001.png, ...
+
+    Returns:
+        Número de frames salvos
+    """
+    os.makedirs(frames_dir, exist_ok=True)
+    count = 0
+    for i, frame in enumerate(frames):
+        full_frame(frame).save(os.path.join(frames_dir, f'frame_{i:04d}.png'))
+        count += 1
+    return count
+
+
+def extract_frames(input_path, frames_dir, max_frames=20):
+    """
+    Extrai os frames de um vídeo, GIF ou pasta de PNGs para frames_dir
+    (frame_0000.png, ...), sem nenhum estágio.
+
+    Returns:
+        Número de frames salvos
+    """
+    return save_frames(open_frames(input_path, max_frames), frames_dir)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def run_pipeline(input_path, output, steps, max_frames=20, dedupe_tolerance=0, jobs=1,
+                 formats=(), quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY,
+                 palette=False, palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=(),
+                 frame_cache=FRAME_CACHE_DIR):
+    """
+    Monta e executa um pipeline: fonte -> estágios na ordem dada -> saída.
+
+    Args:
+        input_path: Vídeo, GIF ou diretório de PNGs
+        output: Caminho/nome do atlas, ou diretório terminado em / para PNGs
+        steps: Lista de tuplas (estágio, parâmetro), ex: [("key", 30), ("mirror", None)]
+        frame_cache: Pasta do cache de frames decodificados de vídeo (None = sem cache)
+    """
+    # GIF com chroma key logo no início: os frames ficam com paleta até o key
+    frames = open_frames(input_path, max_frames, keep_palette=bool(steps) and steps[0][0] == 'key',
+                         frame_cache=frame_cache)
+    if frames is None:
+        return None
+
+    for step, param in steps:
+        if step == 'key':
+            frames = key(frames, param, jobs=jobs)
+        elif step == 'mask':
+            frames = mask(frames, param)
+        elif step == 'trim':
+            frames = trim(frames)
+        elif step == 'mirror':
+            frames = mirror(frames, jobs)
+        elif step == 'pingpong':
+            frames = pingpong(frames)
+        else:
+            raise ValueError(f"Estágio desconhecido: {step}")
+
+    try:
+        if output.endswith(('/', os.sep)):
+            count = save_frames(frames, output)
+            print(f"\n{count} frames salvos em {output}")
+            return count
+        output_dir, output_name = os.path.split(output)
+        return write_atlas(frames, output_name, output_dir or '.', dedupe_tolerance=dedupe_tolerance,
+                           formats=formats, quality=quality, alpha_quality=alpha_quality,
+                           palette=palette, palette_error=palette_error, max_size=max_size, tiers=tiers)
+    except RuntimeError as e:
+        print(e)
+        return None
+
+
+def parse_steps(args):
+    """
+    Lê os estágios e opções da linha de comando (ver docstring do módulo).
+
+    Returns:
+        Tupla (estágios, opções para run_pipeline)
+    """
+    steps = []
+    options = {}
+    for arg in args:
+        name, _, value = arg.partition('=')
+        if name == 'key':
+            if ('trim', None) in steps:
+                raise ValueError("key depois de trim: a cor de fundo é detectada no canto do frame "
+                                 "inteiro (use key antes de trim)")
+            steps.append(('key', int(value) if value else 30))
+        elif name == 'mask':
+            steps.append(('mask', parse_mask(value)))
+        elif name in ('trim', 'mirror', 'pingpong'):
+            steps.append((name, None))
+        elif name == 'frames':
+            options['max_frames'] = int(value)
+        elif name == 'dedupe':
+            options['dedupe_tolerance'] = float(value)
+        elif name == 'formats':
+            options['formats'] = parse_formats(value)
+        elif name == 'quality':
+            options['quality'] = int(value)
+        elif name == 'alpha_quality':
+            options['alpha_quality'] = int(value)
+        elif name == 'max_size':
+            options['max_size'] = int(value)
+        elif name == 'tiers':
+            options['tiers'] = [1 / factor for factor in parse_tiers(value)]
+        elif name == 'palette':
+            options['palette'] = True
+            if value:
+                options['palette_error'] = float(value)
+        elif name == 'nocache':
+            options['frame_cache'] = None
+        else:
+            raise ValueError(f"Estágio desconhecido: {arg}")
+    return steps, options
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    try:
+        steps, options = parse_steps(args[2:])
+    except (ValueError, IndexError) as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
+    if not run_pipeline(args[0], args[1], steps, jobs=jobs, **options):
+        sys.exit(1)
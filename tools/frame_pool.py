@@ -0,0 +1,170 @@
+"""
+Processamento paralelo de frames em vários núcleos (opção --jobs N das ferramentas).
+
+Frames em memória são copiados uma única vez para um bloco de memória
+compartilhada (N x altura x largura x 4) e os processos só recebem índices;
+o resultado volta por outro bloco compartilhado. Assim não há pickle dos
+pixels de cada frame. A ordem da saída é sempre a mesma da entrada.
+
+As funções passadas para map_frames/map_items precisam ser importáveis
+(definidas no nível de módulo), por exemplo chroma_key.key_background.
+
+Requisitos: pip install Pillow numpy
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+
+# Estado de cada processo do pool (preenchido por _init_worker)
+_worker = {}
+
+
+def resolve_jobs(jobs):
+    """
+    Número de processos a usar: 0 ou None = todos os núcleos.
+    """
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, int(jobs))
+
+
+def parse_jobs_arg(args):
+    """
+    Lê e remove a opção --jobs N (ou -j N) de uma lista de argumentos.
+
+    Returns:
+        Tupla (jobs, argumentos restantes). Sem a opção, jobs = 1.
+    """
+    jobs = 1
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] in ('--jobs', '-j') and i + 1 < len(args):
+            try:
+                jobs = resolve_jobs(int(args[i + 1]))
+            except ValueError:
+                print(f"Aviso: Número de jobs '{args[i + 1]}' inválido. Usando 1.")
+            i += 2
+        else:
+            rest.append(args[i])
+            i += 1
+    return jobs, rest
+
+
+def _chunks(count, jobs):
+    """
+    Divide range(count) em blocos contíguos (alguns por processo).
+    """
+    num_chunks = min(count, jobs * 4)
+    bounds = [round(k * count / num_chunks) for k in range(num_chunks + 1)]
+    return [range(bounds[k], bounds[k + 1]) for k in range(num_chunks)]
+
+
+def _init_worker(in_name, out_name, shape, func, kwargs):
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    _worker.update(in_shm=in_shm, out_shm=out_shm, shape=shape, func=func, kwargs=kwargs)
+
+
+def _run_chunk(indices):
+    shape = _worker["shape"]
+    src = np.ndarray(shape, dtype=np.uint8, buffer=_worker["in_shm"].buf)
+    dst = np.ndarray(shape, dtype=np.uint8, buffer=_worker["out_shm"].buf)
+    try:
+        for i in indices:
+            result = _worker["func"](Image.fromarray(src[i]), **_worker["kwargs"])
+            result = np.asarray(result.convert("RGBA"))
+            if result.shape != shape[1:]:
+                raise ValueError(f"Frame {i}: a função mudou o tamanho do frame ({result.shape})")
+            dst[i] = result
+    finally:
+        del src, dst
+    return len(indices)
+
+
+def map_frames(func, frames, jobs=1, **kwargs):
+    """
+    Aplica func(frame, **kwargs) a cada frame, em paralelo se jobs > 1.
+
+    func deve devolver uma imagem do mesmo tamanho do frame (convertida para
+    RGBA). Frames de tamanhos diferentes são processados em série.
+
+    Returns:
+        Lista de imagens PIL RGBA, na mesma ordem da entrada
+    """
+    frames = list(frames)
+    jobs = min(resolve_jobs(jobs), len(frames))
+    sizes = {f.size for f in frames}
+    if jobs <= 1 or len(sizes) != 1:
+        return [func(frame, **kwargs).convert("RGBA") for frame in frames]
+
+    width, height = sizes.pop()
+    shape = (len(frames), height, width, 4)
+    nbytes = int(np.prod(shape))
+
+    in_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    out_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    try:
+        src = np.ndarray(shape, dtype=np.uint8, buffer=in_shm.buf)
+        for i, frame in enumerate(frames):
+            src[i] = np.asarray(frame.convert("RGBA"))
+        del src
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(in_shm.name, out_shm.name, shape, func, kwargs)) as executor:
+            list(executor.map(_run_chunk, _chunks(len(frames), jobs)))
+
+        dst = np.ndarray(shape, dtype=np.uint8, buffer=out_shm.buf)
+        results = [Image.fromarray(dst[i].copy()) for i in range(len(frames))]
+        del dst
+    finally:
+        for shm in (in_shm, out_shm):
+            shm.close()
+            shm.unlink()
+
+    return results
+
+
+def map_items(func, items, jobs=1):
+    """
+    Aplica func(item) a cada item (ex: caminhos de arquivos), em paralelo se
+    jobs > 1. Útil quando cada processo lê e grava seus próprios arquivos.
+
+    Returns:
+        Lista de resultados, na mesma ordem da entrada
+    """
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), len(items))
+    if jobs <= 1:
+        return [func(item) for item in items]
+
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def _process_file(task):
+    func, kwargs, src_path, dst_path = task
+    with Image.open(src_path) as img:
+        img.load()
+        result = func(img, **kwargs)
+    result.save(dst_path)
+    return dst_path
+
+
+def map_files(func, pairs, jobs=1, **kwargs):
+    """
+    Para cada par (origem, destino): abre a origem, aplica func(frame, **kwargs)
+    e salva no destino. Cada processo lê e grava seus próprios arquivos, então
+    só os caminhos trafegam entre processos.
+
+    Returns:
+        Lista de caminhos de destino, na mesma ordem da entrada
+    """
+    tasks = [(func, kwargs, src, dst) for src, dst in pairs]
+    return map_items(_process_file, tasks, jobs)
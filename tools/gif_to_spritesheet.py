@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Converte GIF animado para PNG spritesheet para uso no Phaser
+
+Com --max-size N (limite de textura, ex: 4096), os frames são quebrados em
+linhas para não passar de N px; se nem a grade couber, o spritesheet é
+dividido em páginas (nome-0.png, nome-1.png, ...) com um JSON multiatlas.
+--columns N monta uma grade de N colunas em vez da linha única.
+
+Os frames são decodificados um de cada vez e colados na página assim que
+chegam; cada página é salva quando fica completa. Em memória ficam só o
+frame atual e a página em montagem, não o GIF inteiro.
+"""
+
+from PIL import Image, ImageSequence
+import itertools
+import json
+import sys
+import os
+
+from atlas_packer import (pages_json, parse_tiers, reduce_atlas, remove_stale_pages, tier_paths, tier_step,
+                          tier_suffix)
+from build_cache import cached_build
+from image_formats import (DEFAULT_ALPHA_QUALITY, DEFAULT_PALETTE_ERROR, DEFAULT_QUALITY, parse_formats,
+                           print_size_comparison, save_png, save_variants, variant_outputs)
+
+def gif_to_spritesheet(gif_path, output_path=None, formats=(), quality=DEFAULT_QUALITY,
+                       alpha_quality=DEFAULT_ALPHA_QUALITY, palette=False,
+                       palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=(), columns=None,
+                       force=False):
+    """
+    Converte um GIF animado em um spritesheet PNG horizontal (ou em grade/páginas, com max_size)
+
+    Args:
+        gif_path: Caminho para o arquivo GIF
+        output_path: Caminho para salvar o spritesheet (opcional)
+        formats: Codificações extras ao lado do PNG, ex: ["webp", "avif"] (ver image_formats.py)
+        quality: Qualidade das codificações com perdas (0-100)
+        alpha_quality: Qualidade do alpha no WebP com perdas (0-100)
+        palette: Grava o PNG indexado (uma paleta para todos os frames) se o
+                 erro médio por canal ficar em até palette_error; senão, RGBA
+        max_size: Lado máximo de cada textura (ex: 4096); quebra os frames em
+                  linhas e, se preciso, em páginas com JSON multiatlas
+        tiers: Escalas das camadas reduzidas, ex: [0.5] gera também nome@0.5x.png;
+               cada frame ocupa uma célula com lados múltiplos dos fatores
+        columns: Colunas da grade (padrão: todos os frames numa linha)
+        force: Refaz o spritesheet mesmo se o GIF não mudou (ver build_cache.py)
+
+    Returns:
+        Dicionário com informações do spritesheet
+    """
+
+    # Determinar caminho de saída
+    if output_path is None:
+        base_name = os.path.splitext(gif_path)[0]
+        output_path = f"{base_name}_spritesheet.png"
+
+    # Só refazer se o GIF ou o código mudaram
+    params = {"formats": list(formats), "quality": quality, "alpha_quality": alpha_quality,
+              "palette": palette, "palette_error": palette_error, "max_size": max_size,
+              "tiers": list(tiers), "columns": columns}
+    pngs = tier_paths(output_path, tiers)
+    outputs = pngs + [path for png in pngs for path in variant_outputs(png, formats)]
+    info = cached_build("gif-to-spritesheet", [gif_path], params, outputs,
+                        lambda: _build_spritesheet(gif_path, output_path, formats, quality, alpha_quality,
+                                                   palette, palette_error, max_size, tiers, columns),
+                        version_files=[__file__, "image_formats.py", "atlas_packer.py"], force=force)
+    frame_width, frame_height = info['frame_width'], info['frame_height']
+    frame_count = info['frame_count']
+
+    # Mostrar código Phaser
+    print("\n" + "="*60)
+    print("CODIGO PHASER PARA USAR ESTE SPRITESHEET:")
+    print("="*60)
+
+    gif_name = os.path.splitext(os.path.basename(gif_path))[0]
+
+    if info.get('pages', 1) > 1:
+        json_dir = os.path.dirname(info['json_path'])
+        print(f"""
+// No preload() ou em BootScene.js ({info['pages']} paginas):
+this.load.multiatlas('{gif_name}', '{info['json_path']}', '{json_dir + '/' if json_dir else ''}');
+
+// No create() do LocationScene ou onde criar a animação:
+this.anims.create({{
+    key: '{gif_name}_anim',
+    frames: this.anims.generateFrameNames('{gif_name}', {{
+        prefix: '{gif_name}_',
+        start: 0,
+        end: {frame_count - 1}
+    }}),
+    frameRate: 10,  // Ajuste a velocidade (frames por segundo)
+    repeat: -1      // -1 = loop infinito
+}});
+
+// Para criar e reproduzir o sprite:
+const sprite = this.add.sprite(x, y, '{gif_name}', '{gif_name}_0');
+sprite.play('{gif_name}_anim');
+""")
+        print("="*60)
+        return info
+
+    print(f"""
+// No preload() ou em BootScene.js:
+this.load.spritesheet('{gif_name}', '{output_path}', {{
+    frameWidth: {frame_width},
+    frameHeight: {frame_height}
+}});
+
+// No create() do LocationScene ou onde criar a animação:
+this.anims.create({{
+    key: '{gif_name}_anim',
+    frames: this.anims.generateFrameNumbers('{gif_name}', {{
+        start: 0,
+        end: {frame_count - 1}
+    }}),
+    frameRate: 10,  // Ajuste a velocidade (frames por segundo)
+    repeat: -1      // -1 = loop infinito
+}});
+
+// Para criar e reproduzir o sprite:
+const sprite = this.add.sprite(x, y, '{gif_name}');
+sprite.play('{gif_name}_anim');
+""")
+    for scale in info.get('tiers', []):
+        tier_path = f"{os.path.splitext(output_path)[0]}@{scale:g}x.png"
+        print(f"// Camada @{scale:g}x (use sprite.setScale({1 / scale:g}) para o mesmo tamanho na tela):")
+        print(f"// this.load.spritesheet('{gif_name}', '{tier_path}', "
+              f"{{ frameWidth: {round(frame_width * scale)}, frameHeight: {round(frame_height * scale)} }});")
+
+    print("="*60)
+
+    return info
+
+def _build_spritesheet(gif_path, output_path, formats=(), quality=DEFAULT_QUALITY,
+                       alpha_quality=DEFAULT_ALPHA_QUALITY, palette=False,
+                       palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=(), columns=None):
+    """
+    Monta e salva o spritesheet com todos os frames do GIF (ver grid_layout)
+    e, com tiers, as camadas reduzidas (nome@0.5x.png, ...).
+    """
+    gif_name = os.path.splitext(os.path.basename(gif_path))[0]
+
+    # Abrir o GIF
+    print(f"[*] Abrindo: {gif_path}")
+    with Image.open(gif_path) as gif:
+        # Contar frames sem decodificar os pixels (Pillow só lê os cabeçalhos)
+        frame_count = getattr(gif, 'n_frames', 1)
+        frame_width, frame_height = gif.size
+        print(f"[OK] Encontrados {frame_count} frames")
+        print(f"[*] Dimensoes de cada frame: {frame_width}x{frame_height}px")
+
+        return _paste_frames(ImageSequence.Iterator(gif), gif_name, frame_count, frame_width, frame_height,
+                             output_path, formats, quality, alpha_quality, palette, palette_error,
+                             max_size, columns, tiers)
+
+
+def _paste_frames(frames, gif_name, frame_count, frame_width, frame_height, output_path, formats, quality,
+                  alpha_quality, palette, palette_error, max_size, columns, tiers):
+    """
+    Cola os frames (decodificados um de cada vez) nas páginas e salva cada
+    página assim que fica completa: em memória, só um frame e uma página.
+    """
+    # Camadas reduzidas: cada frame ocupa uma célula com lados múltiplos de
+    # todos os fatores, para a redução não misturar frames vizinhos
+    factors = [1] + parse_tiers(tiers)
+    step = tier_step(factors)
+    cell_width = -(-frame_width // step) * step
+    cell_height = -(-frame_height // step) * step
+    if (cell_width, cell_height) != (frame_width, frame_height):
+        print(f"[*] Celulas de {cell_width}x{cell_height}px (multiplas de {step}px para as camadas)")
+
+    # Layout: uma linha horizontal com todos os frames; com max_size, quebra em
+    # linhas (grade) e, se ainda não couber, em páginas
+    columns, rows, pages = grid_layout(frame_count, cell_width, cell_height, max_size, columns)
+    spritesheet_width = cell_width * columns
+    spritesheet_height = cell_height * rows
+    per_page = columns * rows
+    base_path = os.path.splitext(output_path)[0]
+
+    if pages > 1:
+        print(f"[*] Criando {pages} paginas de ate {spritesheet_width}x{spritesheet_height}px "
+              f"({columns}x{rows} frames, limite {max_size}px)")
+    else:
+        print(f"[*] Criando spritesheet: {spritesheet_width}x{spritesheet_height}px")
+
+    # Sobras de uma geração anterior (mais páginas ou camadas) não seriam sobrescritas
+    remove_stale_pages(output_path)
+
+    outputs = []
+    textures = {factor: [] for factor in factors}
+    for page in range(pages):
+        page_count = min(per_page, frame_count - page * per_page)
+        page_rows = -(-page_count // columns)
+        page_width = cell_width * min(columns, page_count)
+        page_height = cell_height * page_rows
+        spritesheet = Image.new('RGBA', (page_width, page_height), (0, 0, 0, 0))
+
+        # Colar cada frame no spritesheet assim que é decodificado
+        placements = []
+        for i, frame in enumerate(itertools.islice(frames, page_count)):
+            x_position = (i % columns) * cell_width
+            y_position = (i // columns) * cell_height
+            # Converter frame para RGBA (suporta transparência)
+            spritesheet.paste(frame.convert('RGBA'), (x_position, y_position))
+            placements.append({"x": x_position, "y": y_position,
+                               "source_rect": (0, 0, cell_width, cell_height),
+                               "source_size": (frame_width, frame_height)})
+            print(f"  -> Frame {page * per_page + i + 1}/{frame_count} posicionado em x={x_position}, y={y_position}")
+
+        # Página em cada camada (a reduzida sai da página inteira, uma vez só)
+        for factor in factors:
+            image = spritesheet if factor == 1 else reduce_atlas(spritesheet, factor)
+
+            # Salvar spritesheet
+            suffix = tier_suffix(factor) + ("" if pages == 1 else f"-{page}")
+            page_path = output_path if not suffix else f"{base_path}{suffix}.png"
+            # optimize=True deixa o spritesheet RGBA maior que o zlib no nível máximo
+            save_png(image, page_path, palette, palette_error, png_options={"compress_level": 9})
+            print(f"[OK] Spritesheet salvo: {page_path}")
+            outputs.append(page_path)
+
+            texture = {
+                "image": os.path.basename(page_path),
+                "size": image.size,
+                "frames": [(f"{gif_name}_{page * per_page + i}", p) for i, p in enumerate(placements)]
+            }
+
+            # Codificações extras (WebP/AVIF)
+            if formats:
+                texture["variants"] = save_variants(image, page_path, formats, quality, alpha_quality)
+                outputs.extend(variant_outputs(page_path, formats))
+                print_size_comparison(texture["variants"])
+            textures[factor].append(texture)
+
+    # Várias páginas: JSON multiatlas do Phaser (um por camada)
+    json_path = None
+    if pages > 1:
+        for factor in factors:
+            atlas_data = pages_json(textures[factor], {"scale": f"{1 / factor:g}"}, factor)
+            for texture, entry in zip(textures[factor], atlas_data["textures"]):
+                if "variants" in texture:
+                    entry["variants"] = texture["variants"]
+            tier_json = f"{base_path}{tier_suffix(factor)}.json"
+            with open(tier_json, 'w') as f:
+                json.dump(atlas_data, f, indent=2)
+            print(f"[OK] JSON multiatlas salvo: {tier_json}")
+            outputs.append(tier_json)
+            json_path = json_path or tier_json
+
+    # Retornar informações
+    return {
+        'output_path': outputs[0],
+        'json_path': json_path,
+        'outputs': outputs,
+        'variants': textures[1][0].get("variants"),
+        'frame_count': frame_count,
+        'frame_width': cell_width,
+        'frame_height': cell_height,
+        'columns': columns,
+        'pages': pages,
+        'tiers': [1 / factor for factor in factors[1:]],
+        'spritesheet_width': spritesheet_width,
+        'spritesheet_height': spritesheet_height
+    }
+
+def grid_layout(frame_count, frame_width, frame_height, max_size=None, columns=None):
+    """
+    Colunas, linhas por página e número de páginas para frames de tamanho fixo.
+
+    Sem max_size nem columns é uma linha só; columns fixa o número de colunas
+    da grade; com max_size, cabem no máximo max_size // frame_width colunas e
+    max_size // frame_height linhas por página.
+
+    Raises:
+        ValueError: Um frame sozinho é maior que max_size
+    """
+    columns = min(frame_count, columns or frame_count)
+    if max_size is None:
+        return columns, -(-frame_count // columns), 1
+    if frame_width > max_size or frame_height > max_size:
+        raise ValueError(f"Frame de {frame_width}x{frame_height} nao cabe numa textura de {max_size}x{max_size}")
+
+    columns = min(columns, max_size // frame_width)
+    rows = min(-(-frame_count // columns), max_size // frame_height)
+    pages = -(-frame_count // (columns * rows))
+    return columns, rows, pages
+
+if __name__ == '__main__':
+    # Verificar se foi passado um arquivo
+    args = []
+    force = False
+    formats = []
+    quality = DEFAULT_QUALITY
+    alpha_quality = DEFAULT_ALPHA_QUALITY
+    palette = False
+    palette_error = DEFAULT_PALETTE_ERROR
+    max_size = None
+    tiers = []
+    columns = None
+    try:
+        i = 1
+        while i < len(sys.argv):
+            if sys.argv[i] == '--force':
+                force = True
+            elif sys.argv[i] == '--formats' and i + 1 < len(sys.argv):
+                formats = parse_formats(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--quality' and i + 1 < len(sys.argv):
+                quality = int(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--alpha-quality' and i + 1 < len(sys.argv):
+                alpha_quality = int(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--palette':
+                palette = True
+            elif sys.argv[i] == '--palette-error' and i + 1 < len(sys.argv):
+                palette, palette_error = True, float(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--max-size' and i + 1 < len(sys.argv):
+                max_size = int(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--columns' and i + 1 < len(sys.argv):
+                columns = int(sys.argv[i + 1])
+                i += 1
+            elif sys.argv[i] == '--tiers' and i + 1 < len(sys.argv):
+                tiers = [1 / factor for factor in parse_tiers(sys.argv[i + 1])]
+                i += 1
+            else:
+                args.append(sys.argv[i])
+            i += 1
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    if len(args) < 1:
+        print("[ERROR] Uso: python gif-to-spritesheet.py <arquivo.gif> [--force] [--formats webp,avif] "
+              "[--quality N] [--alpha-quality N] [--palette] [--palette-error N] [--max-size N] [--tiers 0.5] [--columns N]")
+        print("[INFO] Exemplo: python gif-to-spritesheet.py arvore01.gif")
+        print("[INFO] --force refaz o spritesheet mesmo se o GIF nao mudou")
+        print("[INFO] --formats grava tambem WebP/AVIF ao lado do PNG (webp, webp-lossless, avif)")
+        print("[INFO] --palette grava o PNG indexado (ate 256 cores) se o erro medio ficar em ate 2 "
+              "(--palette-error N)")
+        print("[INFO] --max-size limita o lado da textura (ex: 4096): quebra em linhas e, se preciso, em paginas")
+        print("[INFO] --tiers 0.5,0.25 gera tambem camadas reduzidas (nome@0.5x.png, ...)")
+        print("[INFO] --columns N monta uma grade de N colunas em vez de uma linha so")
+        sys.exit(1)
+
+    gif_file = args[0]
+
+    # Verificar se o arquivo existe
+    if not os.path.exists(gif_file):
+        print(f"[ERROR] Arquivo nao encontrado: {gif_file}")
+        sys.exit(1)
+
+    # Converter
+    try:
+        info = gif_to_spritesheet(gif_file, formats=formats, quality=quality,
+                                  alpha_quality=alpha_quality, palette=palette,
+                                  palette_error=palette_error, max_size=max_size, tiers=tiers,
+                                  columns=columns, force=force)
+        print(f"\n[SUCCESS] CONVERSAO CONCLUIDA COM SUCESSO!")
+        print(f"   Frames: {info['frame_count']}")
+        print(f"   Frame size: {info['frame_width']}x{info['frame_height']}px")
+        print(f"   Spritesheet: {info['spritesheet_width']}x{info['spritesheet_height']}px")
+        if info.get('pages', 1) > 1:
+            print(f"   Paginas: {info['pages']} (JSON: {info['json_path']})")
+    except Exception as e:
+        print(f"[ERROR] Erro ao converter: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,210 @@
+"""
+Codificações extras (WebP/AVIF) para atlases e spritesheets, além do PNG.
+
+Cada formato pedido gera um arquivo ao lado do PNG, com o mesmo nome e outra
+extensão (fogo_atlas.png -> fogo_atlas.webp). No JSON do atlas, meta.image
+continua sendo o PNG (suportado por qualquer navegador) e meta.variants
+lista todas as codificações, da menor para a maior, para o loader escolher
+a primeira que o navegador suporta.
+
+O próprio PNG pode ser gravado indexado (paleta de até 256 cores RGBA, uma
+só para o atlas inteiro, ou seja, compartilhada por todos os frames) em vez
+de RGBA 32 bits; ver save_png.
+
+Formatos:
+  webp           WebP com perdas; quality para as cores, alpha_quality para o alpha
+  webp-lossless  WebP sem perdas
+  avif           AVIF com perdas (quality vale para cores e alpha)
+
+Requisitos: pip install Pillow (com suporte a WebP/AVIF, ver PIL.features)
+"""
+
+import io
+import os
+
+import numpy as np
+from PIL import Image, features
+
+
+VARIANT_FORMATS = {
+    "webp": {"ext": ".webp", "codec": "webp"},
+    "webp-lossless": {"ext": ".webp", "codec": "webp"},
+    "avif": {"ext": ".avif", "codec": "avif"},
+}
+
+DEFAULT_QUALITY = 80
+DEFAULT_ALPHA_QUALITY = 90
+
+# Erro médio por canal (0-255, sobre os pixels visíveis) aceito no PNG indexado
+DEFAULT_PALETTE_ERROR = 2.0
+PALETTE_COLORS = 256
+
+
+def parse_formats(text):
+    """
+    Lê uma lista de formatos separados por vírgula (ex: "webp,avif").
+
+    Raises:
+        ValueError: Formato desconhecido, sem suporte no Pillow instalado, ou
+                    dois formatos que gravariam o mesmo arquivo
+    """
+    formats = [f.strip().lower() for f in text.split(',') if f.strip()] if isinstance(text, str) else list(text)
+    extensions = {}
+    for fmt in formats:
+        if fmt not in VARIANT_FORMATS:
+            raise ValueError(f"Formato desconhecido: {fmt} (disponíveis: {', '.join(VARIANT_FORMATS)})")
+        if not features.check(VARIANT_FORMATS[fmt]["codec"]):
+            raise ValueError(f"Pillow instalado sem suporte a {VARIANT_FORMATS[fmt]['codec'].upper()}")
+        ext = VARIANT_FORMATS[fmt]["ext"]
+        if ext in extensions:
+            raise ValueError(f"Formatos {extensions[ext]} e {fmt} gravariam o mesmo arquivo ({ext})")
+        extensions[ext] = fmt
+    return formats
+
+
+def variant_path(png_path, fmt):
+    """
+    Caminho da codificação fmt ao lado do PNG.
+    """
+    return os.path.splitext(png_path)[0] + VARIANT_FORMATS[fmt]["ext"]
+
+
+def save_variant(img, png_path, fmt, quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY):
+    """
+    Grava a imagem RGBA no formato fmt ao lado do PNG.
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    path = variant_path(png_path, fmt)
+    if fmt == "webp":
+        img.save(path, "WEBP", quality=quality, alpha_quality=alpha_quality, method=6)
+    elif fmt == "webp-lossless":
+        img.save(path, "WEBP", lossless=True, quality=100, method=6, exact=False)
+    elif fmt == "avif":
+        img.save(path, "AVIF", quality=quality, subsampling="4:4:4", speed=4)
+    return path
+
+
+def save_variants(img, png_path, formats, quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY):
+    """
+    Grava as codificações pedidas e descreve todas (incluindo o PNG já salvo).
+
+    Returns:
+        Lista de {"format", "image" (nome do arquivo), "size" (bytes)}, da
+        menor para a maior
+    """
+    variants = [{"format": "png", "image": os.path.basename(png_path), "size": os.path.getsize(png_path)}]
+    for fmt in formats:
+        path = save_variant(img, png_path, fmt, quality, alpha_quality)
+        variants.append({"format": fmt, "image": os.path.basename(path), "size": os.path.getsize(path)})
+    return sorted(variants, key=lambda v: v["size"])
+
+
+def print_size_comparison(variants):
+    """
+    Tabela de tamanhos por formato, relativa ao PNG.
+    """
+    png_size = next(v["size"] for v in variants if v["format"] == "png")
+    print(f"\n  {'Formato':<14} {'Tamanho':>12} {'vs PNG':>8}")
+    for variant in variants:
+        print(f"  {variant['format']:<14} {variant['size'] / 1024:>9.2f} KB {variant['size'] / png_size * 100:>7.1f}%")
+
+
+def variant_outputs(png_path, formats):
+    """
+    Caminhos de todas as codificações extras (para o cache de builds).
+    """
+    return [variant_path(png_path, fmt) for fmt in formats]
+
+
+# ---------------------------------------------------------------------------
+# PNG indexado
+# ---------------------------------------------------------------------------
+
+def quantize_rgba(img, colors=PALETTE_COLORS):
+    """
+    Converte uma imagem RGBA para modo P com paleta RGBA (alpha por cor).
+
+    Pixels totalmente transparentes viram uma cor só. Se sobrarem até
+    `colors` cores, a paleta é exata (sem perdas); senão as cores são
+    reduzidas com o octree do Pillow, que considera o alpha.
+
+    Returns:
+        Tupla (imagem P, número de cores da paleta)
+    """
+    data = np.array(img.convert("RGBA"))
+    data[data[..., 3] == 0] = 0
+
+    pixels = data.reshape(-1, 4).view(np.uint32).ravel()
+    palette, indices = np.unique(pixels, return_inverse=True)
+    if len(palette) <= colors:
+        indexed = Image.fromarray(indices.astype(np.uint8).reshape(data.shape[:2]), "P")
+        indexed.putpalette(palette.view(np.uint8).tobytes(), "RGBA")
+        return indexed, len(palette)
+
+    method = Image.Quantize.LIBIMAGEQUANT if features.check_feature("libimagequant") else Image.Quantize.FASTOCTREE
+    indexed = Image.fromarray(data, "RGBA").quantize(colors, method=method)
+    return indexed, len(indexed.getpalette("RGBA")) // 4
+
+
+def palette_error(original, quantized):
+    """
+    Erro médio por canal (0-255) entre duas imagens RGBA, só nos pixels
+    visíveis em alguma das duas. As cores são comparadas pré-multiplicadas
+    pelo alpha (a cor de um pixel quase transparente quase não aparece).
+    """
+    a = np.asarray(original.convert("RGBA"), dtype=np.float32)
+    b = np.asarray(quantized.convert("RGBA"), dtype=np.float32)
+    visible = (a[..., 3] > 0) | (b[..., 3] > 0)
+    if not visible.any():
+        return 0.0
+
+    a[..., :3] *= a[..., 3:] / 255
+    b[..., :3] *= b[..., 3:] / 255
+    return float(np.abs(a[visible] - b[visible]).mean())
+
+
+# Opções do PNG RGBA quando o chamador não dá outras
+PNG_OPTIONS = {"optimize": True}
+
+
+def _encode_png(img, options=PNG_OPTIONS):
+    buf = io.BytesIO()
+    img.save(buf, "PNG", **options)
+    return buf.getvalue()
+
+
+def save_png(img, png_path, palette=False, max_error=DEFAULT_PALETTE_ERROR, png_options=None):
+    """
+    Grava a imagem como PNG (RGBA com png_options; padrão optimize=True).
+
+    Com palette=True, tenta também o PNG indexado (ver quantize_rgba) e mede o
+    erro em relação ao original; fica com o indexado se o erro não passar de
+    max_error e o arquivo for menor, senão grava o RGBA 32 bits como antes.
+
+    Returns:
+        Dicionário com mode ("indexed" ou "rgba"), colors e error (None sem palette)
+    """
+    data = _encode_png(img, png_options or PNG_OPTIONS)
+    result = {"mode": "rgba", "colors": None, "error": None}
+
+    if palette:
+        indexed, colors = quantize_rgba(img)
+        indexed_data = _encode_png(indexed)
+        error = palette_error(img, Image.open(io.BytesIO(indexed_data)))
+        result.update(colors=colors, error=error)
+
+        if error > max_error:
+            print(f"PNG indexado descartado: erro médio {error:.2f} > {max_error} ({colors} cores); mantendo RGBA")
+        elif len(indexed_data) >= len(data):
+            print("PNG indexado não ficou menor que o RGBA; mantendo RGBA")
+        else:
+            print(f"PNG indexado: {colors} cores, erro médio {error:.2f} "
+                  f"({len(indexed_data) / 1024:.2f} KB, RGBA teria {len(data) / 1024:.2f} KB)")
+            data = indexed_data
+            result["mode"] = "indexed"
+
+    with open(png_path, "wb") as f:
+        f.write(data)
+    return result
@@ -0,0 +1,350 @@
+"""
+Levantamento rápido de metadados de GIFs e vídeos, sem decodificar pixels.
+
+GIF: os blocos do arquivo são percorridos direto (cabeçalho, paleta global,
+extensões e descritores de imagem); os dados LZW de cada frame são pulados
+sub-bloco a sub-bloco, sem descompactar. Dá o número de frames, o atraso, o
+descarte (disposal) e o índice transparente de cada frame, o retângulo de
+cada frame e o tamanho lógico da tela.
+
+Vídeo (.mp4, .webm, .mov, ...): ffprobe (contagem de pacotes, sem
+decodificar). O resultado fica num cache (.media-info-cache.json na pasta
+varrida), reaproveitado enquanto tamanho e data do arquivo não mudarem.
+
+Uso: python media_info.py <arquivos ou pastas...> [--output saida.json] [--jobs N] [--no-cache]
+
+  pastas       : varridas recursivamente
+  --output     : grava o JSON no arquivo (padrão: imprime na tela)
+  --jobs N     : chamadas de ffprobe ao mesmo tempo (padrão: 1; 0 = todos os núcleos)
+  --no-cache   : ignora e não grava o cache do ffprobe
+
+Exemplo:
+  python tools/media_info.py images/objects --output objects.json
+
+Requisitos: ffprobe no PATH (só para vídeos)
+"""
+
+import json
+import mmap
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from build_cache import file_stat, load_manifest, rel_path, save_manifest
+from frame_pool import parse_jobs_arg, resolve_jobs
+
+
+CACHE_NAME = '.media-info-cache.json'
+GIF_EXTENSIONS = ('.gif',)
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mov', '.mkv', '.avi')
+
+# Descarte do frame anterior (campo disposal da extensão de controle gráfico)
+DISPOSAL_NAMES = {0: "none", 1: "keep", 2: "background", 3: "previous"}
+
+
+# ---------------------------------------------------------------------------
+# GIF
+# ---------------------------------------------------------------------------
+
+def _skip_sub_blocks(data, pos):
+    """
+    Pula uma sequência de sub-blocos (tamanho + dados) até o terminador.
+
+    Returns:
+        Posição logo depois do terminador
+    """
+    while True:
+        size = data[pos]
+        pos += 1
+        if size == 0:
+            return pos
+        pos += size
+
+
+def read_gif_header(gif_path):
+    """
+    Lê os metadados de um GIF percorrendo os blocos, sem decodificar os frames.
+
+    Returns:
+        Dicionário com format, width, height (tela lógica), global_palette
+        (número de cores ou None), background_index, loop (repetições; 0 =
+        infinito; None sem extensão NETSCAPE), frames, duration_ms, truncated
+        e frame_info (por frame: rect [x, y, w, h], delay_ms, disposal,
+        transparent_index, local_palette, interlaced)
+
+    Raises:
+        ValueError: Não é um GIF
+    """
+    with open(gif_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < 13:
+            raise ValueError("Arquivo pequeno demais para um GIF")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _parse_gif(data)
+
+
+def _parse_gif(data):
+    signature = bytes(data[0:6])
+    if signature not in (b'GIF87a', b'GIF89a'):
+        raise ValueError("Assinatura de GIF ausente")
+
+    width = int.from_bytes(data[6:8], 'little')
+    height = int.from_bytes(data[8:10], 'little')
+    packed = data[10]
+    global_palette = 2 << (packed & 0x07) if packed & 0x80 else None
+    info = {
+        "format": "gif",
+        "version": signature[3:].decode('ascii'),
+        "width": width,
+        "height": height,
+        "global_palette": global_palette,
+        "background_index": data[11],
+        "loop": None,
+        "frames": 0,
+        "duration_ms": 0,
+        "truncated": False,
+        "frame_info": []
+    }
+
+    pos = 13 + 3 * (global_palette or 0)
+    control = None
+    try:
+        while True:
+            block = data[pos]
+            if block == 0x3B:  # Fim do arquivo
+                break
+
+            if block == 0x21:  # Extensão
+                label = data[pos + 1]
+                pos += 2
+                if label == 0xF9 and data[pos] >= 4:
+                    # Controle gráfico: vale para o próximo frame
+                    flags = data[pos + 1]
+                    control = {
+                        "delay_ms": int.from_bytes(data[pos + 2:pos + 4], 'little') * 10,
+                        "disposal": DISPOSAL_NAMES.get((flags >> 2) & 0x07, "none"),
+                        "transparent_index": data[pos + 4] if flags & 0x01 else None
+                    }
+                elif label == 0xFF and data[pos] == 11 and bytes(data[pos + 1:pos + 12]) in (b'NETSCAPE2.0', b'ANIMEXTS1.0'):
+                    sub = pos + 12
+                    if data[sub] >= 3 and data[sub + 1] == 1:
+                        info["loop"] = int.from_bytes(data[sub + 2:sub + 4], 'little')
+                pos = _skip_sub_blocks(data, pos)
+
+            elif block == 0x2C:  # Frame
+                x, y, w, h = (int.from_bytes(data[pos + i:pos + i + 2], 'little') for i in (1, 3, 5, 7))
+                flags = data[pos + 9]
+                pos += 10
+                if flags & 0x80:
+                    pos += 3 * (2 << (flags & 0x07))
+                # Pular os dados LZW (código mínimo + sub-blocos) sem decodificar
+                pos = _skip_sub_blocks(data, pos + 1)
+
+                frame = {"rect": [x, y, w, h]}
+                frame.update(control or {"delay_ms": 0, "disposal": "none", "transparent_index": None})
+                frame["local_palette"] = bool(flags & 0x80)
+                frame["interlaced"] = bool(flags & 0x40)
+                info["frame_info"].append(frame)
+                info["duration_ms"] += frame["delay_ms"]
+                control = None
+
+            else:
+                # Bloco desconhecido: o resto do arquivo não é confiável
+                info["truncated"] = True
+                break
+    except IndexError:
+        info["truncated"] = True
+
+    info["frames"] = len(info["frame_info"])
+    return info
+
+
+# ---------------------------------------------------------------------------
+# Vídeo
+# ---------------------------------------------------------------------------
+
+def _parse_rate(rate_str):
+    num, _, den = str(rate_str).partition('/')
+    try:
+        return float(num) / float(den) if den else float(num)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def probe_media(video_path):
+    """
+    Metadados de um vídeo via ffprobe (sem decodificar frames).
+
+    Returns:
+        Dicionário com format, width, height, fps, duration, frames, codec e
+        pix_fmt (campos ausentes ficam None)
+
+    Raises:
+        RuntimeError: ffprobe não encontrado ou falhou
+    """
+    probe_cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-count_packets', '-show_entries',
+        'stream=nb_read_packets,width,height,r_frame_rate,duration,codec_name,pix_fmt:format=duration,format_name',
+        '-of', 'json',
+        video_path
+    ]
+    try:
+        result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("ffprobe não encontrado")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.strip() or "ffprobe falhou")
+
+    data = json.loads(result.stdout)
+    streams = data.get('streams') or [{}]
+    stream, container = streams[0], data.get('format', {})
+
+    duration = None
+    for source in (stream, container):
+        try:
+            duration = float(source['duration'])
+            break
+        except (KeyError, ValueError):
+            continue
+
+    fps = _parse_rate(stream.get('r_frame_rate', ''))
+    frames = None
+    if str(stream.get('nb_read_packets', '')).isdigit():
+        frames = int(stream['nb_read_packets'])
+    elif duration and fps:
+        frames = int(round(duration * fps))
+
+    return {
+        "format": container.get('format_name'),
+        "width": int(stream['width']) if 'width' in stream else None,
+        "height": int(stream['height']) if 'height' in stream else None,
+        "fps": fps,
+        "duration": duration,
+        "frames": frames,
+        "codec": stream.get('codec_name'),
+        "pix_fmt": stream.get('pix_fmt')
+    }
+
+
+def cached_probe(video_path, cache, base_dir):
+    """
+    probe_media com cache: o resultado guardado vale enquanto tamanho e data
+    de modificação do arquivo não mudarem.
+    """
+    rel = rel_path(video_path, base_dir)
+    stat = file_stat(video_path)
+    known = cache["entries"].get(rel) if cache is not None else None
+    if known and known["size"] == stat["size"] and known["mtime_ns"] == stat["mtime_ns"]:
+        return known["info"]
+
+    info = probe_media(video_path)
+    if cache is not None:
+        cache["entries"][rel] = dict(stat, info=info)
+    return info
+
+
+# ---------------------------------------------------------------------------
+# Varredura
+# ---------------------------------------------------------------------------
+
+def find_media(paths):
+    """
+    Arquivos de GIF e vídeo nos caminhos (pastas são varridas recursivamente),
+    em ordem.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, f) for f in sorted(files)
+                             if f.lower().endswith(GIF_EXTENSIONS + VIDEO_EXTENSIONS))
+        else:
+            found.append(path)
+    return found
+
+
+def scan_media(paths, jobs=1, cache_dir=None):
+    """
+    Metadados de todos os GIFs e vídeos nos caminhos.
+
+    Args:
+        paths: Arquivos e/ou pastas
+        jobs: Chamadas de ffprobe ao mesmo tempo
+        cache_dir: Pasta do cache do ffprobe (None = sem cache)
+
+    Returns:
+        Lista de dicionários (um por arquivo, com path, file_size e os campos
+        de read_gif_header ou probe_media; error se não foi possível ler)
+    """
+    files = find_media(paths)
+    cache = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, CACHE_NAME)
+        cache = load_manifest(cache_path)
+        known = json.dumps(cache["entries"], sort_keys=True)
+    base_dir = os.path.abspath(cache_dir or '.')
+
+    def scan(path):
+        entry = {"path": path.replace(os.sep, '/')}
+        try:
+            entry["file_size"] = os.path.getsize(path)
+            if path.lower().endswith(GIF_EXTENSIONS):
+                entry.update(read_gif_header(path))
+            else:
+                entry.update(cached_probe(path, cache, base_dir))
+        except (OSError, ValueError, RuntimeError) as e:
+            entry["error"] = str(e)
+        return entry
+
+    # GIFs são lidos direto; o tempo vai quase todo no ffprobe dos vídeos
+    with ThreadPoolExecutor(max_workers=resolve_jobs(jobs)) as executor:
+        results = list(executor.map(scan, files))
+
+    if cache is not None and json.dumps(cache["entries"], sort_keys=True) != known:
+        try:
+            save_manifest(cache_path, cache)
+        except OSError as e:
+            print(f"Aviso: Não foi possível gravar o cache ({cache_path}): {e}", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    output = None
+    use_cache = True
+    paths = []
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--output' and i + 1 < len(args):
+            output = args[i + 1]
+            i += 2
+        elif args[i] == '--no-cache':
+            use_cache = False
+            i += 1
+        else:
+            paths.append(args[i])
+            i += 1
+
+    if not paths:
+        print("Uso: python media_info.py <arquivos ou pastas...> [--output saida.json] [--jobs N] [--no-cache]")
+        print("Exemplo: python media_info.py images/objects --output objects.json")
+        sys.exit(1)
+
+    # O cache fica na primeira pasta varrida (ou na pasta do primeiro arquivo)
+    cache_dir = None
+    if use_cache:
+        cache_dir = paths[0] if os.path.isdir(paths[0]) else (os.path.dirname(paths[0]) or '.')
+
+    results = scan_media(paths, jobs, cache_dir)
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+        errors = sum(1 for r in results if "error" in r)
+        print(f"{len(results)} arquivo(s) lidos, {errors} erro(s): {output}")
+    else:
+        print(text)
@@ -0,0 +1,103 @@
+from PIL import ImageOps
+import os
+import shutil
+import sys
+
+from frame_pool import map_files, parse_jobs_arg
+
+def mirror_and_duplicate_frames(frames_dir, output_dir=None, jobs=1):
+    """
+    Espelha frames e adiciona ao final para criar animação de ida e volta.
+
+    Args:
+        frames_dir: Diretório com frames PNG
+        output_dir: Diretório de saída (opcional, usa o mesmo se não especificado)
+        jobs: Número de processos; cada um lê e grava seus próprios frames (padrão: 1)
+    """
+    if output_dir is None:
+        output_dir = frames_dir
+
+    # Criar diretório de saída se não existir
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Listar frames PNG
+    frames = sorted([f for f in os.listdir(frames_dir) if f.endswith('.png')])
+
+    if not frames:
+        print(f"Erro: Nenhum frame PNG encontrado em '{frames_dir}'")
+        return
+
+    print(f"Encontrados {len(frames)} frames originais")
+    print(f"Criando frames espelhados para animação de ida e volta...\n")
+
+    original_count = len(frames)
+
+    # Primeiro, copiar frames originais se output_dir for diferente
+    if output_dir != frames_dir:
+        for i, frame_file in enumerate(frames):
+            src = os.path.join(frames_dir, frame_file)
+            dst = os.path.join(output_dir, f'frame_{i:04d}.png')
+            shutil.copyfile(src, dst)
+            print(f"  Copiado: {frame_file} -> frame_{i:04d}.png")
+
+    # Criar frames espelhados (na mesma ordem, só espelha a imagem)
+    print("\nCriando frames espelhados...")
+
+    # Manter ordem para aranha andar na direção oposta
+    pairs = []
+    for i, frame_file in enumerate(frames):
+        new_index = original_count + i
+        pairs.append((os.path.join(frames_dir, frame_file),
+                      os.path.join(output_dir, f'frame_{new_index:04d}.png')))
+
+    # Espelhar horizontalmente e salvar como novos frames (em paralelo se jobs > 1)
+    map_files(ImageOps.mirror, pairs, jobs)
+
+    for frame_file, (_, output_path) in zip(frames, pairs):
+        print(f"  Espelhado: {frame_file} -> {os.path.basename(output_path)}")
+
+    total_frames = original_count * 2
+
+    print(f"\n✓ Completo!")
+    print(f"  Frames originais: {original_count}")
+    print(f"  Frames espelhados: {original_count}")
+    print(f"  Total: {total_frames} frames")
+    print(f"\nFrames salvos em: {output_dir}")
+    print("\nAnimação criada:")
+    print(f"  frames 0-{original_count-1}: Ida (direita → esquerda)")
+    print(f"  frames {original_count}-{total_frames-1}: Volta (esquerda → direita, espelhado)")
+
+
+if __name__ == "__main__":
+    jobs, argv = parse_jobs_arg(sys.argv[1:])
+
+    if len(argv) < 1:
+        print("=" * 70)
+        print("ESPELHAR FRAMES - Criar animação de ida e volta")
+        print("=" * 70)
+        print("\nUso: python mirror-frames.py <diretorio_frames> [diretorio_saida] [--jobs N]")
+        print("\nExemplos:")
+        print("  python tools/mirror-frames.py frames_spider_no_bg")
+        print("  python tools/mirror-frames.py frames_spider_no_bg frames_spider_round_trip")
+        print("\nO que faz:")
+        print("  - Lê todos os frames PNG do diretório")
+        print("  - Cria versões espelhadas (flip horizontal)")
+        print("  - Adiciona frames espelhados ao final")
+        print("  - Resultado: animação de ida e volta suave")
+        print("  - --jobs N: espelha os frames em N processos (0 = todos os núcleos)")
+        print("\nExemplo de resultado:")
+        print("  17 frames originais -> 34 frames total (17 ida + 17 volta)")
+        print("=" * 70)
+    else:
+        frames_dir = argv[0]
+        output_dir = argv[1] if len(argv) > 1 else None
+
+        print(f"\n{'='*70}")
+        print(f"Processando: {frames_dir}")
+        if output_dir:
+            print(f"Saída em: {output_dir}")
+        else:
+            print(f"Saída em: {frames_dir} (mesmo diretório)")
+        print(f"{'='*70}\n")
+
+        mirror_and_duplicate_frames(frames_dir, output_dir, jobs)
@@ -0,0 +1,577 @@
+"""
+Converte um vídeo MP4 em Atlas PNG com transparência.
+Usa ffmpeg para extrair frames e remove o fundo usando detecção de cor.
+
+Por padrão os frames chegam do ffmpeg por um pipe (rawvideo RGBA) e passam,
+um de cada vez, pelos estágios de frame_pipeline.py (fundo -> recorte ->
+ping-pong/espelho -> atlas); o PNG é codificado uma única vez, no atlas final.
+Use --disk para o modo antigo com diretório temporário de PNGs (útil para
+inspecionar frames).
+
+Os frames decodificados ficam num cache (ver frame_cache.py): rodar de novo
+com outra tolerância ou máscara lê os frames do cache, sem o ffmpeg.
+
+Uso: python mp4-to-atlas.py <video.mp4> <output_name> [tolerancia] [max_frames]
+
+Exemplos:
+  python mp4-to-atlas.py fogo.mp4 fogo
+  python mp4-to-atlas.py fogo.mp4 fogo 30 20
+"""
+
+from PIL import Image, ImageOps
+import subprocess
+import sys
+import os
+import shutil
+
+import frame_pipeline
+from atlas_packer import DEFAULT_PADDING, atlas_outputs, parse_tiers
+from build_cache import cached_build
+from chroma_key import (describe_mask, detect_bg_color, key_background, mask_files, mask_params, mask_shapes,
+                        parse_mask, rasterize_mask)
+from frame_cache import FRAME_CACHE_DIR
+from frame_pipeline import build_extract_args, probe_video, select_frame_indices, video_frames, write_atlas
+from frame_pool import map_files, parse_jobs_arg
+from image_formats import DEFAULT_ALPHA_QUALITY, DEFAULT_PALETTE_ERROR, DEFAULT_QUALITY, parse_formats
+
+
+def extract_frames_from_mp4(video_path, output_dir, max_frames=20):
+    """
+    Extrai frames do vídeo MP4 usando ffmpeg.
+    """
+    # Criar diretório temporário para frames
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+    
+    # Primeiro, obter informações do vídeo
+    info = probe_video(video_path)
+    
+    # Extrair apenas os frames selecionados (ver build_frame_filter)
+    extract_cmd = [
+        'ffmpeg', '-i', video_path,
+        *build_extract_args(info, max_frames),
+        '-start_number', '0',
+        f'{output_dir}/frame_%04d.png'
+    ]
+    
+    print(f"\nExtraindo frames...")
+    try:
+        subprocess.run(extract_cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Erro ao extrair frames: {e.stderr.decode() if e.stderr else e}")
+        return None
+    
+    # Contar frames extraídos
+    frames = sorted([f for f in os.listdir(output_dir) if f.endswith('.png')])
+    print(f"Extraídos {len(frames)} frames")
+    
+    # Limitar a max_frames se necessário (quando o total de frames era desconhecido)
+    if len(frames) > max_frames:
+        selected = [frames[idx] for idx in select_frame_indices(len(frames), max_frames)]
+        
+        # Remover frames não selecionados
+        for f in frames:
+            if f not in selected:
+                os.remove(os.path.join(output_dir, f))
+        
+        # Renomear frames selecionados
+        for i, f in enumerate(selected):
+            old_path = os.path.join(output_dir, f)
+            new_path = os.path.join(output_dir, f'frame_{i:04d}.png')
+            if old_path != new_path:
+                os.rename(old_path, new_path)
+        
+        print(f"Reduzido para {max_frames} frames")
+    
+    return output_dir
+
+
+def stream_frames_from_mp4(video_path, max_frames=20):
+    """
+    Extrai frames do vídeo MP4 direto para a memória (ver frame_pipeline.video_frames).
+
+    Returns:
+        Lista de imagens PIL RGBA, ou None em caso de erro.
+    """
+    frames = video_frames(video_path, max_frames)
+    if frames is None:
+        return None
+    try:
+        return list(frames)
+    except RuntimeError as e:
+        print(e)
+        return None
+
+
+def load_frames(frames_dir):
+    """
+    Carrega os frames PNG de um diretório (ordenados pelo nome) como RGBA.
+    """
+    frames = sorted([f for f in os.listdir(frames_dir) if f.endswith('.png')])
+    return [Image.open(os.path.join(frames_dir, f)).convert("RGBA") for f in frames]
+
+
+def save_frames(frames, frames_dir):
+    """
+    Salva os frames como frame_0000.png, frame_0001.png, ... no diretório.
+    """
+    for i, frame in enumerate(frames):
+        frame.save(os.path.join(frames_dir, f'frame_{i:04d}.png'))
+
+
+def _report_bg_color(first_frame, threshold, mask_region):
+    """
+    Detecta a cor de fundo no primeiro frame e mostra os parâmetros de remoção.
+    """
+    bg_color = detect_bg_color(first_frame)
+    print(f"\nCor de fundo detectada (R,G,B): {bg_color}")
+    print(f"Tolerância: {threshold}")
+    
+    if mask_shapes(mask_region):
+        print(f"Região da logo/máscara: {describe_mask(mask_region)}")
+    
+    return bg_color
+
+
+def remove_background(frames, threshold=30, mask_region=None, jobs=1):
+    """
+    Remove o fundo de cada frame (em memória) usando detecção de cor.
+    
+    Args:
+        frames: Lista de imagens PIL
+        threshold: Tolerância de cor para remoção de fundo
+        mask_region: Região a mascarar (logo/marca d'água): retângulo (x1, y1, x2, y2),
+                     lista de formas ou imagem de máscara (ver chroma_key.mask_shapes)
+        jobs: Número de processos (ver frame_pool.py)
+
+    Returns:
+        Lista de imagens PIL RGBA com transparência
+    """
+    if not frames:
+        print("Nenhum frame encontrado!")
+        return []
+    
+    # Processar cada frame (frame inteiro de uma vez, ver chroma_key.py)
+    keyed = frame_pipeline.key(frames, threshold, mask_region, jobs=jobs)
+    return [frame_pipeline.full_frame(f) for f in keyed]
+
+
+def remove_background_from_frames(frames_dir, threshold=30, mask_region=None, jobs=1):
+    """
+    Remove o fundo de cada frame PNG do diretório (sobrescreve os arquivos).
+    
+    Args:
+        frames_dir: Diretório com os frames
+        threshold: Tolerância de cor para remoção de fundo
+        mask_region: Região a mascarar (logo/marca d'água), como em remove_background
+        jobs: Número de processos; cada um lê e grava seus próprios frames
+    """
+    frames = sorted([f for f in os.listdir(frames_dir) if f.endswith('.png')])
+    
+    if not frames:
+        print("Nenhum frame encontrado!")
+        return
+    
+    with Image.open(os.path.join(frames_dir, frames[0])) as first_frame:
+        bg_color = _report_bg_color(first_frame, threshold, mask_region)
+        # Máscara rasterizada uma vez; cada frame só aplica o plano
+        mask_plane = rasterize_mask(mask_region, first_frame.size)
+    
+    print(f"Removendo fundo dos frames ({jobs} processo(s))...")
+    
+    paths = [os.path.join(frames_dir, f) for f in frames]
+    map_files(key_background, zip(paths, paths), jobs, bg_color=bg_color, threshold=threshold,
+              mode='max', mask_region=mask_plane)
+    print(f"  Processados {len(frames)}/{len(frames)} frames")
+
+
+def pingpong_frames(frames):
+    """
+    Duplica os frames em ordem reversa para criar efeito vai-e-volta (ping-pong).
+    Ex: frames 0,1,2,3 viram 0,1,2,3,2,1 (sem repetir primeiro e último)
+    """
+    return list(frame_pipeline.pingpong(frames))
+
+
+def mirror_frames(frames, jobs=1):
+    """
+    Duplica os frames espelhados horizontalmente para animações de ida e volta.
+    Ex: personagem andando para direita, depois andando para esquerda (espelhado).
+    """
+    return [frame_pipeline.full_frame(f) for f in frame_pipeline.mirror(frames, jobs)]
+
+
+def apply_pingpong(frames_dir):
+    """
+    Aplica ping-pong aos frames PNG do diretório (ver pingpong_frames).
+    """
+    save_frames(pingpong_frames(load_frames(frames_dir)), frames_dir)
+
+
+def apply_mirror(frames_dir, jobs=1):
+    """
+    Aplica espelhamento aos frames PNG do diretório (ver mirror_frames).
+    Cada processo lê um frame e grava a cópia espelhada no final da sequência.
+    """
+    frames = sorted([f for f in os.listdir(frames_dir) if f.endswith('.png')])
+    
+    if not frames:
+        print("Nenhum frame para espelhar")
+        return
+    
+    print(f"\nAplicando espelhamento horizontal...")
+    print(f"  Frames originais: {len(frames)}")
+    
+    pairs = [(os.path.join(frames_dir, f), os.path.join(frames_dir, f'frame_{len(frames) + i:04d}.png'))
+             for i, f in enumerate(frames)]
+    map_files(ImageOps.mirror, pairs, jobs)
+    
+    print(f"  Frames espelhados: {len(frames)}")
+    print(f"  Total final: {len(frames) * 2} frames")
+
+
+def build_atlas(frames, output_name, output_dir='images/objects', padding=DEFAULT_PADDING, dedupe_tolerance=0,
+                formats=(), quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY,
+                palette=False, palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=()):
+    """
+    Cria um atlas PNG + JSON (e as codificações extras em formats) a partir de
+    frames em memória (ver frame_pipeline.write_atlas).
+    """
+    return write_atlas(frames, output_name, output_dir, padding, dedupe_tolerance,
+                       formats, quality, alpha_quality, palette, palette_error, max_size, tiers)
+
+
+def create_atlas_from_frames(frames_dir, output_name, output_dir='images/objects', dedupe_tolerance=0,
+                             encoding=None):
+    """
+    Cria um atlas PNG + JSON a partir dos frames PNG processados no diretório.
+    encoding: formats, quality, alpha_quality, palette, palette_error, max_size e tiers (opcional)
+    """
+    return build_atlas(frame_pipeline.dir_frames(frames_dir), output_name, output_dir,
+                       dedupe_tolerance=dedupe_tolerance, **(encoding or {}))
+
+
+def _mp4_to_atlas_in_memory(video_path, output_name, threshold, max_frames, output_dir,
+                            mask_region, pingpong, mirror, dedupe_tolerance, jobs, encoding, frame_cache):
+    """
+    Pipeline em memória: frames chegam do ffmpeg por pipe (ou do cache de
+    frames), passam pelos estágios um de cada vez e o PNG é codificado uma
+    única vez, no atlas final.
+    """
+    # Step 1: Extrair frames (um de cada vez, ver frame_pipeline.py)
+    frames = video_frames(video_path, max_frames, frame_cache)
+    
+    if frames is None:
+        print("Aviso: Extração por pipe falhou, usando diretório temporário.")
+        return _mp4_to_atlas_on_disk(video_path, output_name, threshold, max_frames, output_dir,
+                                     mask_region, pingpong, mirror, dedupe_tolerance, jobs, encoding)
+    
+    # Step 2: Remover fundo (e máscara se especificada) e recortar; daqui em
+    # diante só o recorte de cada frame fica em memória
+    frames = frame_pipeline.trim(frame_pipeline.key(frames, threshold, mask_region, jobs=jobs))
+    
+    # Step 3: Aplicar efeito pingpong ou mirror se solicitado
+    if pingpong:
+        frames = frame_pipeline.pingpong(frames)
+    elif mirror:
+        frames = frame_pipeline.mirror(frames, jobs)
+    
+    # Step 4: Criar atlas (o pipeline só roda aqui, quando os frames são consumidos)
+    try:
+        return write_atlas(frames, output_name, output_dir, dedupe_tolerance=dedupe_tolerance, **encoding)
+    except RuntimeError as e:
+        print(e)
+        return None
+
+
+def _mp4_to_atlas_on_disk(video_path, output_name, threshold, max_frames, output_dir,
+                          mask_region, pingpong, mirror, dedupe_tolerance, jobs, encoding):
+    """
+    Pipeline com diretório temporário de PNGs (temp_frames_<nome>).
+    """
+    # Step 1: Extrair frames
+    temp_dir = f"temp_frames_{output_name}"
+    frames_dir = extract_frames_from_mp4(video_path, temp_dir, max_frames)
+    
+    if not frames_dir:
+        return None
+    
+    # Step 2: Remover fundo (e máscara se especificada)
+    remove_background_from_frames(frames_dir, threshold, mask_region, jobs)
+    
+    # Step 3: Aplicar efeito pingpong ou mirror se solicitado
+    if pingpong:
+        apply_pingpong(frames_dir)
+    elif mirror:
+        apply_mirror(frames_dir, jobs)
+    
+    # Step 4: Criar atlas
+    result = create_atlas_from_frames(frames_dir, output_name, output_dir, dedupe_tolerance, encoding)
+    
+    # Limpar arquivos temporários
+    if os.path.exists(temp_dir):
+        shutil.rmtree(temp_dir)
+        print(f"\nArquivos temporários removidos.")
+    
+    return result
+
+
+def mp4_to_atlas(video_path, output_name, threshold=30, max_frames=20, output_dir='images/objects', mask_region=None, pingpong=False, mirror=False, stream=True, dedupe_tolerance=0, jobs=1, formats=(), quality=DEFAULT_QUALITY, alpha_quality=DEFAULT_ALPHA_QUALITY, palette=False, palette_error=DEFAULT_PALETTE_ERROR, max_size=None, tiers=(), force=False, frame_cache=FRAME_CACHE_DIR):
+    """
+    Pipeline completo: MP4 -> Frames -> Remove fundo -> Atlas PNG + JSON
+    
+    Args:
+        mask_region: Região a mascarar (logo/marca d'água): retângulo (x1, y1, x2, y2),
+                     lista de retângulos, polígonos e imagens de máscara, ou o
+                     texto do --mask (ver chroma_key.parse_mask)
+        pingpong: Se True, duplica frames em ordem reversa (vai e volta)
+        mirror: Se True, duplica frames espelhados horizontalmente
+        stream: Se True, recebe os frames do ffmpeg por pipe e processa tudo em
+                memória; se False, usa um diretório temporário de PNGs
+        dedupe_tolerance: Diferença média por canal (0-255) para considerar dois
+                          frames iguais; 0 = só frames idênticos
+        jobs: Número de processos para remoção de fundo e espelhamento
+        formats: Codificações extras do atlas ao lado do PNG, ex: ["webp", "avif"]
+                 (ver image_formats.py); o JSON lista todas em meta.variants
+        quality: Qualidade das codificações com perdas (0-100)
+        alpha_quality: Qualidade do alpha no WebP com perdas (0-100)
+        palette: Grava o PNG indexado (uma paleta para o atlas inteiro) se o
+                 erro médio por canal ficar em até palette_error; senão, RGBA
+        max_size: Lado máximo de cada textura (ex: 4096); se o atlas não couber,
+                  os frames são divididos em páginas (JSON multiatlas do Phaser)
+        tiers: Escalas das camadas reduzidas, ex: [0.5] gera também
+               nome_atlas@0.5x.png/json (ver frame_pipeline.write_atlas)
+        force: Refaz o atlas mesmo se o vídeo, os parâmetros e o código não
+               mudaram desde a última execução (ver build_cache.py)
+        frame_cache: Pasta do cache de frames decodificados (None = sem cache;
+                     só no modo em memória, ver frame_cache.py)
+    """
+    print("=" * 70)
+    print("MP4 TO ATLAS - Converte vídeo para sprite atlas com transparência")
+    print("=" * 70)
+    print(f"\nEntrada: {video_path}")
+    print(f"Saída: {output_name}_atlas.png/json")
+    print(f"Tolerância de fundo: {threshold}")
+    print(f"Máximo de frames: {max_frames}")
+    if mask_shapes(mask_region):
+        print(f"Máscara (logo): {describe_mask(mask_region)}")
+    if pingpong:
+        print("Modo: Ping-pong (vai e volta)")
+    if mirror:
+        print("Modo: Mirror (espelhado)")
+    if dedupe_tolerance:
+        print(f"Tolerância de frames repetidos: {dedupe_tolerance}")
+    if jobs > 1:
+        print(f"Processos: {jobs}")
+    if formats:
+        print(f"Formatos extras: {', '.join(formats)} (qualidade {quality}, alpha {alpha_quality})")
+    if palette:
+        print(f"PNG indexado: erro médio máximo {palette_error}")
+    if max_size:
+        print(f"Textura máxima: {max_size}x{max_size}")
+    if tiers:
+        print(f"Camadas extras: {', '.join(f'@{t:g}x' for t in tiers)}")
+    print("=" * 70)
+    
+    encoding = {"formats": list(formats), "quality": quality, "alpha_quality": alpha_quality,
+                "palette": palette, "palette_error": palette_error, "max_size": max_size,
+                "tiers": list(tiers)}
+    
+    def build():
+        # Verificar se ffmpeg está disponível
+        try:
+            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        except FileNotFoundError:
+            print("\nERRO: ffmpeg não encontrado!")
+            print("Instale ffmpeg: https://ffmpeg.org/download.html")
+            print("Windows: choco install ffmpeg")
+            return None
+        
+        if stream:
+            return _mp4_to_atlas_in_memory(video_path, output_name, threshold, max_frames, output_dir,
+                                           mask_region, pingpong, mirror, dedupe_tolerance, jobs, encoding,
+                                           frame_cache)
+        return _mp4_to_atlas_on_disk(video_path, output_name, threshold, max_frames, output_dir,
+                                     mask_region, pingpong, mirror, dedupe_tolerance, jobs, encoding)
+    
+    # Só refazer se o vídeo, os parâmetros ou o código mudaram (stream, jobs e
+    # frame_cache não mudam o resultado, então não entram na chave)
+    params = {
+        "output_name": output_name,
+        "threshold": threshold,
+        "max_frames": max_frames,
+        "mask_region": mask_params(mask_region),
+        "pingpong": pingpong,
+        "mirror": mirror,
+        "dedupe_tolerance": dedupe_tolerance,
+        **encoding
+    }
+    png_path = os.path.join(output_dir, f"{output_name}_atlas.png")
+    outputs = atlas_outputs(png_path, formats, tiers)
+    result = cached_build("mp4-to-atlas", [video_path] + mask_files(mask_region), params, outputs, build, force=force,
+                          version_files=[__file__, "atlas_packer.py", "chroma_key.py", "frame_pipeline.py",
+                                         "image_formats.py"])
+    
+    if result:
+        print("\n" + "=" * 70)
+        print("SUCESSO!")
+        print(f"  Frames: {result['frames']} ({result['unique_frames']} únicos no atlas)")
+        print(f"  Tamanho: {result['size']}")
+        print("=" * 70)
+    
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("=" * 70)
+        print("MP4 TO ATLAS - Converte vídeo para sprite atlas com transparência")
+        print("=" * 70)
+        print("\nUso: python mp4-to-atlas.py <video.mp4> <output_name> [tolerancia] [max_frames] [opções]")
+        print("\nExemplos:")
+        print("  python mp4-to-atlas.py fogo.mp4 fogo")
+        print("  python mp4-to-atlas.py efeito.mp4 efeito 30 20")
+        print("  python mp4-to-atlas.py ghost.mp4 ghost 30 20 --mask 700,400,864,480")
+        print("  python mp4-to-atlas.py ghost.mp4 ghost 30 20 --pingpong")
+        print("  python mp4-to-atlas.py ghost.mp4 ghost 30 20 --mirror")
+        print("\nParâmetros:")
+        print("  video.mp4   : Vídeo de entrada")
+        print("  output_name : Nome base para os arquivos de saída")
+        print("  tolerancia  : Tolerância de cor para remoção de fundo (padrão: 30)")
+        print("  max_frames  : Número máximo de frames no atlas (padrão: 20)")
+        print("\nOpções:")
+        print("  --mask x1,y1,x2,y2 : Região retangular a mascarar (logo/marca d'água); pode repetir.")
+        print("                       Aceita também polígonos (x1,y1,x2,y2,x3,y3,...), imagens de")
+        print("                       máscara (logo_mask.png, branco = mascarado) e formas separadas por ';'")
+        print("  --pingpong         : Duplica frames em ordem reversa (vai e volta)")
+        print("  --mirror           : Duplica frames espelhados (ida e volta com flip)")
+        print("  --disk             : Usa diretório temporário de PNGs em vez do pipe em memória")
+        print("  --no-frame-cache   : Não usa o cache de frames decodificados (sempre roda o ffmpeg)")
+        print("  --dedupe-tolerance N : Junta frames quase iguais (diferença média por canal <= N)")
+        print("  --jobs N           : Processa os frames em N processos (0 = todos os núcleos)")
+        print("  --force            : Refaz o atlas mesmo se nada mudou desde a última execução")
+        print("  --formats webp,avif : Grava também o atlas em WebP/AVIF (webp, webp-lossless, avif)")
+        print("  --quality N        : Qualidade do WebP/AVIF com perdas (padrão: 80)")
+        print("  --alpha-quality N  : Qualidade do alpha no WebP com perdas (padrão: 90)")
+        print("  --palette          : Grava o PNG indexado (até 256 cores) se a perda for pequena")
+        print("  --palette-error N  : Erro médio por canal aceito no PNG indexado (padrão: 2)")
+        print("  --max-size N       : Lado máximo da textura; divide o atlas em páginas (ex: 4096)")
+        print("  --tiers 0.5,0.25   : Gera também camadas reduzidas (nome_atlas@0.5x.png/json, ...)")
+        print("\nPara selecionar a região da logo interativamente:")
+        print("  python select-mask-region.py video.mp4")
+        print("\nRequisitos:")
+        print("  - ffmpeg instalado e no PATH")
+        print("  - Pillow e numpy (pip install Pillow numpy)")
+        print("=" * 70)
+    else:
+        video_path = sys.argv[1]
+        output_name = sys.argv[2]
+        
+        threshold = 30
+        max_frames = 20
+        mask_region = None
+        pingpong = False
+        mirror = False
+        stream = True
+        frame_cache = FRAME_CACHE_DIR
+        dedupe_tolerance = 0
+        force = False
+        formats = []
+        quality = DEFAULT_QUALITY
+        alpha_quality = DEFAULT_ALPHA_QUALITY
+        palette = False
+        palette_error = DEFAULT_PALETTE_ERROR
+        max_size = None
+        tiers = []
+        
+        # Parse argumentos posicionais e opcionais
+        jobs, args = parse_jobs_arg(sys.argv[3:])
+        i = 0
+        pos_idx = 0  # Índice para argumentos posicionais
+        while i < len(args):
+            if args[i] == '--mask' and i + 1 < len(args):
+                try:
+                    mask_region = (mask_region or []) + parse_mask(args[i + 1])
+                    print(f"Máscara configurada: {describe_mask(mask_region)}")
+                except ValueError as e:
+                    print(f"Aviso: Máscara inválida '{args[i + 1]}' ({e}). Use: x1,y1,x2,y2")
+                i += 2
+            elif args[i] == '--pingpong':
+                pingpong = True
+                i += 1
+            elif args[i] == '--mirror':
+                mirror = True
+                i += 1
+            elif args[i] == '--disk':
+                stream = False
+                i += 1
+            elif args[i] == '--no-frame-cache':
+                frame_cache = None
+                i += 1
+            elif args[i] == '--force':
+                force = True
+                i += 1
+            elif args[i] == '--formats' and i + 1 < len(args):
+                try:
+                    formats = parse_formats(args[i + 1])
+                except ValueError as e:
+                    print(f"ERRO: {e}")
+                    sys.exit(1)
+                i += 2
+            elif args[i] in ('--quality', '--alpha-quality') and i + 1 < len(args):
+                try:
+                    if args[i] == '--quality':
+                        quality = int(args[i + 1])
+                    else:
+                        alpha_quality = int(args[i + 1])
+                except ValueError:
+                    print(f"Aviso: Qualidade '{args[i + 1]}' inválida. Usando o padrão.")
+                i += 2
+            elif args[i] == '--palette':
+                palette = True
+                i += 1
+            elif args[i] == '--palette-error' and i + 1 < len(args):
+                palette = True
+                try:
+                    palette_error = float(args[i + 1])
+                except ValueError:
+                    print(f"Aviso: Erro de paleta '{args[i + 1]}' inválido. Usando {DEFAULT_PALETTE_ERROR}.")
+                i += 2
+            elif args[i] == '--max-size' and i + 1 < len(args):
+                try:
+                    max_size = int(args[i + 1])
+                except ValueError:
+                    print(f"Aviso: Tamanho máximo '{args[i + 1]}' inválido. Sem limite.")
+                i += 2
+            elif args[i] == '--tiers' and i + 1 < len(args):
+                try:
+                    tiers = [1 / factor for factor in parse_tiers(args[i + 1])]
+                except ValueError as e:
+                    print(f"ERRO: {e}")
+                    sys.exit(1)
+                i += 2
+            elif args[i] == '--dedupe-tolerance' and i + 1 < len(args):
+                try:
+                    dedupe_tolerance = float(args[i + 1])
+                except ValueError:
+                    print(f"Aviso: Tolerância de repetição '{args[i + 1]}' inválida. Usando 0.")
+                i += 2
+            else:
+                # Argumentos posicionais: threshold e max_frames
+                if pos_idx == 0:
+                    try:
+                        threshold = int(args[i])
+                    except ValueError:
+                        print(f"Aviso: Tolerância '{args[i]}' inválida. Usando padrão 30.")
+                elif pos_idx == 1:
+                    try:
+                        max_frames = int(args[i])
+                    except ValueError:
+                        print(f"Aviso: Max frames '{args[i]}' inválido. Usando padrão 20.")
+                pos_idx += 1
+                i += 1
+        
+        mp4_to_atlas(video_path, output_name, threshold, max_frames, mask_region=mask_region, pingpong=pingpong, mirror=mirror, stream=stream, dedupe_tolerance=dedupe_tolerance, jobs=jobs, formats=formats, quality=quality, alpha_quality=alpha_quality, palette=palette, palette_error=palette_error, max_size=max_size, tiers=tiers, force=force, frame_cache=frame_cache)
+
+
@@ -1,66 +1,289 @@
+"""
+Optimize the images/ tree (resize + re-encode) with per-directory policies.
+
+Policies come from a JSON config (default: tools/optimize_images.json):
+a "default" policy plus overrides per directory, relative to the image dir
+(the deepest matching directory wins). Policy keys: max_width, max_height,
+quality, min_size_kb, skip, and for JPEGs target_ssim, max_kb, min_quality
+and max_quality.
+
+With target_ssim and/or max_kb, the JPEG quality is searched per image
+instead of using the fixed quality: the lowest quality that reaches the
+target SSIM (measured on a downscaled proxy) and/or the highest one that
+fits in max_kb (see quality_search.py).
+
+Every processed file is recorded in a manifest (.optimize-cache.json in the
+image dir): source hash -> output hash, plus the policy used. Files whose
+current content is the recorded output for the same policy are skipped
+without being re-read (hashes are memoized by size + mtime, see
+build_cache.py), so re-running after small edits only touches the edited
+files. Originals are copied to the backup dir once; when a policy changes,
+the file is re-encoded from its backup instead of from the already
+optimized copy.
+
+Usage: python optimize_images.py [image_dir] [--config file.json] [--jobs N] [--dry-run]
+
+Requirements: pip install Pillow
+"""
+
+import json
 import os
-from PIL import Image
 import shutil
+import sys
+
+from PIL import Image
+
+from build_cache import file_hash, load_manifest, save_manifest
+from frame_pool import map_items, parse_jobs_arg
+from quality_search import search_quality
 
 # Configuration
-IMAGE_DIR = 'c:/src/codex.oblitus/images'
-BACKUP_DIR = 'c:/src/codex.oblitus/images_backup'
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.normpath(os.path.join(TOOLS_DIR, '..', 'images'))
+CONFIG_PATH = os.path.join(TOOLS_DIR, 'optimize_images.json')
+MANIFEST_NAME = '.optimize-cache.json'
 MAX_WIDTH = 1920
 MAX_HEIGHT = 1080
 QUALITY = 80
 MIN_SIZE_KB = 500  # Only optimize files larger than 500KB
 
-def optimize_images():
-    # Create backup directory
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
-        print(f"Created backup directory: {BACKUP_DIR}")
+DEFAULT_POLICY = {
+    "max_width": MAX_WIDTH,
+    "max_height": MAX_HEIGHT,
+    "quality": QUALITY,
+    "min_size_kb": MIN_SIZE_KB,
+    "skip": False,
+    "target_ssim": None,
+    "max_kb": None,
+    "min_quality": 40,
+    "max_quality": 95
+}
+
+
+def load_config(config_path=CONFIG_PATH):
+    """
+    Load the policy config. A missing file means the default policy everywhere.
+    """
+    if not config_path or not os.path.exists(config_path):
+        return {"default": {}, "directories": {}}
+    with open(config_path) as f:
+        config = json.load(f)
+    config.setdefault("default", {})
+    config.setdefault("directories", {})
+    return config
+
+
+def policy_for(rel_path, config):
+    """
+    Effective policy for a file (path relative to the image dir): defaults,
+    then the config default, then each matching directory from shallow to deep.
+    """
+    policy = dict(DEFAULT_POLICY)
+    policy.update(config["default"])
+
+    parts = rel_path.replace(os.sep, '/').split('/')[:-1]
+    for depth in range(1, len(parts) + 1):
+        override = config["directories"].get('/'.join(parts[:depth]))
+        if override:
+            policy.update(override)
+    return policy
+
+
+def _policy_key(policy):
+    return json.dumps(policy, sort_keys=True)
+
+
+def _optimize_file(task):
+    """
+    Backup (if needed), resize and re-encode one file. Runs in a worker process.
+    """
+    file_path, source_path = task["path"], task["source"]
+    policy = task["policy"]
+    report = {"rel": task["rel"], "old_kb": os.path.getsize(file_path) / 1024, "resized": None,
+              "quality": policy["quality"], "ssim": None, "error": None}
+
+    try:
+        # Backup
+        if task["backup"]:
+            os.makedirs(os.path.dirname(task["backup_path"]), exist_ok=True)
+            shutil.copy2(file_path, task["backup_path"])
+
+        # Optimize
+        with Image.open(source_path) as img:
+            # Convert to RGB if needed (e.g. RGBA pngs saving as jpg, or just for consistency)
+            if img.mode in ('RGBA', 'P') and file_path.lower().endswith(('.jpg', '.jpeg')):
+                img = img.convert('RGB')
+
+            # Resize if too big
+            width, height = img.size
+            if width > policy["max_width"] or height > policy["max_height"]:
+                img.thumbnail((policy["max_width"], policy["max_height"]), Image.Resampling.LANCZOS)
+                report["resized"] = (width, height, img.size[0], img.size[1])
+
+            # Choose the quality (JPEG only; PNG is lossless)
+            if file_path.lower().endswith(('.jpg', '.jpeg')) and (policy["target_ssim"] or policy["max_kb"]):
+                chosen = search_quality(
+                    img, target_ssim=policy["target_ssim"],
+                    max_bytes=policy["max_kb"] * 1024 if policy["max_kb"] else None,
+                    min_quality=policy["min_quality"], max_quality=policy["max_quality"])
+                report["quality"], report["ssim"] = chosen["quality"], chosen["ssim"]
+
+            # Save
+            img.save(file_path, optimize=True, quality=report["quality"])
+    except Exception as e:
+        report["error"] = str(e)
+        return report
 
-    # Walk through directory
-    for root, dirs, files in os.walk(IMAGE_DIR):
-        # Skip backup dir itself if it's inside (it isn't based on path, but good practice)
-        if 'images_backup' in root:
+    report["new_kb"] = os.path.getsize(file_path) / 1024
+    return report
+
+
+def plan_optimization(image_dir, config, manifest):
+    """
+    Decide what to do with each image.
+
+    Returns:
+        Tuple (tasks for _optimize_file, number of up-to-date files, number
+        of unreadable files). Files that don't need optimizing under their
+        policy are recorded in the manifest right away.
+    """
+    backup_dir = os.path.join(os.path.dirname(image_dir), config.get("backup_dir", "images_backup"))
+    backup_dir = os.path.normpath(backup_dir)
+    tasks = []
+    up_to_date = 0
+    errors = 0
+
+    # Walk through directory (sorted, so runs are reproducible)
+    for root, dirs, files in os.walk(image_dir):
+        # Skip backup dir itself if it's inside
+        dirs[:] = sorted(d for d in dirs if os.path.normpath(os.path.join(root, d)) != backup_dir)
+
+        for file in sorted(files):
+            if not file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                continue
+
+            file_path = os.path.join(root, file)
+            rel = os.path.relpath(file_path, image_dir).replace(os.sep, '/')
+            policy = policy_for(rel, config)
+            if policy["skip"]:
+                continue
+
+            pkey = _policy_key(policy)
+            digest = file_hash(file_path, manifest, image_dir)
+            entry = manifest["entries"].get(rel)
+
+            # Already optimized with this policy
+            if entry and entry["policy"] == pkey and digest == entry["output_sha1"]:
+                up_to_date += 1
+                continue
+
+            backup_path = os.path.join(backup_dir, rel)
+            source, source_sha1, backup = file_path, digest, True
+            if entry and digest == entry["output_sha1"] and os.path.exists(backup_path) \
+                    and file_hash(backup_path, manifest, image_dir) == entry["source_sha1"]:
+                # Policy changed: start again from the original
+                source, source_sha1, backup = backup_path, entry["source_sha1"], False
+
+            try:
+                with Image.open(source) as img:
+                    width, height = img.size
+            except (OSError, Image.UnidentifiedImageError) as e:
+                errors += 1
+                print(f"  Error reading {rel}: {e}")
+                continue
+            too_big = width > policy["max_width"] or height > policy["max_height"]
+            if os.path.getsize(source) / 1024 <= policy["min_size_kb"] and not too_big:
+                manifest["entries"][rel] = {"policy": pkey, "source_sha1": source_sha1, "output_sha1": digest}
+                up_to_date += 1
+                continue
+
+            tasks.append({
+                "path": file_path,
+                "rel": rel,
+                "source": source,
+                "source_sha1": source_sha1,
+                "backup": backup,
+                "backup_path": backup_path,
+                "policy": policy,
+                "policy_key": pkey
+            })
+
+    return tasks, up_to_date, errors
+
+
+def optimize_images(image_dir=IMAGE_DIR, config_path=CONFIG_PATH, jobs=1, dry_run=False):
+    """
+    Optimize every image that changed since the last run (see module docstring).
+
+    Returns:
+        Dict with optimized, up_to_date, errors and saved_kb
+    """
+    image_dir = os.path.normpath(image_dir)
+    config = load_config(config_path)
+    manifest_path = os.path.join(image_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+
+    tasks, up_to_date, errors = plan_optimization(image_dir, config, manifest)
+    print(f"{len(tasks)} file(s) to optimize, {up_to_date} up to date"
+          + (f", {errors} unreadable" if errors else ""))
+
+    if dry_run:
+        for task in tasks:
+            policy = task["policy"]
+            if policy["target_ssim"] or policy["max_kb"]:
+                quality = f"SSIM >= {policy['target_ssim']}" if policy["target_ssim"] else f"<= {policy['max_kb']} KB"
+            else:
+                quality = f"quality {policy['quality']}"
+            print(f"  {task['rel']} ({quality}, max {policy['max_width']}x{policy['max_height']})")
+        return {"optimized": 0, "up_to_date": up_to_date, "errors": errors, "saved_kb": 0}
+
+    saved_total = 0
+    optimized = 0
+    for task, report in zip(tasks, map_items(_optimize_file, tasks, jobs)):
+        if report["error"]:
+            errors += 1
+            print(f"  Error optimizing {report['rel']}: {report['error']}")
             continue
 
-        for file in files:
-            if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                file_path = os.path.join(root, file)
-                file_size_kb = os.path.getsize(file_path) / 1024
-
-                # Check if optimization is needed
-                if file_size_kb > MIN_SIZE_KB:
-                    print(f"Optimizing: {file} ({file_size_kb:.2f} KB)...")
-                    
-                    # Backup
-                    rel_path = os.path.relpath(root, IMAGE_DIR)
-                    backup_subdir = os.path.join(BACKUP_DIR, rel_path)
-                    if not os.path.exists(backup_subdir):
-                        os.makedirs(backup_subdir)
-                    
-                    shutil.copy2(file_path, os.path.join(backup_subdir, file))
-
-                    # Optimize
-                    try:
-                        with Image.open(file_path) as img:
-                            # Convert to RGB if needed (e.g. RGBA pngs saving as jpg, or just for consistency)
-                            if img.mode in ('RGBA', 'P') and file.lower().endswith('.jpg'):
-                                img = img.convert('RGB')
-                            
-                            # Resize if too big
-                            width, height = img.size
-                            if width > MAX_WIDTH or height > MAX_HEIGHT:
-                                img.thumbnail((MAX_WIDTH, MAX_HEIGHT), Image.Resampling.LANCZOS)
-                                print(f"  Resized from {width}x{height} to {img.size[0]}x{img.size[1]}")
-                            
-                            # Save
-                            img.save(file_path, optimize=True, quality=QUALITY)
-                            
-                            new_size_kb = os.path.getsize(file_path) / 1024
-                            saved_kb = file_size_kb - new_size_kb
-                            print(f"  Done! New size: {new_size_kb:.2f} KB (Saved {saved_kb:.2f} KB)")
-
-                    except Exception as e:
-                        print(f"  Error optimizing {file}: {e}")
+        print(f"Optimized: {report['rel']} ({report['old_kb']:.2f} KB)...")
+        if report["resized"]:
+            print("  Resized from {}x{} to {}x{}".format(*report["resized"]))
+        saved_kb = report["old_kb"] - report["new_kb"]
+        optimized += 1
+        saved_total += saved_kb
+        if task["rel"].lower().endswith(('.jpg', '.jpeg')):
+            ssim_note = f", SSIM {report['ssim']:.4f}" if report["ssim"] is not None else ""
+            print(f"  Quality {report['quality']}{ssim_note}")
+        print(f"  Done! New size: {report['new_kb']:.2f} KB (Saved {saved_kb:.2f} KB)")
+
+        manifest["entries"][task["rel"]] = {
+            "policy": task["policy_key"],
+            "source_sha1": task["source_sha1"],
+            "output_sha1": file_hash(task["path"], manifest, image_dir)
+        }
+
+    save_manifest(manifest_path, manifest)
+    print(f"\n{optimized} optimized, {up_to_date} up to date, {errors} error(s), "
+          f"saved {saved_total:.2f} KB")
+    return {"optimized": optimized, "up_to_date": up_to_date, "errors": errors, "saved_kb": saved_total}
+
 
 if __name__ == "__main__":
-    optimize_images()
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    config_path = CONFIG_PATH
+    dry_run = False
+    image_dir = IMAGE_DIR
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--config' and i + 1 < len(args):
+            config_path = args[i + 1]
+            i += 2
+        elif args[i] == '--dry-run':
+            dry_run = True
+            i += 1
+        else:
+            image_dir = args[i]
+            i += 1
+
+    optimize_images(image_dir, config_path, jobs, dry_run)
@@ -0,0 +1,169 @@
+"""
+Busca de qualidade JPEG por imagem: a menor qualidade que atinge um SSIM
+alvo, ou a maior que cabe num orçamento de bytes.
+
+A busca é binária, mas com vários candidatos por rodada (busca k-ária):
+os candidatos de cada rodada são codificados em paralelo (threads; o
+encoder do Pillow libera o GIL) e o intervalo encolhe para entre os dois
+candidatos vizinhos da fronteira. Para o SSIM, os candidatos são codificados
+numa cópia reduzida da imagem (proxy), bem mais barata que a original.
+
+SSIM calculado sobre a luminância com janela uniforme 7x7 (como o padrão do
+scikit-image), sem dependências além de numpy.
+
+Requisitos: pip install Pillow numpy
+"""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+
+# Maior lado da cópia reduzida usada para medir o SSIM
+PROXY_SIZE = 512
+# Candidatos codificados em paralelo por rodada
+SEARCH_WORKERS = 4
+
+SSIM_WINDOW = 7
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def _box_mean(data, size):
+    """
+    Média em janela size x size (só posições em que a janela cabe inteira),
+    via imagem integral.
+    """
+    integral = np.pad(data, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = (integral[size:, size:] - integral[:-size, size:]
+            - integral[size:, :-size] + integral[:-size, :-size])
+    return sums / (size * size)
+
+
+def ssim(img_a, img_b, window=SSIM_WINDOW):
+    """
+    SSIM médio entre duas imagens do mesmo tamanho (na luminância).
+
+    Returns:
+        Float em [-1, 1]; 1 = idênticas
+    """
+    a = np.asarray(img_a.convert("L"), dtype=np.float64)
+    b = np.asarray(img_b.convert("L"), dtype=np.float64)
+    window = min(window, a.shape[0], a.shape[1])
+
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    # Variâncias com correção amostral, como o scikit-image
+    norm = window * window / (window * window - 1) if window > 1 else 1
+    var_a = (_box_mean(a * a, window) - mu_a * mu_a) * norm
+    var_b = (_box_mean(b * b, window) - mu_b * mu_b) * norm
+    cov = (_box_mean(a * b, window) - mu_a * mu_b) * norm
+
+    numerator = (2 * mu_a * mu_b + _C1) * (2 * cov + _C2)
+    denominator = (mu_a * mu_a + mu_b * mu_b + _C1) * (var_a + var_b + _C2)
+    return float((numerator / denominator).mean())
+
+
+def encode_jpeg(img, quality):
+    """
+    Codifica a imagem como JPEG (optimize=True) e devolve os bytes.
+    """
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def make_proxy(img, size=PROXY_SIZE):
+    """
+    Cópia RGB reduzida (maior lado <= size) para medir o SSIM dos candidatos.
+    """
+    proxy = img.convert("RGB")
+    if max(proxy.size) > size:
+        proxy = proxy.copy()
+        proxy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return proxy
+
+
+def _first_accepted(candidates, measure, accept, workers):
+    """
+    Primeiro candidato aceito numa lista ordenada em que accept é
+    False...False True...True (monótono).
+
+    Cada rodada mede até `workers` candidatos espalhados pelo intervalo, em
+    paralelo, e continua entre o último recusado e o primeiro aceito.
+
+    Returns:
+        Tupla (candidato, medida), ou (None, None) se nenhum for aceito
+    """
+    measured = {}
+    lo, hi = 0, len(candidates) - 1
+    best = None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while lo <= hi:
+            count = min(workers, hi - lo + 1)
+            points = sorted({lo + (hi - lo) * (i + 1) // (count + 1) for i in range(count)})
+            if count == hi - lo + 1:
+                points = list(range(lo, hi + 1))
+            todo = [p for p in points if p not in measured]
+            for p, value in zip(todo, executor.map(lambda p: measure(candidates[p]), todo)):
+                measured[p] = value
+
+            first = next((p for p in points if accept(measured[p])), None)
+            if first is None:
+                lo = points[-1] + 1
+            else:
+                best = first
+                previous = [p for p in points if p < first]
+                lo = previous[-1] + 1 if previous else lo
+                hi = first - 1
+
+    if best is None:
+        return None, None
+    return candidates[best], measured[best]
+
+
+def search_quality(img, target_ssim=None, max_bytes=None, min_quality=40, max_quality=95,
+                   proxy_size=PROXY_SIZE, workers=SEARCH_WORKERS):
+    """
+    Escolhe a qualidade JPEG de uma imagem.
+
+    Com target_ssim: a menor qualidade em [min_quality, max_quality] cujo SSIM
+    (medido no proxy) é >= target_ssim; se nenhuma atingir, max_quality.
+    Com max_bytes: a maior qualidade cujo arquivo (imagem inteira) cabe em
+    max_bytes; se nenhuma couber, min_quality. Com os dois, vale a menor das
+    duas qualidades.
+
+    Returns:
+        Dicionário com quality, ssim (no proxy, na qualidade escolhida, se
+        medido) e bytes (se medido)
+    """
+    qualities = list(range(min_quality, max_quality + 1))
+    chosen = {"quality": max_quality, "ssim": None, "bytes": None}
+
+    if target_ssim is not None:
+        proxy = make_proxy(img, proxy_size)
+
+        def measure_ssim(quality):
+            return ssim(proxy, Image.open(io.BytesIO(encode_jpeg(proxy, quality))))
+
+        quality, score = _first_accepted(qualities, measure_ssim, lambda s: s >= target_ssim, workers)
+        if quality is None:
+            quality, score = max_quality, measure_ssim(max_quality)
+        chosen.update(quality=quality, ssim=score)
+
+    if max_bytes is not None:
+        # Do maior para o menor: o primeiro que cabe é o de maior qualidade
+        allowed = [q for q in reversed(qualities) if q <= chosen["quality"]]
+        quality, size = _first_accepted(allowed, lambda q: len(encode_jpeg(img, q)),
+                                        lambda n: n <= max_bytes, workers)
+        if quality is None:
+            quality, size = min_quality, len(encode_jpeg(img, min_quality))
+        if target_ssim is not None and quality != chosen["quality"]:
+            # O orçamento baixou a qualidade: o SSIM tem que ser o dessa qualidade
+            chosen["ssim"] = measure_ssim(quality)
+        chosen.update(quality=quality, bytes=size)
+
+    return chosen
@@ -1,9 +1,11 @@
-import cv2
 import os
-import tkinter as tk
-from tkinter import filedialog
 
 def main():
+    # OpenCV e tkinter só são carregados quando a ferramenta roda de fato
+    import cv2
+    import tkinter as tk
+    from tkinter import filedialog
+
     # 1. Configurar Tkinter para não mostrar a janela principal, apenas os diálogos
     root = tk.Tk()
     root.withdraw()
@@ -0,0 +1,168 @@
+from PIL import Image
+import os
+import sys
+
+from animation_encoder import GIF_COLORS, animation_format, save_animation
+from chroma_key import detect_bg_color, key_background
+from frame_pipeline import gif_frames
+from frame_pool import map_frames, parse_jobs_arg
+from media_info import read_gif_header
+
+def remover_fundo_gif(input_path, output_path, threshold=10, jobs=1, quality=None, colors=GIF_COLORS):
+    """
+    Remove o fundo de um GIF animado, processando cada frame.
+
+    A saída pode ser GIF (paleta global e só a parte alterada de cada frame),
+    APNG (.png/.apng) ou WebP animado (.webp); ver animation_encoder.py. As
+    durações e as repetições de cada frame vêm do GIF original.
+
+    Args:
+        input_path: Caminho do GIF de entrada
+        output_path: Caminho da animação de saída (com transparência)
+        threshold: Tolerância para cores similares ao fundo (padrão: 10)
+        jobs: Número de processos para remover o fundo (padrão: 1)
+        quality: Qualidade do WebP com perdas (padrão: None = sem perdas)
+        colors: Cores da paleta global do GIF (padrão: 255)
+
+    Returns:
+        Dicionário com output_path, frames, format e size, ou None em caso de erro
+    """
+    try:
+        animation_format(output_path)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+
+    try:
+        # Abrir o GIF
+        gif = Image.open(input_path)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{input_path}' não encontrado.")
+        return
+    except Exception as e:
+        print(f"Erro ao abrir GIF: {e}")
+        return
+
+    # Informações do GIF
+    try:
+        num_frames = gif.n_frames
+    except AttributeError:
+        print("Erro: Não é um GIF animado.")
+        return
+
+    # Durações e repetições direto dos blocos do GIF
+    header = read_gif_header(input_path)
+    durations = [frame["delay_ms"] or 100 for frame in header["frame_info"]][:num_frames]
+    durations += [100] * (num_frames - len(durations))  # Duração padrão 100ms se não especificada
+
+    print(f"GIF com {num_frames} frames")
+    print(f"Tamanho: {gif.size}")
+
+    # Detectar cor de fundo do primeiro frame (canto superior esquerdo)
+    gif.seek(0)
+    bg_color = detect_bg_color(gif)  # RGB apenas
+
+    print(f"Cor de fundo detectada (R,G,B): {bg_color}")
+    print(f"Processando frames ({jobs} processo(s))...")
+
+    # Decodificar cada frame em ordem (o GIF depende do frame anterior); os
+    # frames com a paleta do primeiro ficam em modo P
+    gif.close()
+    frames = list(gif_frames(input_path, keep_palette=True))
+
+    # Remover o fundo (frame inteiro de uma vez). Com paleta, o teste é feito
+    # por cor da paleta e não compensa dividir entre processos
+    if all(frame.mode == 'P' for frame in frames):
+        print("  Frames com paleta única: chroma key feito nas cores da paleta")
+        frames_processados = [key_background(frame, bg_color, threshold, mode='max') for frame in frames]
+    else:
+        frames_processados = map_frames(key_background, frames, jobs,
+                                        bg_color=bg_color, threshold=threshold, mode='max')
+    print(f"  Processados {len(frames_processados)}/{num_frames} frames")
+
+    print("\nSalvando animação com transparência...")
+
+    try:
+        loop = header["loop"] if header["loop"] is not None else 0
+        result = save_animation(frames_processados, output_path, durations, loop=loop,
+                                quality=quality, colors=colors)
+
+        print(f"Sucesso! {result['format'].upper()} salvo em '{output_path}'")
+        if result["colors"] is not None:
+            print(f"  Paleta global: {result['colors']} cores")
+        if result["frames"] < num_frames:
+            print(f"  {num_frames - result['frames']} frame(s) repetido(s) juntado(s) ao anterior")
+
+        # Mostrar tamanhos
+        tamanho_original = os.path.getsize(input_path) / 1024
+        tamanho_novo = result["size"] / 1024
+        print(f"\nTamanho original: {tamanho_original:.2f} KB")
+        print(f"Tamanho novo: {tamanho_novo:.2f} KB")
+
+        return {"output_path": output_path, "frames": num_frames,
+                "format": result["format"], "size": result["size"]}
+
+    except Exception as e:
+        print(f"Erro ao salvar animação: {e}")
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    quality = None
+    colors = GIF_COLORS
+    argv = [sys.argv[0]]
+
+    i = 0
+    while i < len(args):
+        if args[i] in ('--quality', '--colors') and i + 1 < len(args):
+            try:
+                value = int(args[i + 1])
+            except ValueError:
+                print(f"Aviso: Valor '{args[i + 1]}' inválido para {args[i]}. Usando padrão.")
+            else:
+                if args[i] == '--quality':
+                    quality = value
+                else:
+                    colors = max(1, min(GIF_COLORS, value))
+            i += 2
+        else:
+            argv.append(args[i])
+            i += 1
+
+    if len(argv) < 3:
+        print("=" * 70)
+        print("REMOVER FUNDO DE GIF ANIMADO")
+        print("=" * 70)
+        print("\nUso: python remove-gif-background.py <entrada.gif> <saida.gif|.png|.webp> [tolerancia]")
+        print("\nExemplos:")
+        print("  python remove-gif-background.py spider.gif spider_no_bg.gif")
+        print("  python remove-gif-background.py spider.gif spider_no_bg.gif 15")
+        print("  python remove-gif-background.py spider.gif spider_no_bg.webp 15")
+        print("\nParâmetros:")
+        print("  entrada.gif : GIF animado de entrada")
+        print("  saida       : Animação de saída (com transparência): .gif, .png/.apng (APNG)")
+        print("                ou .webp (WebP animado)")
+        print("  tolerancia  : Tolerância de cor 0-255 (padrão: 10)")
+        print("                Aumente se o fundo não estiver sendo removido")
+        print("\nOpções:")
+        print("  --jobs N    : Processa os frames em N processos (0 = todos os núcleos)")
+        print("  --colors N  : Cores da paleta global do GIF (padrão: 255; menos = arquivo menor)")
+        print("  --quality N : WebP com perdas, qualidade 0-100 (padrão: sem perdas)")
+        print("=" * 70)
+    else:
+        input_file = argv[1]
+        output_file = argv[2]
+
+        tolerancia = 10
+        if len(argv) > 3:
+            try:
+                tolerancia = int(argv[3])
+            except ValueError:
+                print(f"Aviso: Tolerância '{argv[3]}' inválida. Usando padrão.")
+
+        print(f"\n{'='*70}")
+        print(f"Processando: {input_file}")
+        print(f"Tolerância: {tolerancia}")
+        print(f"{'='*70}\n")
+
+        remover_fundo_gif(input_file, output_file, tolerancia, jobs, quality, colors)
@@ -1,7 +1,10 @@
 from PIL import Image, ImageFilter
 import sys
 
-def remover_fundo_solido(input_path, output_path, threshold=10, remover_borda_branca=True, suavizar_bordas=True):
+from build_cache import cached_build
+from chroma_key import WHITE_HALO_PASSES, key_background, remove_white_halo
+
+def remover_fundo_solido(input_path, output_path, threshold=10, remover_borda_branca=True, suavizar_bordas=True, force=False):
     """
     Transforma o fundo de cor sólida de uma imagem em transparente.
 
@@ -11,7 +14,21 @@ def remover_fundo_solido(input_path, output_path, threshold=10, remover_borda_br
     threshold (int): Tolerância para cores 'semelhantes' ao fundo (padrão: 10).
     remover_borda_branca (bool): Remove bordas brancas/claras automaticamente (padrão: True).
     suavizar_bordas (bool): Aplica transparência gradual nas bordas (padrão: True).
+    force (bool): Refaz a imagem mesmo se a entrada e os parâmetros não mudaram (padrão: False).
     """
+    # Só refazer se a imagem, os parâmetros ou o código mudaram (ver build_cache.py)
+    params = {
+        "threshold": threshold,
+        "remover_borda_branca": remover_borda_branca,
+        "suavizar_bordas": suavizar_bordas
+    }
+    return cached_build("transparencia", [input_path], params, [output_path],
+                        lambda: _remover_fundo_solido(input_path, output_path, threshold,
+                                                      remover_borda_branca, suavizar_bordas),
+                        version_files=[__file__, "chroma_key.py"], force=force)
+
+
+def _remover_fundo_solido(input_path, output_path, threshold, remover_borda_branca, suavizar_bordas):
     try:
         # Abrir a imagem
         img = Image.open(input_path)
@@ -26,48 +43,25 @@ def remover_fundo_solido(input_path, output_path, threshold=10, remover_borda_br
     img = img.convert("RGBA")
     width, height = img.size
 
-    # Obter os dados de todos os pixels da imagem
-    datas = img.getdata()
-
     # Determinar a cor de fundo pegando o primeiro pixel (canto superior esquerdo)
-    bg_color = datas[0]
+    bg_color = img.getpixel((0, 0))
 
     print(f"Cor de fundo detectada (R,G,B,A): {bg_color}")
     print("Processando imagem...")
 
-    # Lista para armazenar os novos dados dos pixels
-    newData = []
-
-    # Iterar por cada pixel
-    for item in datas:
-        # Calcular a diferença de cor em relação ao fundo
-        diff = abs(item[0] - bg_color[0]) + abs(item[1] - bg_color[1]) + abs(item[2] - bg_color[2])
-
-        if diff <= threshold * 3:
-            # Pixel é do fundo - tornar transparente
-            newData.append((item[0], item[1], item[2], 0))
-        elif suavizar_bordas and diff <= threshold * 6:
-            # Pixel está na transição (borda) - aplicar transparência gradual
-            # Quanto mais próximo do fundo, mais transparente
-            alpha = int((diff - threshold * 3) / (threshold * 3) * 255)
-            newData.append((item[0], item[1], item[2], min(255, max(0, alpha))))
-        else:
-            # Pixel é do objeto - manter opaco
-            newData.append(item)
-
-    # Aplicar os novos dados de pixel à imagem
-    img.putdata(newData)
+    # Fundo: soma das diferenças <= 3x tolerância (transparente)
+    # Borda: até 6x tolerância, com transparência gradual se suavizar_bordas
+    # Processa a imagem inteira de uma vez (ver chroma_key.py)
+    img = key_background(img, bg_color, threshold, mode='sum', soft_edges=suavizar_bordas)
 
     # ✅ REMOVER BORDAS BRANCAS (múltiplas passadas para ser mais agressivo)
+    # As 4 passadas compartilham as máscaras intermediárias (ver chroma_key.py)
     if remover_borda_branca:
-        print("Removendo bordas brancas (passada 1/4)...")
-        img = remover_bordas_brancas(img, threshold_branco=200, raio=2)
-        print("Removendo bordas brancas (passada 2/4)...")
-        img = remover_bordas_brancas(img, threshold_branco=180, raio=1)
-        print("Removendo bordas brancas (passada 3/4)...")
-        img = remover_bordas_brancas(img, threshold_branco=160, raio=1)
-        print("Removendo bordas brancas (passada 4/4 - EXTRA AGRESSIVA)...")
-        img = remover_bordas_brancas(img, threshold_branco=140, raio=2)
+        print(f"Removendo bordas brancas ({len(WHITE_HALO_PASSES)} passadas, a última EXTRA AGRESSIVA)...")
+        img, removidos = remove_white_halo(img, WHITE_HALO_PASSES)
+        for i, ((threshold_branco, raio), n) in enumerate(zip(WHITE_HALO_PASSES, removidos)):
+            print(f"  Passada {i + 1}/{len(WHITE_HALO_PASSES)} -> {n} pixels brancos removidos "
+                  f"(threshold={threshold_branco}, raio={raio})")
 
     # Salvar a nova imagem como PNG (que suporta transparência)
     try:
@@ -75,6 +69,9 @@ def remover_fundo_solido(input_path, output_path, threshold=10, remover_borda_br
         print(f"Sucesso! Imagem salva em '{output_path}'")
     except Exception as e:
         print(f"Erro ao salvar a imagem: {e}")
+        return None
+
+    return {"output_path": output_path}
 
 
 def remover_bordas_brancas(img, threshold_branco=220, raio=1):
@@ -89,52 +86,9 @@ def remover_bordas_brancas(img, threshold_branco=220, raio=1):
     Returns:
         Imagem PIL processada
     """
-    width, height = img.size
-    pixels = img.load()
-
-    # Criar uma cópia para não modificar enquanto lê
-    resultado = img.copy()
-    pixels_resultado = resultado.load()
-
-    removidos = 0
-
-    # Percorrer todos os pixels
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-
-            # Se o pixel já é transparente, pular
-            if a < 10:
-                continue
-
-            # Verificar se é um pixel claro/branco (todos os canais RGB altos)
-            is_branco = r >= threshold_branco and g >= threshold_branco and b >= threshold_branco
-
-            if is_branco:
-                # Verificar se está próximo de área transparente
-                tem_transparente_perto = False
-
-                # Verificar vizinhos em um raio maior
-                for dy in range(-raio, raio + 1):
-                    for dx in range(-raio, raio + 1):
-                        nx, ny = x + dx, y + dy
-
-                        # Verificar limites
-                        if 0 <= nx < width and 0 <= ny < height:
-                            _, _, _, na = pixels[nx, ny]
-
-                            # Se algum vizinho é transparente ou semi-transparente
-                            if na < 128:
-                                tem_transparente_perto = True
-                                break
-
-                    if tem_transparente_perto:
-                        break
-
-                # Se tem transparente perto, remover o pixel branco
-                if tem_transparente_perto:
-                    pixels_resultado[x, y] = (r, g, b, 0)
-                    removidos += 1
+    # Uma única passada: dilata a máscara de transparência pelo raio e cruza
+    # com o teste de pixel branco, sem percorrer a vizinhança de cada pixel
+    resultado, (removidos,) = remove_white_halo(img, [(threshold_branco, raio)])
 
     print(f"  -> {removidos} pixels brancos removidos (threshold={threshold_branco}, raio={raio})")
     return resultado
@@ -143,11 +97,14 @@ def remover_bordas_brancas(img, threshold_branco=220, raio=1):
 # --- Como usar o script ---
 if __name__ == "__main__":
     # Verifique se os nomes dos arquivos foram passados como argumentos
-    if len(sys.argv) < 3:
+    force = '--force' in sys.argv[1:]
+    args = [sys.argv[0]] + [a for a in sys.argv[1:] if a != '--force']
+
+    if len(args) < 3:
         print("=" * 70)
         print("SCRIPT PARA REMOVER FUNDO E BORDAS BRANCAS DE IMAGENS")
         print("=" * 70)
-        print("\nUso: python transparencia.py <entrada> <saida> [tolerancia]")
+        print("\nUso: python transparencia.py <entrada> <saida> [tolerancia] [--force]")
         print("\nExemplos:")
         print("  python transparencia.py moeda.jpg moeda_transparente.png")
         print("  python transparencia.py item.jpg item.png 15")
@@ -160,18 +117,19 @@ if __name__ == "__main__":
         print("  saida      : Arquivo de saída PNG")
         print("  tolerancia : Tolerância de cor 0-255 (padrão: 10)")
         print("               Aumente se o fundo não estiver sendo removido")
+        print("  --force    : Refaz a imagem mesmo se nada mudou desde a última execução")
         print("=" * 70)
     else:
-        input_file = sys.argv[1]
-        output_file = sys.argv[2]
+        input_file = args[1]
+        output_file = args[2]
 
         # Opcional: permitir passar a tolerância como terceiro argumento
         tolerancia = 10
-        if len(sys.argv) > 3:
+        if len(args) > 3:
             try:
-                tolerancia = int(sys.argv[3])
+                tolerancia = int(args[3])
             except ValueError:
-                print(f"Aviso: Tolerância '{sys.argv[3]}' inválida. Usando padrão de {tolerancia}.")
+                print(f"Aviso: Tolerância '{args[3]}' inválida. Usando padrão de {tolerancia}.")
 
         print(f"\n{'='*70}")
         print(f"Processando: {input_file}")
@@ -180,4 +138,5 @@ if __name__ == "__main__":
 
         remover_fundo_solido(input_file, output_file, tolerancia,
                            remover_borda_branca=True,
-                           suavizar_bordas=True)
\ No newline at end of file
+                           suavizar_bordas=True,
+                           force=force)
\ No newline at end of file
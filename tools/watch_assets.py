@@ -0,0 +1,318 @@
+"""
+Modo watch: acompanha pastas de fontes e refaz os atlases quando elas mudam.
+
+Cada fonte a gerar tem um arquivo de parâmetros ao lado (sidecar), com o nome
+da fonte + ".asset.json" (ghost.mp4 -> ghost.mp4.asset.json), no mesmo
+formato dos assets do build_assets.py, sem o "source":
+
+    {"tool": "mp4-to-atlas", "params": {"threshold": 30, "max_frames": 20, "mirror": true}}
+
+"tool" e "output" são opcionais: o padrão é mp4-to-atlas para vídeos,
+gif-to-spritesheet para GIFs e transparencia para imagens, com a saída na
+mesma pasta (ghost_atlas.png, spider_spritesheet.png, ...); "output" é
+relativo à pasta do sidecar. O sidecar pode ser também uma lista, para gerar
+mais de um asset da mesma fonte. Fontes sem sidecar são ignoradas.
+
+As ferramentas rodam neste processo, já importadas (sem um interpretador
+novo por build). Mudanças seguidas (o editor gravando várias vezes, um vídeo
+ainda sendo copiado) são agrupadas: o build começa depois de --debounce
+segundos sem mudanças e refaz só os assets afetados (e os que dependem
+deles), até --jobs ao mesmo tempo. Mudou o sidecar, o asset é refeito com os
+parâmetros novos. O que estiver atualizado é pulado (ver build_cache.py).
+
+Uso: python watch_assets.py <pastas...> [--spec spec.json] [--jobs N] [--debounce S] [--interval S]
+
+  pastas       : pastas acompanhadas (recursivamente), ex: images/objects
+  --spec       : especificação do build_assets.py acompanhada junto (pode repetir)
+  --jobs N     : builds ao mesmo tempo (padrão: 1; 0 = todos os núcleos)
+  --debounce S : segundos sem mudanças antes de refazer (padrão: 0.4)
+  --interval S : intervalo entre as verificações, em segundos (padrão: 0.2)
+
+Exemplo:
+  python tools/watch_assets.py images/objects --jobs 2
+
+Ctrl+C encerra (espera o build em andamento terminar).
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from build_assets import TOOLS, asset_sources, build_assets, load_tool, make_assets
+from frame_pool import parse_jobs_arg
+
+SIDECAR_SUFFIX = '.asset.json'
+POLL_INTERVAL = 0.2
+DEBOUNCE = 0.4
+
+# Ferramenta padrão pela extensão da fonte e nome padrão da saída
+DEFAULT_TOOLS = {
+    '.mp4': 'mp4-to-atlas', '.webm': 'mp4-to-atlas', '.mov': 'mp4-to-atlas',
+    '.mkv': 'mp4-to-atlas', '.avi': 'mp4-to-atlas',
+    '.gif': 'gif-to-spritesheet',
+    '.png': 'transparencia', '.jpg': 'transparencia', '.jpeg': 'transparencia',
+}
+DEFAULT_OUTPUTS = {
+    'mp4-to-atlas': '{stem}_atlas.png',
+    'atlas': '{stem}_atlas.png',
+    'gif-to-spritesheet': '{stem}_spritesheet.png',
+    'remove-gif-background': '{stem}_no_bg.gif',
+    'transparencia': '{stem}_no_bg.png',
+}
+
+
+# ---------------------------------------------------------------------------
+# Sidecars
+# ---------------------------------------------------------------------------
+
+def read_sidecar(sidecar_path):
+    """
+    Assets definidos por um sidecar (formato do build_assets.py, com source,
+    tool e output preenchidos).
+
+    Raises:
+        OSError, ValueError: Sidecar ilegível ou inválido
+    """
+    source = sidecar_path[:-len(SIDECAR_SUFFIX)]
+    folder = os.path.dirname(sidecar_path)
+    stem, ext = os.path.splitext(os.path.basename(source))
+
+    with open(sidecar_path) as f:
+        data = json.load(f)
+    items = data if isinstance(data, list) else [data]
+
+    assets = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError(f"{sidecar_path}: cada asset deve ser um objeto JSON")
+        tool = item.get("tool") or DEFAULT_TOOLS.get(ext.lower())
+        if not tool:
+            raise ValueError(f"{sidecar_path}: sem ferramenta padrão para '{ext}'; informe \"tool\"")
+        if tool not in TOOLS:
+            raise ValueError(f"{sidecar_path}: ferramenta desconhecida '{tool}' "
+                             f"(disponíveis: {', '.join(sorted(TOOLS))})")
+        output = item.get("output") or DEFAULT_OUTPUTS.get(tool, '{stem}_' + tool + '.png')
+        output = os.path.join(folder, output.format(stem=stem))
+        assets.append(dict(item, tool=tool, source=source, output=output,
+                           name=item.get("name") or output, sidecar=sidecar_path))
+    return assets
+
+
+def find_sidecars(dirs):
+    """
+    Sidecars nas pastas (recursivamente), em ordem.
+    """
+    found = []
+    for folder in dirs:
+        for root, subdirs, files in os.walk(folder):
+            subdirs.sort()
+            found.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(SIDECAR_SUFFIX))
+    return found
+
+
+def load_assets(dirs, specs):
+    """
+    Assets de todas as especificações e sidecars, validados juntos (as
+    dependências podem cruzar: a saída de um sidecar pode ser a fonte de outro).
+
+    Returns:
+        Tupla (assets, erros); um sidecar ou especificação com erro fica de fora
+    """
+    items, errors = [], []
+    for spec_path in specs:
+        try:
+            with open(spec_path) as f:
+                items.extend(dict(item, spec=spec_path) for item in json.load(f).get("assets", []))
+        except (OSError, ValueError, AttributeError) as e:
+            errors.append(f"{spec_path}: {e}")
+    for sidecar in find_sidecars(dirs):
+        try:
+            items.extend(read_sidecar(sidecar))
+        except (OSError, ValueError) as e:
+            errors.append(f"{sidecar}: {e}")
+
+    assets = make_assets(items)
+    for asset, item in zip(assets, items):
+        asset["origin"] = item.get("sidecar") or item.get("spec")
+        asset["definition"] = json.dumps(item, sort_keys=True)
+    return assets, errors
+
+
+# ---------------------------------------------------------------------------
+# Observação
+# ---------------------------------------------------------------------------
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def watched_paths(dirs, specs, assets):
+    """
+    Arquivos cuja mudança pode pedir um build: sidecars, especificações,
+    fontes e imagens de máscara.
+    """
+    paths = set(find_sidecars(dirs)) | set(specs)
+    for asset in assets:
+        paths.update(asset_sources(asset))
+    return {os.path.abspath(p) for p in paths}
+
+
+def snapshot(paths):
+    return {path: _stat(path) for path in paths}
+
+
+def affected_assets(assets, previous, changed):
+    """
+    Assets a refazer: fonte mudou, definição mudou (ou é nova), e tudo que
+    depende deles.
+    """
+    old = {a["name"]: a["definition"] for a in previous}
+    by_name = {a["name"]: a for a in assets}
+    wanted = {a["name"] for a in assets
+              if any(os.path.abspath(p) in changed for p in asset_sources(a))
+              or old.get(a["name"]) != a["definition"]}
+
+    dependents = {name: [] for name in by_name}
+    for asset in assets:
+        for dep in asset["deps"]:
+            dependents[dep].append(asset["name"])
+    stack = list(wanted)
+    while stack:
+        for child in dependents[stack.pop()]:
+            if child not in wanted:
+                wanted.add(child)
+                stack.append(child)
+    return [a for a in assets if a["name"] in wanted]
+
+
+def _warm_up(assets):
+    """
+    Importa as ferramentas usadas, para o primeiro build não pagar os imports.
+    """
+    for tool in sorted({a["tool"] for a in assets}):
+        load_tool(os.path.splitext(TOOLS[tool]["code"][0])[0])
+
+
+def _run_batch(batch, jobs, reason):
+    start = time.time()
+    print(f"\n[{time.strftime('%H:%M:%S')}] {reason}: {len(batch)} asset(s)")
+    status = build_assets(batch, jobs)
+    summary = ', '.join(f"{name} {result}" for name, result in status.items())
+    print(f"[{time.strftime('%H:%M:%S')}] pronto em {time.time() - start:.2f}s ({summary})")
+    return status
+
+
+def watch(dirs, specs=(), jobs=1, debounce=DEBOUNCE, interval=POLL_INTERVAL):
+    """
+    Acompanha as pastas e especificações e refaz os assets afetados a cada
+    mudança (ver docstring do módulo). Só retorna com Ctrl+C.
+    """
+    specs = list(specs)
+    try:
+        assets, errors = load_assets(dirs, specs)
+    except ValueError as e:
+        assets, errors = [], [str(e)]
+    for error in errors:
+        print(f"Erro: {error}")
+
+    print(f"Acompanhando {', '.join(dirs + specs)}: {len(assets)} asset(s), "
+          f"até {jobs} build(s) ao mesmo tempo")
+    _warm_up(assets)
+
+    builder = ThreadPoolExecutor(max_workers=1)
+    running = builder.submit(_run_batch, assets, jobs, "build inicial") if assets else None
+    running_outputs = {os.path.abspath(p) for a in assets for p in a["outputs"]}
+
+    state = snapshot(watched_paths(dirs, specs, assets))
+    pending, last_change = set(), 0.0
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(watched_paths(dirs, specs, assets))
+            # Arquivo que deixou de ser acompanhado (sidecar apagado) não pede build
+            changed = {p for p in current if state.get(p) != current[p]}
+            state = current
+
+            # Saídas gravadas pelo build em andamento não disparam outro build
+            if running is not None:
+                changed -= running_outputs
+            if changed:
+                pending |= changed
+                last_change = time.time()
+
+            if running is not None and running.done():
+                try:
+                    running.result()
+                except Exception as e:
+                    print(f"Erro no build: {e}")
+                running = None
+                state.update(snapshot(running_outputs & state.keys()))
+
+            if not pending or running is not None or time.time() - last_change < debounce:
+                continue
+
+            previous = assets
+            try:
+                assets, errors = load_assets(dirs, specs)
+            except ValueError as e:
+                assets, errors = previous, [str(e)]
+            for error in errors:
+                print(f"Erro: {error}")
+
+            batch = affected_assets(assets, previous, pending)
+            names = sorted(os.path.relpath(p) for p in pending)
+            pending = set()
+            if not batch:
+                continue
+
+            _warm_up(batch)
+            running_outputs = {os.path.abspath(p) for a in batch for p in a["outputs"]}
+            running = builder.submit(_run_batch, batch, jobs, f"mudou {', '.join(names[:3])}"
+                                                              f"{' ...' if len(names) > 3 else ''}")
+    except KeyboardInterrupt:
+        print("\nEncerrando (esperando o build em andamento)...")
+    finally:
+        builder.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    jobs, args = parse_jobs_arg(sys.argv[1:])
+    dirs, specs = [], []
+    debounce, interval = DEBOUNCE, POLL_INTERVAL
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--spec' and i + 1 < len(args):
+            specs.append(args[i + 1])
+            i += 2
+        elif args[i] in ('--debounce', '--interval') and i + 1 < len(args):
+            try:
+                value = float(args[i + 1])
+            except ValueError:
+                print(f"Aviso: Valor '{args[i + 1]}' inválido para {args[i]}. Usando padrão.")
+            else:
+                if args[i] == '--debounce':
+                    debounce = value
+                else:
+                    interval = value
+            i += 2
+        else:
+            dirs.append(args[i])
+            i += 1
+
+    if not dirs and not specs:
+        print(__doc__)
+        sys.exit(1)
+
+    missing = [d for d in dirs if not os.path.isdir(d)]
+    if missing:
+        print(f"Erro: Pasta(s) não encontrada(s): {', '.join(missing)}")
+        sys.exit(1)
+
+    watch(dirs, specs, jobs, debounce, interval)